@@ -14,7 +14,8 @@ from .models import (
 from .manager import InstanceManager
 from .health_checker import HealthChecker
 from .proxmox_client import ProxmoxClient
-from .ssh_client import SSHClient
+from .ssh_client import SSHClient, SSHConnectionPool
+from .deployer import Deployer
 
 __all__ = [
     "OpenCLAWInstance",
@@ -27,4 +28,6 @@ __all__ = [
     "HealthChecker",
     "ProxmoxClient",
     "SSHClient",
+    "SSHConnectionPool",
+    "Deployer",
 ]
@@ -0,0 +1,169 @@
+"""Adaptive (AIMD) concurrency limits per backend: Proxmox endpoint, SSH host, HTTP host.
+
+Each limiter grows its limit by one per window of successful calls while latency
+stays near its baseline, and cuts it by ``backoff`` when latency climbs past
+``tolerance`` times the baseline or a call fails with an overload error.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Weight of each new sample in the recent latency average, and in the no-load
+# baseline (which follows drops at the fast rate and rises only slowly)
+SMOOTHING = 0.3
+BASELINE_SMOOTHING = 0.02
+# Latency changes below this are noise, not load
+LATENCY_SLACK_S = 0.002
+DEFAULT_BACKOFF = 0.7
+DEFAULT_TOLERANCE = 2.0
+
+_registry: dict[tuple[str, str], "AdaptiveLimiter"] = {}
+_registry_lock = threading.RLock()
+
+
+def _always(error: BaseException) -> bool:
+    return True
+
+
+class AdaptiveLimiter:
+    """Limits calls in flight to one backend, adapting the limit to how it copes.
+
+    ``is_overload`` decides which exceptions mean "back off"; others (a missing VM,
+    a failed command) leave the limit alone. ``tolerance=None`` ignores latency
+    and reacts to errors only, for backends whose calls vary too much in length.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        target: str,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        tolerance: Optional[float] = DEFAULT_TOLERANCE,
+        backoff: float = DEFAULT_BACKOFF,
+        is_overload: Callable[[BaseException], bool] = _always,
+    ):
+        self.kind = kind
+        self.target = target
+        self.min_limit = min_limit
+        self.max_limit = max(min_limit, max_limit)
+        self.limit = float(min(max(initial, min_limit), self.max_limit))
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.is_overload = is_overload
+        self.in_flight = 0
+        self.queued = 0
+        self.peak_queued = 0
+        self.calls = 0
+        self.drops = 0
+        self.decreases = 0
+        self.smoothed_s: Optional[float] = None
+        self.baseline_s: Optional[float] = None
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+        with _registry_lock:
+            _registry[(kind, target)] = self
+
+    @property
+    def name(self) -> str:
+        return f"{self.kind} {self.target}"
+
+    def acquire(self) -> float:
+        """Wait for a slot; returns the start time to pass to ``release``."""
+        with self._cond:
+            if self.in_flight >= int(self.limit):
+                self.queued += 1
+                self.peak_queued = max(self.peak_queued, self.queued)
+                while self.in_flight >= int(self.limit):
+                    self._cond.wait()
+                self.queued -= 1
+            self.in_flight += 1
+        return time.monotonic()
+
+    def set_max_limit(self, max_limit: int):
+        """Change the ceiling; a current limit above the new one is cut to it."""
+        with self._cond:
+            self.max_limit = max(self.min_limit, max_limit)
+            self.limit = min(self.limit, float(self.max_limit))
+            self._cond.notify_all()
+
+    def release(self, started: float, dropped: bool = False):
+        latency = time.monotonic() - started
+        with self._cond:
+            self.in_flight -= 1
+            self.calls += 1
+            if dropped:
+                self.drops += 1
+                self._decrease("error")
+            else:
+                self._observe(latency)
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        started = self.acquire()
+        try:
+            yield
+        except BaseException as e:
+            self.release(started, dropped=self.is_overload(e))
+            raise
+        self.release(started)
+
+    def _observe(self, latency: float):
+        if self.smoothed_s is None:
+            self.smoothed_s = self.baseline_s = latency
+        else:
+            self.smoothed_s += SMOOTHING * (latency - self.smoothed_s)
+            rate = SMOOTHING if latency < self.baseline_s else BASELINE_SMOOTHING
+            self.baseline_s += rate * (latency - self.baseline_s)
+
+        if (
+            self.tolerance is not None
+            and self.smoothed_s > self.tolerance * self.baseline_s + LATENCY_SLACK_S
+        ):
+            self._decrease("latency")
+        # Only grow while the limit is actually in use; +1 per window of `limit` calls
+        elif self.in_flight + 1 >= self.limit / 2:
+            self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+
+    def _decrease(self, reason: str):
+        # At most one cut per round trip, so one burst of slow calls counts once
+        now = time.monotonic()
+        if now - self._last_decrease < (self.smoothed_s or 0.0):
+            return
+        self._last_decrease = now
+        previous = self.limit
+        self.limit = max(float(self.min_limit), self.limit * self.backoff)
+        self.decreases += 1
+        logger.debug(f"{self.name}: limit {previous:.1f} -> {self.limit:.1f} ({reason})")
+
+
+def shared_limiter(kind: str, target: str, **kwargs) -> AdaptiveLimiter:
+    """The registered limiter for ``(kind, target)``, created with ``kwargs`` if missing.
+
+    An existing limiter takes the ``max_limit`` passed here, so a reloaded ceiling
+    applies to it.
+    """
+    with _registry_lock:
+        limiter = _registry.get((kind, target))
+        if limiter is None:
+            return AdaptiveLimiter(kind, target, **kwargs)
+    if "max_limit" in kwargs and kwargs["max_limit"] != limiter.max_limit:
+        limiter.set_max_limit(kwargs["max_limit"])
+    return limiter
+
+
+def limiters() -> list[AdaptiveLimiter]:
+    with _registry_lock:
+        return sorted(_registry.values(), key=lambda l: (l.kind, l.target))
+
+
+def reset():
+    with _registry_lock:
+        _registry.clear()
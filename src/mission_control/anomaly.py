@@ -0,0 +1,324 @@
+"""Anomaly detection over the fleet's probe latency and VM cpu/memory history.
+
+After every sweep the latest sample of each instance is written into a ring
+buffer holding the last ``window`` sweeps for the whole fleet, one
+(metrics x instances x window) array. Three checks then run over it at once,
+without a Python loop per instance:
+
+* spike: the sample is far from the instance's own EWMA, in units of its noise
+* shift: the window contains a level change (CUSUM change point)
+* fleet: the instance's level is far from the rest of the fleet (median/MAD z-score)
+"""
+
+import logging
+import time
+import warnings
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from .models import OpenCLAWInstance
+
+logger = logging.getLogger(__name__)
+
+METRICS = ("latency_ms", "cpu", "memory")
+# Changes smaller than this are noise however steady the series: absolute, per
+# metric, and relative to the series' level
+NOISE_FLOOR = (1.0, 0.01, 0.01)
+RELATIVE_NOISE = 0.05
+
+DEFAULT_WINDOW = 60
+MIN_WINDOW = 10
+DEFAULT_ALPHA = 0.1
+# Thresholds are set for thousands of series tested every sweep: a quiet fleet of
+# 5000 instances should raise a false alarm less than once an hour
+DEFAULT_SPIKE_Z = 5.0
+# The CUSUM statistic of pure noise exceeds c with probability ~2 exp(-2 c^2)
+DEFAULT_SHIFT_THRESHOLD = 3.0
+DEFAULT_FLEET_Z = 3.5
+DEFAULT_MIN_SAMPLES = 10
+# Fleet-relative scores need enough peers for the median to mean anything
+MIN_FLEET_SIZE = 5
+# Scale from the median absolute deviation to a normal standard deviation
+MAD_SCALE = 1.4826
+
+
+def require_numpy():
+    if np is None:
+        raise RuntimeError("Anomaly detection needs NumPy: pip install 'openclaw-mgmt[analysis]'")
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+@dataclass
+class Anomaly:
+    instance: str
+    metric: str
+    # "spike", "shift" or "fleet"
+    kind: str
+    score: float
+    value: float
+    baseline: float
+    # For shifts, how many sweeps ago the level changed
+    sweeps_ago: int = 0
+
+    def describe(self) -> str:
+        direction = "up" if self.value >= self.baseline else "down"
+        if self.kind == "spike":
+            return f"{self.metric} spike {direction} (z={self.score:.1f})"
+        if self.kind == "shift":
+            return f"{self.metric} shifted {direction} {self.sweeps_ago} sweeps ago"
+        return f"{self.metric} above fleet (z={self.score:.1f})"
+
+    def to_dict(self) -> dict:
+        return {
+            "instance": self.instance,
+            "metric": self.metric,
+            "kind": self.kind,
+            "score": round(self.score, 2),
+            "value": round(self.value, 4),
+            "baseline": round(self.baseline, 4),
+            "sweeps_ago": self.sweeps_ago,
+        }
+
+
+def instance_sample(instance: OpenCLAWInstance) -> tuple[float, float, float]:
+    """This sweep's (latency_ms, cpu, memory) for one instance, NaN where unknown.
+
+    A failed probe's latency is its timeout, not a measurement, so it is left out.
+    """
+    nan = float("nan")
+    latency = instance.response_time_ms if instance.health_check_passed else None
+    return (
+        nan if latency is None else float(latency),
+        nan if instance.cpu_usage is None else float(instance.cpu_usage),
+        nan if instance.memory_usage is None else float(instance.memory_usage),
+    )
+
+
+class AnomalyDetector:
+    """Keeps the fleet's recent history and flags instances that behave unusually.
+
+    Call ``observe`` once per sweep. Instances are added on first sight and dropped
+    once they have been missing for a whole window.
+    """
+
+    def __init__(
+        self,
+        window: int = DEFAULT_WINDOW,
+        alpha: float = DEFAULT_ALPHA,
+        spike_z: float = DEFAULT_SPIKE_Z,
+        shift_threshold: float = DEFAULT_SHIFT_THRESHOLD,
+        fleet_z: float = DEFAULT_FLEET_Z,
+        min_samples: int = DEFAULT_MIN_SAMPLES,
+    ):
+        require_numpy()
+        if window < MIN_WINDOW:
+            raise ValueError(f"window must be at least {MIN_WINDOW} sweeps")
+        self.window = window
+        self.alpha = alpha
+        self.spike_z = spike_z
+        self.shift_threshold = shift_threshold
+        self.fleet_z = fleet_z
+        self.min_samples = min(min_samples, window)
+        self.names: list[str] = []
+        self._rows: dict[str, int] = {}
+        self.sweeps = 0
+        self._pos = 0
+        self._floor = np.array(NOISE_FLOOR)[:, None]
+        self._allocate(0)
+        self.anomalies: list[Anomaly] = []
+        self.last_analysis_ms: Optional[float] = None
+
+    def _allocate(self, rows: int):
+        m = len(METRICS)
+        # Each sample is written twice, at pos and pos + window, so the last `window`
+        # sweeps are always one contiguous slice in time order
+        self.values = np.full((m, rows, 2 * self.window), np.nan)
+        self.mean = np.full((m, rows), np.nan)
+        self.count = np.zeros((m, rows), dtype=np.int64)
+        self.last_seen = np.zeros(rows, dtype=np.int64)
+
+    def _add_rows(self, names: list[str]):
+        extra = len(names)
+        m = len(METRICS)
+        self.values = np.concatenate([self.values, np.full((m, extra, 2 * self.window), np.nan)], 1)
+        self.mean = np.concatenate([self.mean, np.full((m, extra), np.nan)], 1)
+        self.count = np.concatenate([self.count, np.zeros((m, extra), dtype=np.int64)], 1)
+        self.last_seen = np.concatenate(
+            [self.last_seen, np.full(extra, self.sweeps, dtype=np.int64)]
+        )
+        for name in names:
+            self._rows[name] = len(self.names)
+            self.names.append(name)
+
+    def _drop_stale(self):
+        keep = self.sweeps - self.last_seen <= self.window
+        if keep.all():
+            return
+        self.values = self.values[:, keep]
+        self.mean = self.mean[:, keep]
+        self.count = self.count[:, keep]
+        self.last_seen = self.last_seen[keep]
+        self.names = [n for n, k in zip(self.names, keep) if k]
+        self._rows = {name: row for row, name in enumerate(self.names)}
+
+    def history(self) -> "np.ndarray":
+        """The (metrics x instances x window) history, oldest sweep first."""
+        return self.values[:, :, self._pos : self._pos + self.window]
+
+    def observe(self, instances: Iterable[OpenCLAWInstance]) -> list[Anomaly]:
+        """Record one sweep and return the anomalies it shows.
+
+        Instances not in this sweep get a gap rather than a sample.
+        """
+        started = time.perf_counter()
+        samples = {i.name: instance_sample(i) for i in instances}
+        new = [name for name in samples if name not in self._rows]
+        if new:
+            self._add_rows(new)
+
+        x = np.full((len(METRICS), len(self.names)), np.nan)
+        if samples:
+            rows = np.fromiter((self._rows[n] for n in samples), dtype=np.int64, count=len(samples))
+            x[:, rows] = np.array(list(samples.values())).T
+            self.last_seen[rows] = self.sweeps
+        self.values[:, :, self._pos] = x
+        self.values[:, :, self._pos + self.window] = x
+        self._pos = (self._pos + 1) % self.window
+        self.sweeps += 1
+
+        with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+            # All-NaN rows (stopped VMs, Docker instances without cpu data) are expected
+            warnings.simplefilter("ignore", RuntimeWarning)
+            sigma, shift_stat, shifts, split, before, after = self._shifts()
+            baseline = self.mean.copy()
+            spikes = self._spikes(x, sigma)
+            self._update_ewma(x)
+            fleet, median = self._fleet()
+
+        found = []
+        for m, row in zip(*np.nonzero(spikes)):
+            found.append(
+                self._anomaly(row, m, "spike", spikes[m, row], x[m, row], baseline[m, row])
+            )
+        for m, row in zip(*np.nonzero(shifts)):
+            found.append(
+                self._anomaly(
+                    row,
+                    m,
+                    "shift",
+                    shift_stat[m, row],
+                    after[m, row],
+                    before[m, row],
+                    sweeps_ago=int(self.window - split[m, row]),
+                )
+            )
+        for m, row in zip(*np.nonzero(fleet)):
+            found.append(
+                self._anomaly(row, m, "fleet", fleet[m, row], self.mean[m, row], median[m])
+            )
+
+        self.anomalies = found
+        self._drop_stale()
+        self.last_analysis_ms = (time.perf_counter() - started) * 1000
+        if found:
+            logger.debug(f"{len(found)} anomalies across {len(self.names)} instances")
+        return found
+
+    def _anomaly(self, row, m, kind, score, value, baseline, sweeps_ago=0) -> Anomaly:
+        return Anomaly(
+            instance=self.names[row],
+            metric=METRICS[m],
+            kind=kind,
+            score=float(score),
+            value=float(value),
+            baseline=float(baseline),
+            sweeps_ago=sweeps_ago,
+        )
+
+    def _shifts(self):
+        """Noise level and single most likely level change of every series.
+
+        The change point is where the CUSUM of deviations from the window mean peaks.
+        Noise is estimated from successive differences, which a level change barely
+        moves, so a large shift doesn't hide itself by inflating the estimate.
+        """
+        series = self.history()
+        valid = ~np.isnan(series)
+        filled = np.where(valid, series, 0.0)
+        counts = np.cumsum(valid, axis=2)
+        sums = np.cumsum(filled, axis=2)
+        n = counts[..., -1]
+        level = sums[..., -1] / n
+        # Running sum of deviations from the window mean, without a second pass
+        cusum = sums - counts * level[..., None]
+
+        steps = np.abs(np.diff(series, axis=2))
+        # E|x1 - x2| = 2 sigma / sqrt(pi) for normal noise
+        sigma = np.nanmean(steps, axis=2) * (np.sqrt(np.pi) / 2)
+        sigma = np.fmax(sigma, np.maximum(self._floor, RELATIVE_NOISE * np.abs(level)))
+
+        # Keep a few samples on each side of the split
+        edge = 3
+        inner = np.abs(cusum[..., edge - 1 : -edge])
+        best = np.argmax(inner, axis=2)
+        split = best + edge
+        peak = np.take_along_axis(inner, best[..., None], axis=2)[..., 0]
+        stat = peak / (sigma * np.sqrt(np.maximum(n, 1)))
+
+        left_n = np.take_along_axis(counts, (split - 1)[..., None], axis=2)[..., 0]
+        left_sum = np.take_along_axis(sums, (split - 1)[..., None], axis=2)[..., 0]
+        before = left_sum / left_n
+        after = (sums[..., -1] - left_sum) / (n - left_n)
+        # A real shift moves the level by more than a couple of noise widths
+        flagged = (
+            (n >= self.min_samples)
+            & (stat > self.shift_threshold)
+            & (np.abs(after - before) > 2 * sigma)
+        )
+        return sigma, stat, flagged, split, before, after
+
+    def _spikes(self, x: "np.ndarray", sigma: "np.ndarray") -> "np.ndarray":
+        """z-scores of ``x`` against each instance's EWMA, zero where not anomalous."""
+        z = (x - self.mean) / sigma
+        flagged = (self.count >= self.min_samples) & (np.abs(z) > self.spike_z)
+        return np.where(flagged, z, 0.0)
+
+    def _update_ewma(self, x: "np.ndarray"):
+        valid = ~np.isnan(x)
+        first = valid & (self.count == 0)
+        self.mean[first] = x[first]
+        update = valid & ~first
+        self.mean[update] += self.alpha * (x[update] - self.mean[update])
+        self.count += valid
+
+    def _fleet(self):
+        """Robust z-scores of each instance's EWMA level against the whole fleet."""
+        level = np.where(self.count >= self.min_samples, self.mean, np.nan)
+        peers = (~np.isnan(level)).sum(axis=1)
+        median = np.nanmedian(level, axis=1)
+        mad = np.nanmedian(np.abs(level - median[:, None]), axis=1) * MAD_SCALE
+        spread = np.maximum(mad, np.maximum(self._floor[:, 0], RELATIVE_NOISE * np.abs(median)))
+        z = (level - median[:, None]) / spread[:, None]
+        # Only higher than the fleet is a problem: slower probes, busier VMs
+        flagged = (peers[:, None] >= MIN_FLEET_SIZE) & (z > self.fleet_z)
+        return np.where(flagged, z, 0.0), median
+
+    def for_instance(self, name: str) -> list[Anomaly]:
+        return [a for a in self.anomalies if a.instance == name]
+
+    def summary(self, name: str) -> str:
+        """The most significant current anomaly for ``name``, or ""."""
+        found = self.for_instance(name)
+        if not found:
+            return ""
+        worst = max(found, key=lambda a: abs(a.score))
+        more = f" +{len(found) - 1}" if len(found) > 1 else ""
+        return worst.describe() + more
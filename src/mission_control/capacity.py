@@ -0,0 +1,200 @@
+import logging
+import math
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from .proxmox_client import ProxmoxClient
+
+logger = logging.getLogger(__name__)
+
+TIMEFRAMES = ("hour", "day", "week", "month", "year")
+MEMORY_STEP = 256 * 1024**2
+
+
+def require_numpy():
+    if np is None:
+        raise RuntimeError("Capacity analysis needs NumPy: pip install 'openclaw-mgmt[analysis]'")
+
+
+@dataclass
+class FleetMetrics:
+    """RRD series for many VMs aligned on a shared time axis.
+
+    ``cpu`` is the fraction of the VM's vCPUs in use and ``mem`` is bytes; both are
+    (vms x points) arrays, NaN where a VM had no sample (stopped or missing).
+    """
+
+    vmids: "np.ndarray"
+    times: "np.ndarray"
+    cpu: "np.ndarray"
+    mem: "np.ndarray"
+    maxcpu: "np.ndarray"
+    maxmem: "np.ndarray"
+    errors: dict[int, str]
+
+    @classmethod
+    def from_series(cls, series: dict[int, list[dict]], errors: dict[int, str]) -> "FleetMetrics":
+        require_numpy()
+        vmids = np.array(sorted(series), dtype=np.int64)
+        times = np.array(
+            sorted({p["time"] for points in series.values() for p in points}), dtype=np.int64
+        )
+        shape = (len(vmids), len(times))
+        cpu = np.full(shape, np.nan)
+        mem = np.full(shape, np.nan)
+        maxcpu = np.full(len(vmids), np.nan)
+        maxmem = np.full(len(vmids), np.nan)
+
+        for row, vmid in enumerate(vmids):
+            points = series[int(vmid)]
+            if not points:
+                continue
+            cols = np.searchsorted(times, [p["time"] for p in points])
+            cpu[row, cols] = [p.get("cpu", np.nan) for p in points]
+            mem[row, cols] = [p.get("mem", np.nan) for p in points]
+            maxcpu[row] = max((p.get("maxcpu", 0) for p in points), default=np.nan) or np.nan
+            maxmem[row] = max((p.get("maxmem", 0) for p in points), default=np.nan) or np.nan
+
+        return cls(vmids, times, cpu, mem, maxcpu, maxmem, errors)
+
+
+class RRDFetcher:
+    def __init__(self, client: ProxmoxClient, max_workers: int = 8):
+        self.client = client
+        self.max_workers = max_workers
+
+    def fetch(self, vmids: list[int], timeframe: str = "week", cf: str = "AVERAGE") -> FleetMetrics:
+        if timeframe not in TIMEFRAMES:
+            raise ValueError(f"Invalid timeframe '{timeframe}', expected one of {TIMEFRAMES}")
+        require_numpy()
+        # Prime the vmid -> node index once instead of once per worker
+        self.client.get_cluster_vm_statuses()
+
+        series: dict[int, list[dict]] = {}
+        errors: dict[int, str] = {}
+
+        def fetch_one(vmid: int):
+            try:
+                series[vmid] = self.client.get_vm_rrddata(vmid, timeframe=timeframe, cf=cf)
+            except Exception as e:
+                errors[vmid] = str(e)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(executor.map(fetch_one, vmids))
+
+        if errors:
+            logger.warning(f"RRD data missing for {len(errors)} VM(s)")
+        return FleetMetrics.from_series(series, errors)
+
+
+@dataclass
+class CapacityRecommendation:
+    vmid: int
+    cpus: int
+    cpu_p50: float
+    cpu_peak: float
+    cpu_headroom: float
+    recommended_cpus: int
+    memory: int
+    mem_peak: float
+    mem_headroom: float
+    recommended_memory: int
+    action: str
+
+    def to_dict(self) -> dict:
+        return dict(self.__dict__)
+
+
+def analyze_capacity(
+    metrics: FleetMetrics,
+    percentile: float = 95.0,
+    target_utilization: float = 0.7,
+    min_cpus: int = 1,
+    min_memory: int = 512 * 1024**2,
+) -> list[CapacityRecommendation]:
+    """Size every VM in one vectorized pass over the (vms x points) matrices.
+
+    "Peak" is the given percentile of each VM's series; a VM is sized so that peak
+    lands at ``target_utilization`` of the recommended allocation.
+    """
+    require_numpy()
+    if not 0 < target_utilization <= 1:
+        raise ValueError("target_utilization must be in (0, 1]")
+    if len(metrics.vmids) == 0:
+        return []
+
+    cores = metrics.cpu * metrics.maxcpu[:, None]
+    with np.errstate(all="ignore"), warnings.catch_warnings():
+        # All-NaN rows (stopped VMs) are expected and reported as "no data"
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        cpu_p50 = np.nanpercentile(cores, 50, axis=1)
+        cpu_peak = np.nanpercentile(cores, percentile, axis=1)
+        mem_peak = np.nanpercentile(metrics.mem, percentile, axis=1)
+        cpu_headroom = 1 - cpu_peak / metrics.maxcpu
+        mem_headroom = 1 - mem_peak / metrics.maxmem
+
+    has_data = ~np.isnan(cpu_peak)
+    rec_cpus = np.maximum(min_cpus, np.ceil(np.nan_to_num(cpu_peak) / target_utilization))
+    rec_mem = np.maximum(
+        min_memory,
+        np.ceil(np.nan_to_num(mem_peak) / target_utilization / MEMORY_STEP) * MEMORY_STEP,
+    )
+    current_cpus = np.nan_to_num(metrics.maxcpu)
+    current_mem = np.nan_to_num(metrics.maxmem)
+    grow = has_data & ((rec_cpus > current_cpus) | (rec_mem > current_mem))
+    shrink = has_data & ~grow & ((rec_cpus < current_cpus) | (rec_mem < current_mem))
+    actions = np.where(grow, "upsize", np.where(shrink, "downsize", "ok"))
+    actions = np.where(has_data, actions, "no data")
+
+    columns = zip(
+        metrics.vmids.tolist(),
+        current_cpus.astype(int).tolist(),
+        cpu_p50.tolist(),
+        cpu_peak.tolist(),
+        cpu_headroom.tolist(),
+        rec_cpus.astype(int).tolist(),
+        current_mem.astype(np.int64).tolist(),
+        mem_peak.tolist(),
+        mem_headroom.tolist(),
+        rec_mem.astype(np.int64).tolist(),
+        actions.tolist(),
+    )
+    return [CapacityRecommendation(*(None if _is_nan(v) else v for v in row)) for row in columns]
+
+
+def _is_nan(value) -> bool:
+    return isinstance(value, float) and math.isnan(value)
+
+
+def fleet_summary(recommendations: list[CapacityRecommendation]) -> dict:
+    with_data = [r for r in recommendations if r.action != "no data"]
+    return {
+        "vms": len(recommendations),
+        "allocated_cpus": sum(r.cpus for r in with_data),
+        "recommended_cpus": sum(r.recommended_cpus for r in with_data),
+        "allocated_memory": sum(r.memory for r in with_data),
+        "recommended_memory": sum(r.recommended_memory for r in with_data),
+        "upsize": sum(r.action == "upsize" for r in with_data),
+        "downsize": sum(r.action == "downsize" for r in with_data),
+    }
+
+
+def fetch_and_analyze(
+    client: ProxmoxClient,
+    vmids: list[int],
+    timeframe: str = "week",
+    percentile: float = 95.0,
+    target_utilization: float = 0.7,
+    max_workers: int = 8,
+) -> tuple[list[CapacityRecommendation], dict[int, str]]:
+    metrics = RRDFetcher(client, max_workers=max_workers).fetch(vmids, timeframe=timeframe)
+    return (
+        analyze_capacity(metrics, percentile=percentile, target_utilization=target_utilization),
+        metrics.errors,
+    )
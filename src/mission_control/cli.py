@@ -1,5 +1,10 @@
+import json
 import logging
+import os
+import re
 import sys
+import time
+from enum import Enum
 from pathlib import Path
 from typing import Optional
 
@@ -7,61 +12,273 @@ import typer
 from rich.console import Console
 from rich.table import Table
 from rich import print as rprint
+from typer.core import TyperGroup
 
-from .models import Config, OpenCLAWInstance, InstanceStatus
+from .models import Config, OpenCLAWInstance, InstanceStatus, InstanceType
 from .manager import InstanceManager
+from .dashboard import FleetWatcher, SORT_KEYS
+from .sharding import ShardedMonitor
+from .config_watcher import ConfigWatcher
+from .status_cache import StatusCache, parse_duration
+from .capacity import TIMEFRAMES, fetch_and_analyze, fleet_summary
+from .deployer import Deployer, parse_size
+from .cloner import (
+    DEFAULT_START_VMID,
+    DEFAULT_STORAGE_LIMIT,
+    CloneEngine,
+    instances_from_clones,
+    parse_storage_limits,
+    register_instances,
+)
+from .log_collector import DEFAULT_LOOKBACK, LogCollector, LogStore
+from .log_search import LogSearch
+from .startup import StartupReport, StartupScheduler
+from .anomaly import AnomalyDetector, numpy_available
+from . import adaptive_limiter, tracing
 
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 
+logger = logging.getLogger(__name__)
+
 app = typer.Typer(help="OpenCLAW Mission Control - Unified Management CLI")
 console = Console()
+# Profile reports go to stderr so they never mix with command output
+profile_console = Console(stderr=True)
+# Warnings and errors about a command that may be writing JSON to stdout
+err_console = Console(stderr=True)
 
+WATERFALL_WIDTH = 40
 
-def load_config(config_path: Optional[str] = None) -> Config:
+
+class OutputFormat(str, Enum):
+    TABLE = "table"
+    JSON = "json"
+    NDJSON = "ndjson"
+
+
+def emit_records(records, output: OutputFormat):
+    """Write dict records to stdout, one line per record as they arrive for NDJSON."""
+    if output == OutputFormat.NDJSON:
+        for record in records:
+            sys.stdout.write(json.dumps(record) + "\n")
+            sys.stdout.flush()
+    else:
+        json.dump(list(records), sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+
+def resolve_config_path(config_path: Optional[str] = None) -> str:
     if config_path is None:
         config_path = str(Path(__file__).parent.parent.parent / "config" / "config.yaml")
-    return Config.from_yaml(config_path)
+    return config_path
+
+
+def load_config(config_path: Optional[str] = None) -> Config:
+    return Config.from_yaml(resolve_config_path(config_path))
+
+
+@app.callback()
+def main_options(
+    ctx: typer.Context,
+    profile: bool = typer.Option(
+        False, "--profile", help="Print a per-instance timing waterfall and slowest spans"
+    ),
+    profile_top: int = typer.Option(10, "--profile-top", help="Slowest spans to list"),
+    profile_export: Optional[str] = typer.Option(
+        None, "--profile-export", help="Write spans as OTLP JSON to this file"
+    ),
+):
+    if not (profile or profile_export):
+        return
+
+    tracing.enable()
+
+    def report():
+        if profile:
+            display_profile(profile_top)
+        if profile_export:
+            tracing.export_otlp_json(profile_export)
+            profile_console.print(f"[cyan]Wrote trace to {profile_export}[/cyan]")
+
+    ctx.call_on_close(report)
+    # Exits before report() runs, so the command span is complete when printed
+    ctx.with_resource(tracing.span(f"cli.{ctx.invoked_subcommand}"))
 
 
 @app.command()
 def status(
     name: Optional[str] = typer.Option(None, "--name", "-n", help="Instance name"),
+    output: OutputFormat = typer.Option(OutputFormat.TABLE, "--output", "-o", help="Output format"),
+    max_age: Optional[str] = typer.Option(
+        None,
+        "--max-age",
+        help="Serve cached results up to this old (e.g. 30s, 5m); refresh stale ones after",
+    ),
     config: Optional[str] = typer.Option(None, "--config", "-c", help="Config file path"),
 ):
     """Check status of OpenCLAW instances"""
     cfg = load_config(config)
-    manager = InstanceManager(cfg)
+    manager = InstanceManager(cfg, status_cache=StatusCache())
 
     if name:
         instance = manager.get_instance_by_name(name)
         if not instance:
             console.print(f"[red]Instance '{name}' not found[/red]")
             raise typer.Exit(1)
-
-        manager.update_instance_status(instance)
-        display_instance(instance)
+        instances = [instance]
     else:
+        instances = manager.get_all_instances()
+
+    if max_age is not None:
+        try:
+            max_age_seconds = parse_duration(max_age)
+        except ValueError as e:
+            console.print(f"[red]{e}[/red]")
+            raise typer.Exit(1)
+        serve_cached_status(manager, instances, max_age_seconds, output, single=bool(name))
+        return
+
+    if name:
+        for _ in manager.iter_instance_statuses(instances):
+            pass
+        if output == OutputFormat.TABLE:
+            display_instance(instances[0])
+        else:
+            emit_records([instances[0].to_dict()], output)
+    elif output == OutputFormat.TABLE:
         instances = manager.update_all_instance_statuses()
         display_instances_table(instances)
+    else:
+        emit_records((i.to_dict() for i in manager.iter_instance_statuses()), output)
+
+
+def serve_cached_status(
+    manager: InstanceManager,
+    instances: list[OpenCLAWInstance],
+    max_age: float,
+    output: OutputFormat,
+    single: bool = False,
+):
+    """Answer from the status cache, probing only uncached instances before output
+    and revalidating stale ones afterwards in a detached child process."""
+    ages = manager.status_cache.apply(instances)
+    missing = [i for i in instances if i.name not in ages]
+    stale = [i for i in instances if ages.get(i.name, 0) > max_age]
+    for instance in manager.iter_instance_statuses(missing):
+        ages[instance.name] = 0.0
+
+    stale_names = {i.name for i in stale}
+    if output != OutputFormat.TABLE:
+        emit_records(
+            (
+                {
+                    **i.to_dict(),
+                    "cache_age_s": round(ages[i.name], 1),
+                    "stale": i.name in stale_names,
+                }
+                for i in instances
+            ),
+            output,
+        )
+    elif single:
+        display_instance(instances[0], age=ages[instances[0].name], stale=bool(stale_names))
+    else:
+        display_instances_table(instances, ages=ages, stale=stale_names)
+
+    if stale:
+        logger.info(f"Revalidating {len(stale)} stale instance(s)")
+        revalidate_detached(manager, stale)
+
+
+def revalidate_detached(manager: InstanceManager, instances: list[OpenCLAWInstance]):
+    """Re-probe ``instances`` (saving them to the status cache) in a forked child.
+
+    The parent returns at once, so the shell and any pipe reading our output see
+    EOF now rather than after the slowest probe.
+    """
+    sys.stdout.flush()
+    sys.stderr.flush()
+    try:
+        pid = os.fork()
+    except (AttributeError, OSError) as e:
+        logger.debug(f"Cannot fork ({e}), revalidating in the foreground")
+        for _ in manager.iter_instance_statuses(instances):
+            pass
+        return
+    if pid:
+        return
+
+    try:
+        os.setsid()
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+        for _ in manager.iter_instance_statuses(instances):
+            pass
+    finally:
+        os._exit(0)
 
 
 @app.command()
 def start(
-    name: str = typer.Argument(..., help="Instance name"),
+    names: Optional[list[str]] = typer.Argument(None, help="Instance names"),
+    all_instances: bool = typer.Option(False, "--all", help="Start every configured instance"),
+    deps: bool = typer.Option(
+        True, "--deps/--no-deps", help="Start dependencies first and wait for them to be healthy"
+    ),
+    health_timeout: str = typer.Option(
+        "5m", "--health-timeout", help="How long to wait for each instance to become healthy"
+    ),
+    restart_running: bool = typer.Option(
+        False, "--restart-running", help="Also start instances that are already healthy"
+    ),
+    output: OutputFormat = typer.Option(OutputFormat.TABLE, "--output", "-o", help="Output format"),
     config: Optional[str] = typer.Option(None, "--config", "-c", help="Config file path"),
 ):
-    """Start an OpenCLAW instance"""
+    """Start OpenCLAW instances, dependencies first (independent ones in parallel)"""
+    if not names and not all_instances:
+        console.print("[red]Name one or more instances, or use --all[/red]")
+        raise typer.Exit(1)
     cfg = load_config(config)
     manager = InstanceManager(cfg)
 
-    console.print(f"[cyan]Starting instance: {name}[/cyan]")
-    if manager.start_instance(name):
-        console.print(f"[green]Instance '{name}' started successfully[/green]")
+    if not deps:
+        failed = []
+        try:
+            for name in names or [i.name for i in manager.get_all_instances()]:
+                console.print(f"[cyan]Starting instance: {name}[/cyan]")
+                if manager.start_instance(name):
+                    console.print(f"[green]Instance '{name}' started successfully[/green]")
+                else:
+                    console.print(f"[red]Failed to start instance '{name}'[/red]")
+                    failed.append(name)
+        finally:
+            manager.ssh_pool.close_all()
+        if failed:
+            raise typer.Exit(1)
+        return
+
+    try:
+        scheduler = StartupScheduler(
+            manager,
+            health_timeout=parse_duration(health_timeout),
+            restart_running=restart_running,
+        )
+        report = scheduler.run(None if all_instances else names)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+    finally:
+        manager.ssh_pool.close_all()
+
+    if output == OutputFormat.TABLE:
+        display_startup_report(report)
     else:
-        console.print(f"[red]Failed to start instance '{name}'[/red]")
+        emit_records([report.to_dict()], output)
+    if not report.success:
         raise typer.Exit(1)
 
 
@@ -75,7 +292,11 @@ def stop(
     manager = InstanceManager(cfg)
 
     console.print(f"[cyan]Stopping instance: {name}[/cyan]")
-    if manager.stop_instance(name):
+    try:
+        ok = manager.stop_instance(name)
+    finally:
+        manager.ssh_pool.close_all()
+    if ok:
         console.print(f"[green]Instance '{name}' stopped successfully[/green]")
     else:
         console.print(f"[red]Failed to stop instance '{name}'[/red]")
@@ -92,15 +313,37 @@ def restart(
     manager = InstanceManager(cfg)
 
     console.print(f"[cyan]Restarting instance: {name}[/cyan]")
-    if manager.restart_instance(name):
+    try:
+        ok = manager.restart_instance(name)
+    finally:
+        manager.ssh_pool.close_all()
+    if ok:
         console.print(f"[green]Instance '{name}' restarted successfully[/green]")
     else:
         console.print(f"[red]Failed to restart instance '{name}'[/red]")
         raise typer.Exit(1)
 
 
-@app.command()
-def logs(
+class DefaultCommandGroup(TyperGroup):
+    """Group that runs ``default_command`` when the first argument isn't a subcommand."""
+
+    default_command = "show"
+
+    def parse_args(self, ctx, args):
+        if args and args[0] not in self.commands and args[0] not in ctx.help_option_names:
+            args = [self.default_command, *args]
+        return super().parse_args(ctx, args)
+
+
+logs_app = typer.Typer(
+    cls=DefaultCommandGroup,
+    help="Show live logs or collect them incrementally into a local store",
+)
+app.add_typer(logs_app, name="logs")
+
+
+@logs_app.command("show")
+def logs_show(
     name: str = typer.Argument(..., help="Instance name"),
     lines: int = typer.Option(50, "--lines", "-l", help="Number of log lines"),
     config: Optional[str] = typer.Option(None, "--config", "-c", help="Config file path"),
@@ -109,7 +352,10 @@ def logs(
     cfg = load_config(config)
     manager = InstanceManager(cfg)
 
-    logs = manager.get_instance_logs(name, lines)
+    try:
+        logs = manager.get_instance_logs(name, lines)
+    finally:
+        manager.ssh_pool.close_all()
     if logs:
         console.print(logs)
     else:
@@ -117,6 +363,180 @@ def logs(
         raise typer.Exit(1)
 
 
+@logs_app.command("collect")
+def logs_collect(
+    name: Optional[list[str]] = typer.Option(
+        None, "--name", "-n", help="Instance name (repeatable, default: all)"
+    ),
+    store: Optional[str] = typer.Option(None, "--store", help="Log store directory"),
+    workers: int = typer.Option(8, "--workers", "-w", help="Parallel SSH fetches"),
+    lookback: str = typer.Option(
+        DEFAULT_LOOKBACK, "--lookback", help="History to pull for instances with no cursor yet"
+    ),
+    interval: Optional[float] = typer.Option(
+        None, "--interval", "-i", help="Keep collecting every N seconds"
+    ),
+    config: Optional[str] = typer.Option(None, "--config", "-c", help="Config file path"),
+):
+    """Append new log lines since the last run to compressed local segments"""
+    cfg = load_config(config)
+    manager = InstanceManager(cfg)
+
+    if name:
+        instances = [manager.get_instance_by_name(n) for n in name]
+        missing = [n for n, i in zip(name, instances) if i is None]
+        if missing:
+            console.print(f"[red]Instance(s) not found: {', '.join(missing)}[/red]")
+            raise typer.Exit(1)
+    else:
+        instances = manager.get_all_instances()
+
+    log_store = LogStore(Path(store) if store else None)
+    collector = LogCollector(
+        log_store, pool=manager.ssh_pool, max_workers=workers, initial_lookback=lookback
+    )
+    results = []
+    try:
+        while True:
+            results = collector.collect(instances)
+            table = Table(title=f"Log collection ({log_store.root})")
+            table.add_column("Instance", style="cyan")
+            table.add_column("New lines", style="yellow")
+            table.add_column("Bytes", style="blue")
+            table.add_column("Result", style="white")
+            for result in results:
+                outcome = (
+                    "[green]ok[/green]" if result.error is None else f"[red]{result.error}[/red]"
+                )
+                table.add_row(
+                    result.instance, str(result.lines), str(result.bytes_transferred), outcome
+                )
+            console.print(table)
+
+            if interval is None:
+                break
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        manager.ssh_pool.close_all()
+        log_store.close()
+
+    if any(r.error for r in results):
+        raise typer.Exit(1)
+
+
+@logs_app.command("search")
+def logs_search(
+    pattern: str = typer.Argument(..., help="Regular expression matched against each message"),
+    since: Optional[str] = typer.Option(None, "--since", help="Only lines newer than, e.g. 6h"),
+    until: Optional[str] = typer.Option(None, "--until", help="Only lines older than, e.g. 1h"),
+    instance: Optional[list[str]] = typer.Option(
+        None, "--instance", help="Instance name or glob (repeatable)"
+    ),
+    ignore_case: bool = typer.Option(False, "--ignore-case", "-i", help="Case-insensitive"),
+    limit: Optional[int] = typer.Option(None, "--limit", help="Stop after this many matches"),
+    output: OutputFormat = typer.Option(OutputFormat.TABLE, "--output", "-o", help="Output format"),
+    store: Optional[str] = typer.Option(None, "--store", help="Log store directory"),
+):
+    """Search collected logs across instances without touching SSH"""
+    try:
+        pattern_re = re.compile(pattern)
+        now = time.time()
+        since_ns = int((now - parse_duration(since)) * 1e9) if since else None
+        until_ns = int((now - parse_duration(until)) * 1e9) if until else None
+    except (re.error, ValueError) as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+
+    log_store = LogStore(Path(store) if store else None)
+    searcher = LogSearch(log_store)
+    started = time.perf_counter()
+    matches = searcher.search(
+        pattern_re.pattern,
+        since=since_ns,
+        until=until_ns,
+        instances=instance,
+        ignore_case=ignore_case,
+        limit=limit,
+    )
+    try:
+        if output == OutputFormat.TABLE:
+            for match in matches:
+                sys.stdout.write(f"{match.instance}  {match.line}\n")
+            sys.stdout.flush()
+        else:
+            emit_records((m.to_dict() for m in matches), output)
+    finally:
+        log_store.close()
+
+    stats = searcher.stats
+    profile_console.print(
+        f"[cyan]{stats.matches} match(es), {stats.chunks_scanned} chunk(s) / "
+        f"{stats.lines_scanned} line(s) read in {(time.perf_counter() - started) * 1000:.0f} ms"
+        f"{'' if stats.used_index else ' (full scan)'}[/cyan]"
+    )
+    if stats.matches == 0:
+        raise typer.Exit(1)
+
+
+@app.command()
+def watch(
+    interval: float = typer.Option(5.0, "--interval", "-i", help="Seconds between sweeps"),
+    sort: str = typer.Option("name", "--sort", "-s", help=f"Sort by: {', '.join(SORT_KEYS)}"),
+    reverse: bool = typer.Option(False, "--reverse", "-r", help="Reverse sort order"),
+    type_filter: Optional[InstanceType] = typer.Option(None, "--type", help="Only this type"),
+    status_filter: Optional[InstanceStatus] = typer.Option(
+        None, "--status", help="Only this status"
+    ),
+    slower_than: Optional[float] = typer.Option(
+        None, "--slower-than", help="Only instances whose probe took at least this many ms"
+    ),
+    reload: bool = typer.Option(True, "--reload/--no-reload", help="Apply config.yaml edits live"),
+    anomalies: bool = typer.Option(
+        True, "--anomalies/--no-anomalies", help="Flag unusual latency and cpu/memory (needs NumPy)"
+    ),
+    workers: int = typer.Option(
+        1, "--workers", "-w", help="Sweep from this many processes, sharded (0 = one per core)"
+    ),
+    config: Optional[str] = typer.Option(None, "--config", "-c", help="Config file path"),
+):
+    """Live-updating status view that keeps sweeping in the background"""
+    config_path = resolve_config_path(config)
+    cfg = load_config(config_path)
+    detector = AnomalyDetector() if anomalies and numpy_available() else None
+    manager = InstanceManager(cfg, status_cache=StatusCache(), anomaly_detector=detector)
+    monitor = None if workers == 1 else ShardedMonitor(manager, workers or None, interval)
+
+    try:
+        watcher = FleetWatcher(
+            manager,
+            interval=interval,
+            sort=sort,
+            reverse=reverse,
+            type_filter=type_filter,
+            status_filter=status_filter,
+            slower_than=slower_than,
+            monitor=monitor,
+        )
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+
+    apply_config = monitor.apply_config if monitor else manager.apply_config
+    config_watcher = ConfigWatcher(config_path, apply_config) if reload else None
+    if config_watcher:
+        config_watcher.start()
+    try:
+        watcher.run(console)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if config_watcher:
+            config_watcher.stop()
+        manager.ssh_pool.close_all()
+
+
 @app.command()
 def list_instances(
     config: Optional[str] = typer.Option(None, "--config", "-c", help="Config file path"),
@@ -130,35 +550,328 @@ def list_instances(
 
 @app.command()
 def proxmox_status(
+    timeout: Optional[float] = typer.Option(
+        None, "--timeout", help="Seconds to wait for each cluster before reporting it as down"
+    ),
+    output: OutputFormat = typer.Option(OutputFormat.TABLE, "--output", "-o", help="Output format"),
     config: Optional[str] = typer.Option(None, "--config", "-c", help="Config file path"),
 ):
-    """Show Proxmox VM status"""
+    """Show Proxmox VM status across all configured clusters"""
     cfg = load_config(config)
     manager = InstanceManager(cfg)
 
-    vms = manager.get_proxmox_vms()
+    vms, errors = manager.proxmox.get_all_vms(timeout=timeout)
+    for cluster, error in errors.items():
+        err_console.print(f"[red]Cluster '{cluster}' unavailable: {error}[/red]")
+    if output != OutputFormat.TABLE:
+        emit_records(vms, output)
+        return
     if not vms:
         console.print("[yellow]No Proxmox VMs found or not configured[/yellow]")
         return
 
+    multi_cluster = len(manager.proxmox) > 1
     table = Table(title="Proxmox VMs")
+    if multi_cluster:
+        table.add_column("Cluster", style="magenta")
     table.add_column("VMID", style="cyan")
     table.add_column("Name", style="green")
     table.add_column("Status", style="yellow")
     table.add_column("Node", style="blue")
 
-    for vm in vms:
+    with tracing.span("cli.render"):
+        for vm in vms:
+            row = [
+                str(vm.get("vmid", "N/A")),
+                vm.get("name", "unknown"),
+                vm.get("status", "unknown"),
+                vm.get("node", "unknown"),
+            ]
+            table.add_row(*([vm["cluster"]] + row if multi_cluster else row))
+
+        console.print(table)
+
+
+@app.command()
+def deploy(
+    name: Optional[list[str]] = typer.Option(
+        None, "--name", "-n", help="Instance name (repeatable, default: all)"
+    ),
+    source: Optional[str] = typer.Option(None, "--source", help="Local openclaw-docker bundle"),
+    workers: int = typer.Option(8, "--workers", "-w", help="Parallel host uploads"),
+    bwlimit: Optional[str] = typer.Option(
+        None, "--bwlimit", help="Total upload cap in bytes/s, e.g. 512K or 2M"
+    ),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Only show which files would change"),
+    config: Optional[str] = typer.Option(None, "--config", "-c", help="Config file path"),
+):
+    """Sync the openclaw-docker bundle to instances, uploading only changed files"""
+    cfg = load_config(config)
+    manager = InstanceManager(cfg)
+
+    if name:
+        instances = [manager.get_instance_by_name(n) for n in name]
+        missing = [n for n, i in zip(name, instances) if i is None]
+        if missing:
+            console.print(f"[red]Instance(s) not found: {', '.join(missing)}[/red]")
+            raise typer.Exit(1)
+    else:
+        instances = manager.get_all_instances()
+
+    try:
+        deployer = Deployer(
+            source_dir=Path(source) if source else None,
+            max_workers=workers,
+            bandwidth_limit=parse_size(bwlimit) if bwlimit else None,
+        )
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+    try:
+        results = deployer.deploy(instances, dry_run=dry_run)
+    finally:
+        deployer.close()
+
+    table = Table(title="Deploy (dry run)" if dry_run else "Deploy")
+    table.add_column("Instance", style="cyan")
+    table.add_column("Changed", style="yellow")
+    table.add_column("Unchanged", style="green")
+    table.add_column("Bytes", style="blue")
+    table.add_column("Result", style="white")
+
+    for result in results:
+        outcome = "[green]ok[/green]" if result.success else f"[red]{result.error}[/red]"
         table.add_row(
-            str(vm.get("vmid", "N/A")),
-            vm.get("name", "unknown"),
-            vm.get("status", "unknown"),
-            vm.get("node", "unknown"),
+            result.instance.name,
+            ", ".join(result.uploaded) or "-",
+            str(result.unchanged),
+            str(result.bytes_sent),
+            outcome,
         )
 
     console.print(table)
+    if not all(r.success for r in results):
+        raise typer.Exit(1)
+
+
+@app.command()
+def capacity(
+    timeframe: str = typer.Option(
+        "week", "--timeframe", "-t", help=f"One of {', '.join(TIMEFRAMES)}"
+    ),
+    percentile: float = typer.Option(95.0, "--percentile", "-p", help="Percentile used as peak"),
+    target: float = typer.Option(0.7, "--target", help="Target utilization of the allocation"),
+    all_vms: bool = typer.Option(
+        False, "--all", help="Every VM in the cluster, not just configured ones"
+    ),
+    workers: int = typer.Option(8, "--workers", "-w", help="Parallel RRD fetches"),
+    cluster: Optional[str] = typer.Option(None, "--cluster", help="Proxmox cluster name"),
+    output: OutputFormat = typer.Option(OutputFormat.TABLE, "--output", "-o", help="Output format"),
+    config: Optional[str] = typer.Option(None, "--config", "-c", help="Config file path"),
+):
+    """Right-sizing report from Proxmox RRD history (CPU/memory percentiles and headroom)"""
+    cfg = load_config(config)
+    manager = InstanceManager(cfg)
+    client = manager.proxmox.client(cluster)
+    if not client:
+        console.print(
+            f"[yellow]Proxmox cluster '{cluster or 'default'}' is not configured[/yellow]"
+        )
+        raise typer.Exit(1)
+
+    if all_vms:
+        vmids = sorted(client.get_cluster_vm_statuses())
+    else:
+        vmids = sorted(
+            {
+                i.vm_id
+                for i in manager.get_all_instances()
+                if i.vm_id and manager.proxmox_client_for(i) is client
+            }
+        )
+
+    try:
+        recommendations, errors = fetch_and_analyze(
+            client,
+            vmids,
+            timeframe=timeframe,
+            percentile=percentile,
+            target_utilization=target,
+            max_workers=workers,
+        )
+    except (ValueError, RuntimeError) as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+
+    if output != OutputFormat.TABLE:
+        emit_records((r.to_dict() for r in recommendations), output)
+        return
+
+    gib = 1024**3
+    table = Table(title=f"Capacity ({timeframe}, p{percentile:g}, target {target:.0%})")
+    table.add_column("VMID", style="cyan")
+    table.add_column("vCPU", justify="right")
+    table.add_column(f"CPU p{percentile:g}", justify="right", style="yellow")
+    table.add_column("CPU headroom", justify="right")
+    table.add_column("→ vCPU", justify="right", style="green")
+    table.add_column("Mem GiB", justify="right")
+    table.add_column(f"Mem p{percentile:g}", justify="right", style="yellow")
+    table.add_column("Mem headroom", justify="right")
+    table.add_column("→ Mem GiB", justify="right", style="green")
+    table.add_column("Action", style="magenta")
+
+    def fmt(value, pattern):
+        return "-" if value is None else pattern.format(value)
+
+    with tracing.span("cli.render"):
+        for r in recommendations:
+            table.add_row(
+                str(r.vmid),
+                str(r.cpus),
+                fmt(r.cpu_peak, "{:.2f}"),
+                fmt(r.cpu_headroom, "{:.0%}"),
+                str(r.recommended_cpus),
+                f"{r.memory / gib:.1f}",
+                fmt(None if r.mem_peak is None else r.mem_peak / gib, "{:.2f}"),
+                fmt(r.mem_headroom, "{:.0%}"),
+                f"{r.recommended_memory / gib:.2f}",
+                r.action,
+            )
+        console.print(table)
+
+    summary = fleet_summary(recommendations)
+    console.print(
+        f"{summary['vms']} VMs: vCPU {summary['allocated_cpus']} → {summary['recommended_cpus']}, "
+        f"memory {summary['allocated_memory'] / gib:.1f} → "
+        f"{summary['recommended_memory'] / gib:.1f} GiB "
+        f"({summary['upsize']} upsize, {summary['downsize']} downsize)"
+    )
+    if errors:
+        console.print(
+            f"[yellow]No RRD data for VM(s): {', '.join(map(str, sorted(errors)))}[/yellow]"
+        )
+
+
+@app.command()
+def clone(
+    source: str = typer.Argument(..., help="Source VM: configured instance name, VM name or VMID"),
+    count: int = typer.Option(1, "--count", "-n", help="Number of clones"),
+    prefix: str = typer.Option("openclaw-test", "--prefix", help="Clone names: PREFIX-01, ..."),
+    full: bool = typer.Option(False, "--full/--linked", help="Full or linked (template) clones"),
+    node: Optional[list[str]] = typer.Option(
+        None, "--node", help="Target node (repeatable, round-robin; default: source node)"
+    ),
+    storage: Optional[list[str]] = typer.Option(
+        None, "--storage", help="Target storage NAME or NAME=LIMIT (repeatable, full clones)"
+    ),
+    per_storage: int = typer.Option(
+        DEFAULT_STORAGE_LIMIT, "--per-storage", help="Concurrent clones per storage"
+    ),
+    start_vmid: int = typer.Option(DEFAULT_START_VMID, "--start-vmid", help="Lowest VMID to use"),
+    start: bool = typer.Option(False, "--start", help="Start clones and wait for their IPs"),
+    register: Optional[bool] = typer.Option(
+        None,
+        "--register/--no-register",
+        help="Add clones with an IP to the config file (default: on with --start)",
+    ),
+    cluster: Optional[str] = typer.Option(
+        None, "--cluster", help="Proxmox cluster name (default: the source instance's cluster)"
+    ),
+    output: OutputFormat = typer.Option(OutputFormat.TABLE, "--output", "-o", help="Output format"),
+    config: Optional[str] = typer.Option(None, "--config", "-c", help="Config file path"),
+):
+    """Clone a VM N times in parallel and register the clones as instances"""
+    # Only started clones report an address, so registering is opt-in without --start
+    register = start if register is None else register
+    notices = console if output == OutputFormat.TABLE else err_console
+    config_path = resolve_config_path(config)
+    cfg = load_config(config_path)
+    manager = InstanceManager(cfg)
+
+    base = manager.get_instance_by_name(source)
+    if base is not None and base.vm_id:
+        source = str(base.vm_id)
+        cluster = cluster or base.cluster
+    else:
+        base = None
+
+    client = manager.proxmox.client(cluster)
+    if not client:
+        notices.print(
+            f"[yellow]Proxmox cluster '{cluster or 'default'}' is not configured[/yellow]"
+        )
+        raise typer.Exit(1)
+
+    try:
+        limits = parse_storage_limits(storage or [], per_storage)
+        engine = CloneEngine(client, storage_limits=limits, default_storage_limit=per_storage)
+        plans = engine.plan(
+            source, count, prefix, nodes=node, storages=list(limits) or None, start_vmid=start_vmid
+        )
+    except ValueError as e:
+        notices.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+
+    if not full and limits:
+        notices.print("[yellow]--storage only applies to full clones; ignoring it[/yellow]")
+        for plan in plans:
+            plan.storage = None
+
+    results = engine.run(plans, full=full, start=start)
+    if start:
+        engine.wait_for_addresses(results)
+
+    instances = instances_from_clones(results, base, cluster=cluster)
+    register_failed = False
+    if register:
+        unaddressed = sum(1 for r in results if r.success) - len(instances)
+        if unaddressed:
+            hint = "" if start else " (use --start to wait for their IPs)"
+            notices.print(
+                f"[yellow]{unaddressed} clone(s) have no IP address yet and were not "
+                f"registered{hint}[/yellow]"
+            )
+        try:
+            register_instances(config_path, instances)
+            if instances:
+                notices.print(
+                    f"[green]Registered {len(instances)} instance(s) in {config_path}[/green]"
+                )
+        except ValueError as e:
+            notices.print(f"[red]{e}[/red]")
+            register_failed = True
+
+    if output != OutputFormat.TABLE:
+        emit_records((r.to_dict() for r in results), output)
+    else:
+        table = Table(title=f"Clones of VM {engine.source['vmid']} ({engine.source.get('name')})")
+        table.add_column("Name", style="cyan")
+        table.add_column("VMID", style="white")
+        table.add_column("Node", style="blue")
+        table.add_column("Storage", style="blue")
+        table.add_column("Waited", justify="right")
+        table.add_column("Took", justify="right")
+        table.add_column("Host", style="green")
+        table.add_column("Result", style="white")
+        for r in results:
+            table.add_row(
+                r.plan.name,
+                str(r.plan.vmid),
+                r.plan.node,
+                r.plan.storage or "-",
+                f"{r.started_s:.1f}s" if r.started_s is not None else "-",
+                f"{r.duration_s:.1f}s" if r.duration_s is not None else "-",
+                r.host or "-",
+                "[green]ok[/green]" if r.error is None else f"[red]{r.error}[/red]",
+            )
+        console.print(table)
+
+    if register_failed or any(r.error for r in results):
+        raise typer.Exit(1)
 
 
-def display_instance(instance: OpenCLAWInstance):
+@tracing.traced("cli.render")
+def display_instance(instance: OpenCLAWInstance, age: Optional[float] = None, stale: bool = False):
     table = Table(title=f"Instance: {instance.name}")
     table.add_column("Property", style="cyan")
     table.add_column("Value", style="green")
@@ -170,13 +883,21 @@ def display_instance(instance: OpenCLAWInstance):
     table.add_row("Health Check", "✓ Passed" if instance.health_check_passed else "✗ Failed")
     table.add_row("Version", instance.version or "unknown")
     table.add_row("Last Check", instance.last_health_check or "never")
+    if age is not None:
+        table.add_row("Cache Age", f"{format_age(age)}{' (stale)' if stale else ''}")
     if instance.error_message:
         table.add_row("Error", instance.error_message)
 
     console.print(table)
 
 
-def display_instances_table(instances: list[OpenCLAWInstance]):
+@tracing.traced("cli.render")
+def display_instances_table(
+    instances: list[OpenCLAWInstance],
+    ages: Optional[dict[str, float]] = None,
+    stale: Optional[set[str]] = None,
+):
+    stale = stale or set()
     table = Table(title="OpenCLAW Instances")
     table.add_column("Name", style="cyan")
     table.add_column("Host", style="green")
@@ -184,23 +905,134 @@ def display_instances_table(instances: list[OpenCLAWInstance]):
     table.add_column("Status", style="yellow")
     table.add_column("Health", style="magenta")
     table.add_column("Version", style="white")
+    if ages is not None:
+        table.add_column("Age", style="white", justify="right")
 
     for instance in instances:
         status_color = "green" if instance.status == InstanceStatus.RUNNING else "red"
         health_icon = "✓" if instance.health_check_passed else "✗"
         health_color = "green" if instance.health_check_passed else "red"
 
-        table.add_row(
+        row = [
             instance.name,
             instance.host,
             instance.type.value,
             f"[{status_color}]{instance.status.value}[/{status_color}]",
             f"[{health_color}]{health_icon}[/{health_color}]",
             instance.version or "unknown",
-        )
+        ]
+        if ages is not None:
+            age = format_age(ages.get(instance.name, 0.0))
+            row.append(f"[dim]{age} (stale)[/dim]" if instance.name in stale else age)
+        table.add_row(*row)
 
     console.print(table)
 
 
+def format_age(seconds: float) -> str:
+    if seconds < 60:
+        return f"{seconds:.0f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.0f}m"
+    return f"{seconds / 3600:.1f}h"
+
+
+def display_startup_report(report: StartupReport):
+    def seconds(value: Optional[float]) -> str:
+        return f"{value:.1f}" if value is not None else "-"
+
+    table = Table(title="Startup")
+    table.add_column("Instance", style="cyan")
+    table.add_column("After", style="white")
+    table.add_column("Result")
+    table.add_column("Start (s)", justify="right")
+    table.add_column("Healthy after (s)", justify="right")
+    table.add_column("Ready at (s)", justify="right", style="yellow")
+    for r in report.results.values():
+        if r.success:
+            result = "[green]already running[/green]" if r.already_running else "[green]ok[/green]"
+        else:
+            result = f"[red]{r.error}[/red]"
+        table.add_row(
+            r.name,
+            ", ".join(r.depends_on) or "-",
+            result,
+            seconds(r.start_duration_s),
+            seconds(r.health_wait_s),
+            seconds(r.ready_s),
+        )
+    console.print(table)
+
+    path = report.critical_path
+    if path:
+        console.print(
+            f"Critical path ({report.total_s:.1f}s total, {report.serial_s:.1f}s if serial): "
+            + " -> ".join(f"{r.name} ({r.busy_s:.1f}s)" for r in path)
+        )
+
+
+def display_profile(top: int = 10):
+    spans = tracing.collected_spans()
+    if not spans:
+        profile_console.print("[yellow]No spans recorded[/yellow]")
+        return
+
+    for instance, entries in tracing.waterfalls().items():
+        start = min(s.start_ns for _, s in entries)
+        total = max(max(s.end_ns for _, s in entries) - start, 1)
+        base_depth = min(depth for depth, _ in entries)
+
+        table = Table(title=f"Waterfall: {instance} ({total / 1e6:.1f} ms)", box=None)
+        table.add_column("Span", style="cyan", no_wrap=True)
+        table.add_column("Timeline", no_wrap=True)
+        table.add_column("ms", justify="right", style="yellow")
+        for depth, s in entries:
+            offset = int((s.start_ns - start) / total * WATERFALL_WIDTH)
+            width = max(1, round((s.end_ns - s.start_ns) / total * WATERFALL_WIDTH))
+            color = "red" if s.error else "green"
+            table.add_row(
+                "  " * (depth - base_depth) + s.name,
+                " " * offset + f"[{color}]{'█' * min(width, WATERFALL_WIDTH - offset)}[/{color}]",
+                f"{s.duration_ms:.1f}",
+            )
+        profile_console.print(table)
+
+    table = Table(title=f"Top {top} slowest spans")
+    table.add_column("Span", style="cyan")
+    table.add_column("Instance", style="green")
+    table.add_column("Attributes", style="white")
+    table.add_column("ms", justify="right", style="yellow")
+    for s in tracing.slowest_spans(top):
+        attributes = ", ".join(f"{k}={v}" for k, v in s.attributes.items() if k != "instance")
+        table.add_row(s.name, s.instance or "-", attributes, f"{s.duration_ms:.1f}")
+    profile_console.print(table)
+
+    used = [limiter for limiter in adaptive_limiter.limiters() if limiter.calls]
+    if used:
+        table = Table(title="Concurrency limits")
+        table.add_column("Backend", style="cyan", no_wrap=True)
+        table.add_column("Limit", justify="right", style="yellow")
+        table.add_column("Max", justify="right")
+        table.add_column("Active", justify="right")
+        table.add_column("Queued", justify="right")
+        table.add_column("Peak", justify="right")
+        table.add_column("Calls", justify="right")
+        table.add_column("Drops", justify="right", style="red")
+        table.add_column("Avg ms", justify="right")
+        for limiter in used:
+            table.add_row(
+                limiter.name,
+                str(int(limiter.limit)),
+                str(limiter.max_limit),
+                str(limiter.in_flight),
+                str(limiter.queued),
+                str(limiter.peak_queued),
+                str(limiter.calls),
+                str(limiter.drops),
+                f"{limiter.smoothed_s * 1000:.1f}" if limiter.smoothed_s is not None else "-",
+            )
+        profile_console.print(table)
+
+
 def main():
     app()
@@ -0,0 +1,353 @@
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import cycle
+from typing import Optional
+
+import yaml
+
+from .models import OpenCLAWInstance, InstanceType
+from .proxmox_client import ProxmoxClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORAGE_LIMIT = 2
+DEFAULT_START_VMID = 100
+# Key for clones that stay on the source VM's storage
+SOURCE_STORAGE = "<source>"
+
+
+def allocate_vmids(used: set[int], count: int, start: int = DEFAULT_START_VMID) -> list[int]:
+    vmids = []
+    vmid = start
+    while len(vmids) < count:
+        if vmid not in used:
+            vmids.append(vmid)
+        vmid += 1
+    return vmids
+
+
+def parse_storage_limits(specs: list[str], default: int) -> dict[str, int]:
+    """``["local-lvm=4", "ceph"]`` -> ``{"local-lvm": 4, "ceph": default}``."""
+    limits = {}
+    for spec in specs:
+        name, _, limit = spec.partition("=")
+        try:
+            limits[name] = int(limit) if limit else default
+        except ValueError:
+            raise ValueError(f"Invalid storage limit '{spec}', expected NAME or NAME=N")
+        if limits[name] < 1:
+            raise ValueError(f"Storage limit for '{name}' must be at least 1")
+    return limits
+
+
+@dataclass
+class ClonePlan:
+    name: str
+    vmid: int
+    node: str
+    storage: Optional[str] = None
+
+
+@dataclass
+class CloneResult:
+    plan: ClonePlan
+    upid: Optional[str] = None
+    success: bool = False
+    error: Optional[str] = None
+    # Seconds since CloneEngine.run() began; started_s is the time spent queued for a slot
+    started_s: Optional[float] = None
+    finished_s: Optional[float] = None
+    host: Optional[str] = None
+
+    @property
+    def duration_s(self) -> Optional[float]:
+        if self.started_s is None or self.finished_s is None:
+            return None
+        return self.finished_s - self.started_s
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.plan.name,
+            "vmid": self.plan.vmid,
+            "node": self.plan.node,
+            "storage": self.plan.storage,
+            "upid": self.upid,
+            "success": self.success,
+            "error": self.error,
+            "started_s": self.started_s,
+            "duration_s": self.duration_s,
+            "host": self.host,
+        }
+
+
+class CloneEngine:
+    """Clones one source VM many times in parallel.
+
+    VMIDs come from a single read of the cluster index. Clones are spread
+    round-robin over the target nodes and storages, and each storage only runs
+    ``storage_limits[name]`` clones at once. A non-template source is cloned one
+    at a time, because Proxmox locks it for the duration of each clone.
+    """
+
+    def __init__(
+        self,
+        client: ProxmoxClient,
+        storage_limits: Optional[dict[str, int]] = None,
+        default_storage_limit: int = DEFAULT_STORAGE_LIMIT,
+        poll_interval: float = 1.0,
+        task_timeout: float = 1800,
+    ):
+        self.client = client
+        self.storage_limits = dict(storage_limits or {})
+        self.default_storage_limit = default_storage_limit
+        self.poll_interval = poll_interval
+        self.task_timeout = task_timeout
+        self._semaphores: dict[str, threading.Semaphore] = {}
+        self._lock = threading.Lock()
+        self._used_vmids: set[int] = set()
+        self._used_names: set[str] = set()
+        self._source: Optional[dict] = None
+
+    @property
+    def source(self) -> Optional[dict]:
+        return self._source
+
+    def resolve_source(self, source: str) -> dict:
+        vms = [r for r in self.client.get_cluster_resources(type="vm") if r.get("type") == "qemu"]
+        self._used_vmids = {vm["vmid"] for vm in vms}
+        self._used_names = {vm.get("name") for vm in vms}
+        for vm in vms:
+            if str(vm["vmid"]) == source or vm.get("name") == source:
+                self._source = vm
+                return vm
+        raise ValueError(f"Source VM '{source}' not found in cluster")
+
+    def plan(
+        self,
+        source: str,
+        count: int,
+        prefix: str,
+        nodes: Optional[list[str]] = None,
+        storages: Optional[list[str]] = None,
+        start_vmid: int = DEFAULT_START_VMID,
+    ) -> list[ClonePlan]:
+        vm = self.resolve_source(source)
+        names = []
+        index = 1
+        while len(names) < count:
+            name = f"{prefix}-{index:02d}"
+            if name not in self._used_names:
+                names.append(name)
+            index += 1
+
+        vmids = allocate_vmids(self._used_vmids, count, start=start_vmid)
+        self._used_vmids.update(vmids)
+        node_cycle = cycle(nodes or [vm["node"]])
+        storage_cycle = cycle(storages or [None])
+        return [
+            ClonePlan(name=name, vmid=vmid, node=next(node_cycle), storage=next(storage_cycle))
+            for name, vmid in zip(names, vmids)
+        ]
+
+    def _semaphore(self, plan: ClonePlan) -> threading.Semaphore:
+        if self._source is not None and not self._source.get("template"):
+            key, limit = f"vm:{self._source['vmid']}", 1
+        else:
+            key = plan.storage or SOURCE_STORAGE
+            limit = self.storage_limits.get(key, self.default_storage_limit)
+        with self._lock:
+            if key not in self._semaphores:
+                self._semaphores[key] = threading.Semaphore(limit)
+            return self._semaphores[key]
+
+    def _next_free_vmid(self, taken: int) -> int:
+        with self._lock:
+            self._used_vmids.add(taken)
+            vmid = allocate_vmids(self._used_vmids, 1, start=taken)[0]
+            self._used_vmids.add(vmid)
+            return vmid
+
+    def clone_one(self, plan: ClonePlan, full: bool, start: bool, t0: float) -> CloneResult:
+        result = CloneResult(plan=plan)
+        with self._semaphore(plan):
+            result.started_s = time.monotonic() - t0
+            try:
+                for _ in range(3):
+                    try:
+                        result.upid = self.client.clone_vm(
+                            self._source["vmid"],
+                            plan.vmid,
+                            name=plan.name,
+                            target_node=plan.node,
+                            storage=plan.storage,
+                            full=full,
+                        )
+                        break
+                    except Exception as e:
+                        # Someone else took the VMID since we read the cluster index
+                        if "already exists" not in str(e):
+                            raise
+                        plan.vmid = self._next_free_vmid(plan.vmid)
+                else:
+                    raise RuntimeError("No free VMID after 3 attempts")
+
+                self.client.wait_for_task(
+                    result.upid, timeout=self.task_timeout, poll_interval=self.poll_interval
+                )
+                result.finished_s = time.monotonic() - t0
+                result.success = True
+            except Exception as e:
+                result.finished_s = time.monotonic() - t0
+                result.error = str(e)
+                logger.error(f"Clone {plan.name} ({plan.vmid}) failed: {e}")
+                return result
+
+        if start:
+            try:
+                self.client.start_vm(plan.vmid)
+            except Exception as e:
+                result.error = f"cloned, but start failed: {e}"
+        return result
+
+    def run(
+        self, plans: list[ClonePlan], full: bool = False, start: bool = False
+    ) -> list[CloneResult]:
+        if self._source is None:
+            raise RuntimeError("resolve_source() or plan() must run before run()")
+        if not plans:
+            return []
+        t0 = time.monotonic()
+        with ThreadPoolExecutor(max_workers=len(plans)) as executor:
+            return list(executor.map(lambda p: self.clone_one(p, full, start, t0), plans))
+
+    def wait_for_addresses(self, results: list[CloneResult], timeout: float = 120):
+        """Fill ``host`` from the guest agent for started clones, until ``timeout``."""
+        pending = [r for r in results if r.success and r.host is None]
+        deadline = time.monotonic() + timeout
+        while pending:
+            for result in list(pending):
+                result.host = self.client.get_vm_ipv4(result.plan.vmid)
+                if result.host:
+                    pending.remove(result)
+            if not pending or time.monotonic() >= deadline:
+                break
+            time.sleep(self.poll_interval)
+
+
+def instances_from_clones(
+    results: list[CloneResult],
+    base: Optional[OpenCLAWInstance] = None,
+    cluster: Optional[str] = None,
+) -> list[OpenCLAWInstance]:
+    """OpenCLAW instances for successful clones, inheriting SSH/port settings from ``base``.
+
+    Clones whose address is not known yet (not started, or no guest agent) are
+    left out, since they could not be reached.
+    """
+    instances = []
+    for result in results:
+        if not result.success:
+            continue
+        if not result.host:
+            logger.warning(f"No IP address for clone {result.plan.name}, not registering it")
+            continue
+        instances.append(
+            OpenCLAWInstance(
+                name=result.plan.name,
+                host=result.host,
+                port=base.port if base else 22,
+                user=base.user if base else "root",
+                type=InstanceType.PROXMOX,
+                vm_id=result.plan.vmid,
+                openclaw_port=base.openclaw_port if base else OpenCLAWInstance.openclaw_port,
+                description=f"Clone of {base.name}" if base else "",
+                cluster=cluster,
+            )
+        )
+    return instances
+
+
+_INSTANCES_KEY_RE = re.compile(r"^openclaw_instances:[ \t]*(?P<value>[^#\n]*?)[ \t]*(#.*)?$", re.M)
+_ITEM_RE = re.compile(r"^(?P<indent>[ \t]*)- ", re.M)
+
+
+def _instance_entry(instance: OpenCLAWInstance) -> dict:
+    keys = ("name", "host", "port", "user", "type", "vm_id", "openclaw_port", "description")
+    entry = {key: value for key, value in instance.to_dict().items() if key in keys}
+    if instance.cluster:
+        entry["cluster"] = instance.cluster
+    return entry
+
+
+def append_instances_text(text: str, instances: list[OpenCLAWInstance]) -> str:
+    """``text`` with instances added at the end of its ``openclaw_instances`` list.
+
+    Works on the text rather than re-serializing, so comments and layout are kept.
+    Raises ValueError for layouts it can't extend safely (e.g. a non-empty flow list).
+    """
+    match = _INSTANCES_KEY_RE.search(text)
+    if match is None:
+        head = text if not text or text.endswith("\n") else text + "\n"
+        head, block, tail = head + "openclaw_instances:\n", "", ""
+    elif match.group("value") not in ("", "[]"):
+        raise ValueError("openclaw_instances is not a block list; add the clones by hand")
+    else:
+        key_line = match.group(0).replace("[]", "", 1) if match.group("value") else match.group(0)
+        head = text[: match.start()] + key_line.rstrip() + "\n"
+        rest = text[match.end() :].removeprefix("\n")
+        # The list ends at the next top-level key
+        next_key = re.search(r"^[^\s#-]", rest, re.M)
+        split = next_key.start() if next_key else len(rest)
+        block, tail = rest[:split], rest[split:]
+
+    # Blank lines and unindented comments at the end lead into the next section
+    lines = block.splitlines(keepends=True)
+    keep = len(lines)
+    while keep and (not lines[keep - 1].strip() or lines[keep - 1].startswith("#")):
+        keep -= 1
+    body, trailer = "".join(lines[:keep]), "".join(lines[keep:])
+    if body and not body.endswith("\n"):
+        body += "\n"
+
+    item = _ITEM_RE.search(body)
+    indent = item.group("indent") if item else "  "
+    for instance in instances:
+        dumped = yaml.safe_dump([_instance_entry(instance)], sort_keys=False)
+        body += "".join(f"{indent}{line}" for line in dumped.splitlines(keepends=True))
+    updated = head + body + trailer + tail
+
+    data = yaml.safe_load(updated) or {}
+    names = [entry.get("name") for entry in data.get("openclaw_instances") or []]
+    if names[-len(instances) :] != [i.name for i in instances]:
+        raise ValueError("Could not append to openclaw_instances safely; add the clones by hand")
+    return updated
+
+
+def register_instances(config_path: str, instances: list[OpenCLAWInstance]):
+    """Append instances to the config file's ``openclaw_instances`` (atomic rewrite).
+
+    The existing text, comments included, is kept as is. A running
+    ``watch --reload`` picks the new entries up on its own.
+    """
+    if not instances:
+        return
+    with open(config_path, "r") as f:
+        text = f.read()
+    updated = append_instances_text(text, instances)
+
+    directory = os.path.dirname(os.path.abspath(config_path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".config-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(updated)
+        os.chmod(tmp, os.stat(config_path).st_mode & 0o777)
+        os.replace(tmp, config_path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
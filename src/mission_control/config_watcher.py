@@ -0,0 +1,192 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+from .models import Config, OpenCLAWInstance
+
+logger = logging.getLogger(__name__)
+
+# inotify(7) event masks
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_NONBLOCK = 0o4000
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def instance_identity(instance: OpenCLAWInstance) -> tuple:
+    """The fields that decide which host/VM an instance talks to."""
+    return (
+        instance.host,
+        instance.port,
+        instance.user,
+        instance.type,
+        instance.vm_id,
+        instance.openclaw_port,
+        instance.health_path,
+        instance.cluster,
+    )
+
+
+@dataclass
+class InstanceDiff:
+    added: list[OpenCLAWInstance] = field(default_factory=list)
+    removed: list[OpenCLAWInstance] = field(default_factory=list)
+    # (old, new) pairs
+    changed: list[tuple[OpenCLAWInstance, OpenCLAWInstance]] = field(default_factory=list)
+    unchanged: list[tuple[OpenCLAWInstance, OpenCLAWInstance]] = field(default_factory=list)
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def summary(self) -> str:
+        return (
+            f"{len(self.added)} added, {len(self.removed)} removed, "
+            f"{len(self.changed)} changed, {len(self.unchanged)} unchanged"
+        )
+
+
+def diff_instances(old: list[OpenCLAWInstance], new: list[OpenCLAWInstance]) -> InstanceDiff:
+    diff = InstanceDiff()
+    old_by_name = {i.name: i for i in old}
+    new_names = {i.name for i in new}
+
+    for instance in new:
+        previous = old_by_name.get(instance.name)
+        if previous is None:
+            diff.added.append(instance)
+        elif instance_identity(previous) != instance_identity(instance):
+            diff.changed.append((previous, instance))
+        else:
+            diff.unchanged.append((previous, instance))
+
+    diff.removed = [i for i in old if i.name not in new_names]
+    return diff
+
+
+class _Inotify:
+    def __init__(self, directory: Path):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # Only finished writes: a file still being written in place can parse as a
+        # truncated config, and every instance missing from it would be dropped
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+
+    def wait(self, timeout: float) -> set[str]:
+        """Names touched in the watched directory, or an empty set on timeout."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        names = set()
+        offset = 0
+        while offset < len(data):
+            _, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            names.add(data[offset : offset + length].rstrip(b"\0").decode(errors="replace"))
+            offset += length
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+
+class ConfigWatcher:
+    """Re-parses a config file whenever it changes and hands the result to ``on_change``.
+
+    Uses inotify on the file's directory (so editors that save via rename are seen)
+    and falls back to polling mtime/size where inotify is unavailable. A file that
+    fails to parse is logged and skipped; the previous config stays in effect.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        on_change: Callable[[Config], None],
+        poll_interval: float = 2.0,
+        use_inotify: bool = True,
+    ):
+        self.path = Path(path).resolve()
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.reloads = 0
+        self._signature = self._stat()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._inotify: Optional[_Inotify] = None
+
+    def _stat(self) -> Optional[tuple[int, int]]:
+        try:
+            st = self.path.stat()
+            return (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            return None
+
+    def check(self) -> bool:
+        """Reload if the file changed since the last check; returns True on reload."""
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return False
+        self._signature = signature
+
+        try:
+            config = Config.from_yaml(str(self.path))
+        except Exception as e:
+            logger.error(f"Ignoring invalid config {self.path}: {e}")
+            return False
+
+        logger.info(f"Config {self.path} changed, reloading")
+        self.reloads += 1
+        self.on_change(config)
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self._inotify is not None:
+                names = self._inotify.wait(self.poll_interval)
+                if self.path.name not in names:
+                    continue
+            else:
+                self._stop.wait(self.poll_interval)
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Config reload failed: {e}")
+
+    def start(self):
+        if self.use_inotify:
+            try:
+                self._inotify = _Inotify(self.path.parent)
+            except (OSError, AttributeError) as e:
+                logger.info(f"inotify unavailable ({e}), polling {self.path} instead")
+                self._inotify = None
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="config-watch", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval + 1)
+            self._thread = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
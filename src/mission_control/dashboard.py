@@ -0,0 +1,246 @@
+import logging
+import math
+import threading
+import time
+from typing import Callable, Optional
+
+from rich.console import Console
+from rich.live import Live
+from rich.table import Table
+
+from .manager import InstanceManager, DEFAULT_SWEEP_WORKERS
+from .models import OpenCLAWInstance, InstanceStatus, InstanceType
+from .sharding import ShardedMonitor
+
+logger = logging.getLogger(__name__)
+
+# Screen rows taken by the table title, header and borders
+TABLE_CHROME_ROWS = 6
+REDRAW_INTERVAL = 0.25
+# Latency below this is all one band; above it, a band per doubling
+LATENCY_BAND_FLOOR_MS = 20.0
+# Position of the "ms" cell in a rendered row
+LATENCY_COLUMN = 6
+
+SORT_KEYS: dict[str, Callable[[OpenCLAWInstance], object]] = {
+    "name": lambda i: i.name,
+    "host": lambda i: i.host,
+    "type": lambda i: (i.type.value, i.name),
+    "status": lambda i: (i.status.value, i.name),
+    "latency": lambda i: math.inf if i.response_time_ms is None else i.response_time_ms,
+}
+
+
+class FleetWatcher:
+    """Keeps one manager warm, sweeps in the background and redraws only on change.
+
+    Rendered cells are cached per instance and rebuilt only when that instance's
+    status, health, version, error or anomaly changed since the last sweep, or its
+    latency moved to another band. Probe jitter alone does not redraw a row, but
+    the latency cell itself is filled in fresh on every redraw, so it always agrees
+    with ``--sort latency`` and ``--slower-than``.
+    With a ``monitor``, sweeps run in its worker processes instead of a thread here.
+    """
+
+    def __init__(
+        self,
+        manager: InstanceManager,
+        interval: float = 5.0,
+        sort: str = "name",
+        reverse: bool = False,
+        type_filter: Optional[InstanceType] = None,
+        status_filter: Optional[InstanceStatus] = None,
+        slower_than: Optional[float] = None,
+        max_workers: int = DEFAULT_SWEEP_WORKERS,
+        monitor: Optional[ShardedMonitor] = None,
+    ):
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key '{sort}', expected one of {', '.join(SORT_KEYS)}")
+        self.manager = manager
+        self.interval = interval
+        self.sort = sort
+        self.reverse = reverse
+        self.type_filter = type_filter
+        self.status_filter = status_filter
+        self.slower_than = slower_than
+        self.max_workers = max_workers
+        self.monitor = monitor
+        self.sweeps = 0
+        self.last_sweep_ms: Optional[float] = None
+        self.rows_rendered = 0
+        self._rows: dict[str, tuple[tuple, tuple[str, ...]]] = {}
+        self._lock = threading.Lock()
+        self._dirty = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def latency_band(latency_ms: Optional[float]) -> Optional[int]:
+        if latency_ms is None:
+            return None
+        return int(math.log2(max(latency_ms, LATENCY_BAND_FLOOR_MS) / LATENCY_BAND_FLOOR_MS))
+
+    @classmethod
+    def signature(cls, instance: OpenCLAWInstance) -> tuple:
+        return (
+            instance.status,
+            instance.health_check_passed,
+            instance.version,
+            cls.latency_band(instance.response_time_ms),
+            instance.error_message,
+        )
+
+    @staticmethod
+    def latency_cell(instance: OpenCLAWInstance) -> str:
+        return "-" if instance.response_time_ms is None else f"{instance.response_time_ms:.0f}"
+
+    @classmethod
+    def render_row(cls, instance: OpenCLAWInstance) -> tuple[str, ...]:
+        status_color = "green" if instance.status == InstanceStatus.RUNNING else "red"
+        health_color = "green" if instance.health_check_passed else "red"
+        health_icon = "✓" if instance.health_check_passed else "✗"
+        return (
+            instance.name,
+            instance.host,
+            instance.type.value,
+            f"[{status_color}]{instance.status.value}[/{status_color}]",
+            f"[{health_color}]{health_icon}[/{health_color}]",
+            instance.version or "unknown",
+            cls.latency_cell(instance),
+        )
+
+    def anomaly(self, instance: OpenCLAWInstance) -> Optional[str]:
+        """The instance's current anomaly ("" if none), or None when detection is off."""
+        detector = self.manager.anomaly_detector
+        return None if detector is None else detector.summary(instance.name)
+
+    def _render(self, instance: OpenCLAWInstance, anomaly: Optional[str]) -> tuple[str, ...]:
+        row = self.render_row(instance)
+        if anomaly is None:
+            return row
+        return row + (f"[red]{anomaly}[/red]" if anomaly else "",)
+
+    def observe(self, instance: OpenCLAWInstance) -> bool:
+        """Record a fresh result; returns True if the instance's row changed."""
+        anomaly = self.anomaly(instance)
+        signature = self.signature(instance) + (anomaly,)
+        with self._lock:
+            cached = self._rows.get(instance.name)
+            if cached is not None and cached[0] == signature:
+                return False
+            self._rows[instance.name] = (signature, self._render(instance, anomaly))
+            self.rows_rendered += 1
+        self._dirty.set()
+        return True
+
+    def sweep(self):
+        started = time.perf_counter()
+        for instance in self.manager.iter_instance_statuses(max_workers=self.max_workers):
+            self.observe(instance)
+        self._sweep_done((time.perf_counter() - started) * 1000)
+
+    def _sweep_done(self, elapsed_ms: Optional[float]):
+        if self.manager.anomaly_detector is not None:
+            # Anomalies are computed once the whole sweep is in
+            for instance in self.manager.get_all_instances():
+                self.observe(instance)
+        self.last_sweep_ms = elapsed_ms
+        self.sweeps += 1
+        self._dirty.set()
+
+    def _on_round(self, monitor: ShardedMonitor):
+        # A round lasts as long as its slowest shard
+        times = [w.last_sweep_ms for w in monitor.active if w.last_sweep_ms is not None]
+        self._sweep_done(max(times, default=None))
+
+    def _sweep_loop(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Watch sweep failed: {e}")
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def visible_instances(self) -> list[OpenCLAWInstance]:
+        instances = [
+            i
+            for i in self.manager.get_all_instances()
+            if (self.type_filter is None or i.type == self.type_filter)
+            and (self.status_filter is None or i.status == self.status_filter)
+            and (
+                self.slower_than is None
+                or (i.response_time_ms is not None and i.response_time_ms >= self.slower_than)
+            )
+        ]
+        return sorted(instances, key=SORT_KEYS[self.sort], reverse=self.reverse)
+
+    def build_table(self, max_rows: Optional[int] = None) -> Table:
+        instances = self.visible_instances()
+        shown = instances if max_rows is None else instances[: max(max_rows, 0)]
+
+        sweep = (
+            "first sweep running"
+            if self.last_sweep_ms is None
+            else f"sweep #{self.sweeps} took {self.last_sweep_ms:.0f} ms"
+        )
+        detector = self.manager.anomaly_detector
+        if detector is not None and detector.anomalies:
+            sweep += f", {len({a.instance for a in detector.anomalies})} anomalous"
+        table = Table(title=f"OpenCLAW Instances ({len(shown)}/{len(instances)} shown, {sweep})")
+        table.add_column("Name", style="cyan")
+        table.add_column("Host", style="green")
+        table.add_column("Type", style="blue")
+        table.add_column("Status", style="yellow")
+        table.add_column("Health", style="magenta")
+        table.add_column("Version", style="white")
+        table.add_column("ms", justify="right", style="white")
+        if detector is not None:
+            table.add_column("Anomaly")
+
+        with self._lock:
+            for instance in shown:
+                cached = self._rows.get(instance.name)
+                if cached is None:
+                    row = self._render(instance, self.anomaly(instance))
+                else:
+                    # Cached cells may hold a latency from earlier in the same band
+                    row = list(cached[1])
+                    row[LATENCY_COLUMN] = self.latency_cell(instance)
+                table.add_row(*row)
+        return table
+
+    def start(self):
+        if self.monitor is not None:
+            self.monitor.start(on_result=self.observe, on_round=self._on_round)
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sweep_loop, name="watch-sweep", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self.monitor is not None:
+            self.monitor.stop()
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+
+    def run(self, console: Console):
+        self.start()
+        try:
+            with Live(
+                self.build_table(console.size.height - TABLE_CHROME_ROWS),
+                console=console,
+                auto_refresh=False,
+            ) as live:
+                while True:
+                    if not self._dirty.wait(REDRAW_INTERVAL):
+                        continue
+                    self._dirty.clear()
+                    live.update(
+                        self.build_table(console.size.height - TABLE_CHROME_ROWS), refresh=True
+                    )
+                    # Coalesce bursts of per-instance results into one redraw
+                    time.sleep(REDRAW_INTERVAL)
+        finally:
+            self.stop()
@@ -0,0 +1,239 @@
+import fnmatch
+import hashlib
+import logging
+import posixpath
+import shlex
+import stat
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from .models import OpenCLAWInstance
+from .ssh_client import SSHConnectionPool, REMOTE_BUNDLE_DIR
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUNDLE_DIR = Path(__file__).parent.parent.parent / "openclaw-docker"
+# The upstream checkout is managed by deploy-openclaw.sh on the host itself
+DEFAULT_EXCLUDES = (".*", "*.code-workspace", "repository")
+CHUNK_SIZE = 32 * 1024
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_bundle(source_dir: Path, excludes: tuple[str, ...] = DEFAULT_EXCLUDES) -> dict[str, str]:
+    hashes = {}
+    for path in sorted(source_dir.rglob("*")):
+        rel = path.relative_to(source_dir).as_posix()
+        if any(fnmatch.fnmatch(part, pattern) for part in rel.split("/") for pattern in excludes):
+            continue
+        if path.is_file():
+            hashes[rel] = hash_file(path)
+    return hashes
+
+
+def parse_size(value: str) -> int:
+    units = {"K": 1024, "M": 1024**2, "G": 1024**3}
+    number = value.strip().upper().removesuffix("B")
+    try:
+        if number and number[-1] in units:
+            return int(float(number[:-1]) * units[number[-1]])
+        return int(number)
+    except ValueError:
+        raise ValueError(f"Invalid size '{value}', expected e.g. 512K or 2M") from None
+
+
+class BandwidthLimiter:
+    """Token bucket shared by all upload threads, in bytes per second."""
+
+    def __init__(self, rate: int):
+        if rate <= 0:
+            raise ValueError("Bandwidth limit must be positive")
+        self.rate = rate
+        self._tokens = float(rate)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, nbytes: int):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.rate, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= nbytes or self._tokens >= self.rate:
+                    self._tokens -= nbytes
+                    return
+                wait = (min(nbytes, self.rate) - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+@dataclass
+class DeployPlan:
+    instance: OpenCLAWInstance
+    changed: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+@dataclass
+class DeployResult:
+    instance: OpenCLAWInstance
+    uploaded: list[str] = field(default_factory=list)
+    unchanged: int = 0
+    bytes_sent: int = 0
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+class Deployer:
+    def __init__(
+        self,
+        source_dir: Optional[Path] = None,
+        remote_dir: str = REMOTE_BUNDLE_DIR,
+        pool: Optional[SSHConnectionPool] = None,
+        max_workers: int = 8,
+        bandwidth_limit: Optional[int] = None,
+        excludes: tuple[str, ...] = DEFAULT_EXCLUDES,
+    ):
+        self.source_dir = Path(source_dir or DEFAULT_BUNDLE_DIR)
+        # Without this an empty bundle "deploys" successfully to every host
+        if not self.source_dir.is_dir():
+            raise ValueError(f"Bundle directory {self.source_dir} not found (use --source)")
+        self.local_hashes = hash_bundle(self.source_dir, excludes)
+        if not self.local_hashes:
+            raise ValueError(f"Bundle directory {self.source_dir} has no files to deploy")
+        self.remote_dir = remote_dir
+        self.pool = pool or SSHConnectionPool()
+        self.max_workers = max_workers
+        self.limiter = BandwidthLimiter(bandwidth_limit) if bandwidth_limit else None
+
+    def remote_hashes(self, instance: OpenCLAWInstance) -> dict[str, str]:
+        if not self.local_hashes:
+            return {}
+        files = " ".join(shlex.quote(rel) for rel in self.local_hashes)
+        # One round trip per host: missing files are silently skipped by sha256sum
+        command = (
+            f"cd ~/{shlex.quote(self.remote_dir)} 2>/dev/null && "
+            f"sha256sum -- {files} 2>/dev/null; true"
+        )
+        stdout, _, _ = self.pool.get(instance).execute_command(command)
+
+        hashes = {}
+        for line in stdout.splitlines():
+            digest, _, rel = line.partition("  ")
+            if rel:
+                hashes[rel.lstrip("*")] = digest
+        return hashes
+
+    def plan_instance(self, instance: OpenCLAWInstance) -> DeployPlan:
+        plan = DeployPlan(instance=instance)
+        try:
+            remote = self.remote_hashes(instance)
+        except Exception as e:
+            logger.error(f"Failed to read remote bundle on {instance.name}: {e}")
+            plan.error = str(e)
+            return plan
+
+        for rel, digest in self.local_hashes.items():
+            if remote.get(rel) == digest:
+                plan.unchanged.append(rel)
+            else:
+                plan.changed.append(rel)
+        return plan
+
+    def plan(self, instances: list[OpenCLAWInstance]) -> list[DeployPlan]:
+        """Plans for the OpenCLAW hosts among ``instances``; other services are skipped."""
+        skipped = [i.name for i in instances if not i.runs_openclaw]
+        if skipped:
+            logger.info(f"Not deploying to non-OpenCLAW instance(s): {', '.join(skipped)}")
+            instances = [i for i in instances if i.runs_openclaw]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(self.plan_instance, instances))
+
+    def _upload_file(self, sftp, rel: str) -> int:
+        local = self.source_dir / rel
+        remote = posixpath.join(self.remote_dir, rel)
+        tmp = f"{remote}.tmp-{threading.get_ident()}"
+
+        sent = 0
+        with open(local, "rb") as src, sftp.open(tmp, "wb") as dst:
+            dst.set_pipelined(True)
+            for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                if self.limiter:
+                    self.limiter.consume(len(chunk))
+                dst.write(chunk)
+                sent += len(chunk)
+        sftp.chmod(tmp, stat.S_IMODE(local.stat().st_mode))
+        sftp.posix_rename(tmp, remote)
+        return sent
+
+    def _ensure_remote_dirs(self, sftp, files: list[str]):
+        dirs = {self.remote_dir}
+        for rel in files:
+            parent = posixpath.dirname(rel)
+            while parent:
+                dirs.add(posixpath.join(self.remote_dir, parent))
+                parent = posixpath.dirname(parent)
+        for path in sorted(dirs, key=len):
+            try:
+                sftp.stat(path)
+            except FileNotFoundError:
+                sftp.mkdir(path)
+
+    def apply(self, plan: DeployPlan) -> DeployResult:
+        result = DeployResult(instance=plan.instance, unchanged=len(plan.unchanged))
+        if plan.error:
+            result.error = plan.error
+            return result
+        if not plan.changed:
+            return result
+
+        try:
+            sftp = self.pool.get(plan.instance).open_sftp()
+            try:
+                self._ensure_remote_dirs(sftp, plan.changed)
+                for rel in plan.changed:
+                    result.bytes_sent += self._upload_file(sftp, rel)
+                    result.uploaded.append(rel)
+            finally:
+                sftp.close()
+            logger.info(
+                f"Deployed {len(result.uploaded)} file(s) to {plan.instance.name} "
+                f"({result.bytes_sent} bytes)"
+            )
+        except Exception as e:
+            logger.error(f"Failed to deploy to {plan.instance.name}: {e}")
+            result.error = str(e)
+        return result
+
+    def deploy(
+        self, instances: list[OpenCLAWInstance], dry_run: bool = False
+    ) -> list[DeployResult]:
+        plans = self.plan(instances)
+        if dry_run:
+            return [
+                DeployResult(
+                    instance=p.instance,
+                    uploaded=p.changed,
+                    unchanged=len(p.unchanged),
+                    error=p.error,
+                )
+                for p in plans
+            ]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(self.apply, plans))
+
+    def close(self):
+        self.pool.close_all()
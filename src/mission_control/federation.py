@@ -0,0 +1,145 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Iterable, Optional, TypeVar
+
+from .models import DEFAULT_CLUSTER, OpenCLAWInstance, ProxmoxConfig
+from .proxmox_client import ProxmoxClient
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ProxmoxFederation:
+    """One ProxmoxClient per named cluster, with parallel fan-out across them.
+
+    Each client has its own HTTPS pool and concurrency limit, so a slow or
+    saturated cluster only queues its own requests.
+    """
+
+    def __init__(
+        self,
+        clusters: dict[str, ProxmoxConfig],
+        timeout: Optional[float] = None,
+        flights: Optional[SingleFlight] = None,
+    ):
+        self.timeout = timeout
+        self.flights = flights
+        self.clients: dict[str, ProxmoxClient] = {
+            name: ProxmoxClient(config, flights=flights) for name, config in clusters.items()
+        }
+
+    def __bool__(self) -> bool:
+        return bool(self.clients)
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+    @property
+    def names(self) -> list[str]:
+        return list(self.clients)
+
+    def resolve(self, name: Optional[str] = None) -> Optional[str]:
+        """Cluster name for ``name``; None picks the default, or the only cluster."""
+        if name is not None:
+            return name if name in self.clients else None
+        if DEFAULT_CLUSTER in self.clients:
+            return DEFAULT_CLUSTER
+        return next(iter(self.clients)) if len(self.clients) == 1 else None
+
+    def client(self, name: Optional[str] = None) -> Optional[ProxmoxClient]:
+        resolved = self.resolve(name)
+        return self.clients.get(resolved) if resolved else None
+
+    def client_for(self, instance: OpenCLAWInstance) -> Optional[ProxmoxClient]:
+        return self.client(instance.cluster)
+
+    def update(self, clusters: dict[str, ProxmoxConfig]) -> list[str]:
+        """Apply new cluster configs, keeping clients whose config is unchanged."""
+        changed = []
+        for name in list(self.clients):
+            if name not in clusters:
+                self.clients.pop(name).disconnect()
+                changed.append(name)
+        for name, config in clusters.items():
+            current = self.clients.get(name)
+            if current is None or current.config != config:
+                if current is not None:
+                    current.disconnect()
+                self.clients[name] = ProxmoxClient(config, flights=self.flights)
+                changed.append(name)
+        return changed
+
+    def submit_all(
+        self,
+        func: Callable[[ProxmoxClient], T],
+        on_done: Callable[[str, Optional[T], Optional[Exception]], None],
+        names: Optional[Iterable[str]] = None,
+    ) -> list[Future]:
+        """Run ``func`` against each cluster in parallel and call ``on_done`` per cluster.
+
+        ``on_done(name, result, error)`` runs as soon as that cluster finishes, so
+        callers can act on fast clusters while slow ones are still answering.
+        """
+        names = list(self.clients if names is None else names)
+        if not names:
+            return []
+        executor = ThreadPoolExecutor(max_workers=len(names), thread_name_prefix="pve-fanout")
+
+        def run(name: str):
+            client = self.clients.get(name)
+            try:
+                if client is None:
+                    raise ValueError(f"Unknown Proxmox cluster '{name}'")
+                result = func(client)
+            except Exception as e:
+                on_done(name, None, e)
+            else:
+                on_done(name, result, None)
+
+        futures = [executor.submit(run, name) for name in names]
+        executor.shutdown(wait=False)
+        return futures
+
+    def fan_out(
+        self,
+        func: Callable[[ProxmoxClient], T],
+        names: Optional[Iterable[str]] = None,
+        timeout: Optional[float] = None,
+    ) -> tuple[dict[str, T], dict[str, str]]:
+        """Results and errors by cluster; clusters still running after ``timeout`` are errors."""
+        results: dict[str, T] = {}
+        errors: dict[str, str] = {}
+        names = list(self.clients if names is None else names)
+        lock = threading.Lock()
+
+        def on_done(name: str, result, error):
+            with lock:
+                if error is None:
+                    results[name] = result
+                else:
+                    errors[name] = str(error)
+
+        futures = self.submit_all(func, on_done, names)
+        wait(futures, timeout=self.timeout if timeout is None else timeout)
+        # Late answers from timed-out clusters must not change what we return
+        with lock:
+            done, failed = dict(results), dict(errors)
+        for name in names:
+            if name not in done and name not in failed:
+                failed[name] = "timed out"
+        for name, error in failed.items():
+            logger.warning(f"Proxmox cluster '{name}' failed: {error}")
+        return done, failed
+
+    def get_all_vms(self, timeout: Optional[float] = None) -> tuple[list[dict], dict[str, str]]:
+        results, errors = self.fan_out(lambda c: c.get_all_vms(), timeout=timeout)
+        vms = [
+            {**vm, "cluster": name}
+            for name in self.clients
+            if name in results
+            for vm in results[name]
+        ]
+        return vms, errors
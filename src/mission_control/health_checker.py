@@ -1,21 +1,74 @@
 import logging
+import time
 import requests
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
+from .adaptive_limiter import shared_limiter
 from .models import OpenCLAWInstance, InstanceStatus
+from .singleflight import SingleFlight
+from .tracing import span
 
 logger = logging.getLogger(__name__)
 
+HTTP_MAX_CONCURRENCY = 16
+
+
+def is_overload(error: BaseException) -> bool:
+    return isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError))
+
+
+def _flight_key(instance: OpenCLAWInstance) -> tuple:
+    return ("health", instance.host, instance.openclaw_port, instance.health_path)
+
+
+@dataclass(frozen=True)
+class HealthResult:
+    healthy: bool
+    version: Optional[str]
+    # Timed inside the probe, so callers sharing it all see the real round trip
+    latency_ms: float
+
 
 class HealthChecker:
-    def __init__(self, timeout: int = 10):
+    def __init__(self, timeout: int = 10, flights: Optional[SingleFlight] = None):
         self.timeout = timeout
+        # Instances sharing a host:port, or callers probing at the same moment, share one GET
+        self.flights = flights or SingleFlight()
+
+    def check(self, instance: OpenCLAWInstance) -> HealthResult:
+        return self.flights.do(
+            _flight_key(instance),
+            lambda: self._probe(instance),
+        )
 
     def check_instance_health(self, instance: OpenCLAWInstance) -> tuple[bool, Optional[str]]:
-        url = f"http://{instance.host}:{instance.openclaw_port}/health"
+        result = self.check(instance)
+        return result.healthy, result.version
+
+    def forget(self, instance: OpenCLAWInstance):
+        """Make the next check of ``instance`` probe again instead of reusing a recent result."""
+        self.flights.forget(_flight_key(instance))
+
+    def _probe(self, instance: OpenCLAWInstance) -> HealthResult:
+        started = time.perf_counter()
+        healthy, version = self._get_health(instance)
+        return HealthResult(healthy, version, round((time.perf_counter() - started) * 1000, 1))
+
+    def _get_health(self, instance: OpenCLAWInstance) -> tuple[bool, Optional[str]]:
+        url = f"http://{instance.host}:{instance.openclaw_port}{instance.health_path}"
         try:
-            response = requests.get(url, timeout=self.timeout)
+            limiter = shared_limiter(
+                "http",
+                instance.host,
+                initial=HTTP_MAX_CONCURRENCY // 4,
+                max_limit=HTTP_MAX_CONCURRENCY,
+                is_overload=is_overload,
+            )
+            with span("http.health", instance=instance.name, url=url) as s, limiter.slot():
+                response = requests.get(url, timeout=self.timeout)
+                s.set_attribute("status_code", response.status_code)
             if response.status_code == 200:
                 try:
                     data = response.json()
@@ -41,11 +94,12 @@ class HealthChecker:
     def check_all_instances(self, instances: list[OpenCLAWInstance]) -> list[OpenCLAWInstance]:
         for instance in instances:
             try:
-                healthy, version = self.check_instance_health(instance)
-                instance.health_check_passed = healthy
-                instance.version = version
+                result = self.check(instance)
+                instance.response_time_ms = result.latency_ms
+                instance.health_check_passed = result.healthy
+                instance.version = result.version
                 instance.last_health_check = datetime.now().isoformat()
-                if healthy:
+                if result.healthy:
                     instance.status = InstanceStatus.RUNNING
                     instance.error_message = None
                 else:
@@ -0,0 +1,398 @@
+import gzip
+import logging
+import os
+import re
+import shlex
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Optional
+from urllib.parse import quote
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+from .models import OpenCLAWInstance
+from .ssh_client import SSHConnectionPool
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(os.environ.get("XDG_DATA_HOME", Path.home() / ".local" / "share")) / "openclaw-mgmt"
+DEFAULT_LOG_STORE = DATA_DIR / "logs"
+CONTAINER_NAME = "openclaw"
+DEFAULT_LOOKBACK = "24h"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cursors (
+    instance TEXT PRIMARY KEY,
+    last_ts INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    instance TEXT NOT NULL,
+    hour INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    codec TEXT NOT NULL,
+    UNIQUE (instance, hour)
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    id INTEGER PRIMARY KEY,
+    segment_id INTEGER NOT NULL REFERENCES segments(id),
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    first_ts INTEGER NOT NULL,
+    last_ts INTEGER NOT NULL,
+    lines INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS chunks_by_time ON chunks (last_ts, first_ts);
+"""
+
+# Inverted index from word trigrams to chunk ids. Contentless, so only the
+# postings are stored; the text itself stays in the compressed segments.
+TERMS_SCHEMA = """
+CREATE VIRTUAL TABLE chunk_terms USING fts5(
+    terms, tokenize = 'trigram', content = '', detail = 'none'
+)
+"""
+
+WORD_RE = re.compile(r"[A-Za-z0-9_]+")
+CHUNK_PAGE = 1000
+
+NS_PER_SECOND = 1_000_000_000
+NS_PER_HOUR = 3600 * NS_PER_SECOND
+
+
+def parse_docker_timestamp(value: str) -> int:
+    """Nanoseconds since the epoch from docker's RFC3339Nano (trailing zeros trimmed)."""
+    value = value.rstrip("Z")
+    seconds, _, fraction = value.partition(".")
+    dt = datetime.strptime(seconds, "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
+    return int(dt.timestamp()) * NS_PER_SECOND + int((fraction + "000000000")[:9])
+
+
+def chunk_terms(lines) -> str:
+    """Distinct lowercase words of the message part of each line, for the term index."""
+    words = set()
+    for line in lines:
+        words.update(WORD_RE.findall(line.partition(" ")[2].lower()))
+    return "\n".join(sorted(words))
+
+
+def format_since(ns: int) -> str:
+    return f"{ns // NS_PER_SECOND}.{ns % NS_PER_SECOND:09d}"
+
+
+def segment_dir(instance: str) -> str:
+    """``instance`` as a single path component under the store root.
+
+    Separators are percent-encoded and a leading dot escaped, so names like
+    ``../x`` or ``..`` can't leave the root or hide a directory.
+    """
+    name = quote(instance, safe="")
+    return "%2E" + name[1:] if name.startswith(".") else name
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def default_codec() -> str:
+    return "zstd" if zstandard is not None else "gzip"
+
+
+@dataclass
+class CollectResult:
+    instance: str
+    lines: int = 0
+    bytes_transferred: int = 0
+    segments: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class Chunk:
+    instance: str
+    path: str
+    codec: str
+    offset: int
+    length: int
+    first_ts: int
+    last_ts: int
+    lines: int
+    chunk_id: int = 0
+
+
+class LogStore:
+    """Hour-partitioned compressed segments per instance, indexed in SQLite.
+
+    Every append to a segment is written as an independent gzip member (or zstd
+    frame) and recorded as a chunk with its byte offset, so readers can seek
+    straight to the chunks covering a time range and decompress only those.
+    The words of each chunk also go into a trigram index so searches can skip
+    chunks that cannot contain a match.
+    """
+
+    def __init__(self, root: Optional[Path] = None, codec: Optional[str] = None):
+        self.root = Path(root or DEFAULT_LOG_STORE)
+        self.codec = codec or default_codec()
+        if self.codec == "zstd" and zstandard is None:
+            raise RuntimeError("zstd segments need the zstandard package")
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(str(self.root / "index.sqlite"), check_same_thread=False)
+        self.db.executescript(SCHEMA)
+        self.indexed = self._ensure_term_index()
+
+    def _ensure_term_index(self) -> bool:
+        exists = self.db.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'chunk_terms'"
+        ).fetchone()
+        if exists:
+            return True
+        try:
+            with self.db:
+                self.db.execute(TERMS_SCHEMA)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"SQLite has no FTS5 trigram tokenizer ({e}), searches will scan")
+            return False
+        self.reindex()
+        return True
+
+    def reindex(self) -> int:
+        """Rebuild the term index from the segments; returns chunks indexed."""
+        count = 0
+        with self._lock, self.db:
+            self.db.execute("DELETE FROM chunk_terms")
+            rows = self.db.execute(
+                "SELECT s.instance, s.path, s.codec, c.offset, c.length, c.first_ts, c.last_ts, "
+                "c.lines, c.id FROM chunks c JOIN segments s ON s.id = c.segment_id"
+            ).fetchall()
+            for row in rows:
+                chunk = Chunk(*row[:8], chunk_id=row[8])
+                self.db.execute(
+                    "INSERT INTO chunk_terms (rowid, terms) VALUES (?, ?)",
+                    (chunk.chunk_id, chunk_terms(self.read_chunk(chunk))),
+                )
+                count += 1
+        return count
+
+    def close(self):
+        self.db.close()
+
+    def get_cursor(self, instance: str) -> Optional[int]:
+        with self._lock:
+            row = self.db.execute(
+                "SELECT last_ts FROM cursors WHERE instance = ?", (instance,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _segment(self, instance: str, hour: int) -> tuple[int, Path, str]:
+        row = self.db.execute(
+            "SELECT id, path, codec FROM segments WHERE instance = ? AND hour = ?",
+            (instance, hour),
+        ).fetchone()
+        if row:
+            return row[0], self.root / row[1], row[2]
+
+        stamp = datetime.fromtimestamp(hour * 3600, tz=timezone.utc)
+        suffix = "zst" if self.codec == "zstd" else "gz"
+        rel = f"{segment_dir(instance)}/{stamp:%Y-%m-%d}/{stamp:%H}.log.{suffix}"
+        cur = self.db.execute(
+            "INSERT INTO segments (instance, hour, path, codec) VALUES (?, ?, ?, ?)",
+            (instance, hour, rel, self.codec),
+        )
+        return cur.lastrowid, self.root / rel, self.codec
+
+    def append(self, instance: str, entries: list[tuple[int, str]]) -> int:
+        """Append (timestamp_ns, line) entries in order; returns segments touched."""
+        if not entries:
+            return 0
+
+        by_hour: dict[int, list[tuple[int, str]]] = {}
+        for ts, line in entries:
+            by_hour.setdefault(ts // NS_PER_HOUR, []).append((ts, line))
+
+        with self._lock, self.db:
+            for hour, hour_entries in by_hour.items():
+                segment_id, path, codec = self._segment(instance, hour)
+                payload = compress("".join(line + "\n" for _, line in hour_entries).encode(), codec)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(path, "ab") as f:
+                    offset = f.tell()
+                    f.write(payload)
+                cur = self.db.execute(
+                    "INSERT INTO chunks (segment_id, offset, length, first_ts, last_ts, lines) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        segment_id,
+                        offset,
+                        len(payload),
+                        hour_entries[0][0],
+                        hour_entries[-1][0],
+                        len(hour_entries),
+                    ),
+                )
+                if self.indexed:
+                    self.db.execute(
+                        "INSERT INTO chunk_terms (rowid, terms) VALUES (?, ?)",
+                        (cur.lastrowid, chunk_terms(line for _, line in hour_entries)),
+                    )
+            self.db.execute(
+                "INSERT INTO cursors (instance, last_ts, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(instance) DO UPDATE SET last_ts = excluded.last_ts, "
+                "updated_at = excluded.updated_at",
+                (instance, entries[-1][0], time.time()),
+            )
+        return len(by_hour)
+
+    def iter_chunks(
+        self,
+        instances: Optional[list[str]] = None,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        match: Optional[str] = None,
+    ) -> Iterator[Chunk]:
+        """Chunks overlapping [since, until] in time order, fetched a page at a time.
+
+        ``match`` is an FTS5 expression over the term index; it is ignored when the
+        store has no index, so callers must still filter the lines themselves.
+        """
+        where = ["1 = 1"]
+        params: list = []
+        if instances is not None:
+            where.append(f"s.instance IN ({', '.join('?' * len(instances))})")
+            params.extend(instances)
+        if since is not None:
+            where.append("c.last_ts >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("c.first_ts <= ?")
+            params.append(until)
+        if match is not None and self.indexed:
+            where.append("c.id IN (SELECT rowid FROM chunk_terms WHERE chunk_terms MATCH ?)")
+            params.append(match)
+
+        query = (
+            "SELECT s.instance, s.path, s.codec, c.offset, c.length, c.first_ts, c.last_ts, "
+            "c.lines, c.id FROM chunks c JOIN segments s ON s.id = c.segment_id "
+            f"WHERE {' AND '.join(where)} AND (c.first_ts, c.id) > (?, ?) "
+            "ORDER BY c.first_ts, c.id LIMIT ?"
+        )
+        after = (-1, -1)
+        while True:
+            with self._lock:
+                rows = self.db.execute(query, [*params, *after, CHUNK_PAGE]).fetchall()
+            for row in rows:
+                yield Chunk(*row[:8], chunk_id=row[8])
+            if len(rows) < CHUNK_PAGE:
+                return
+            after = (rows[-1][5], rows[-1][8])
+
+    def chunks(
+        self,
+        instances: Optional[list[str]] = None,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+    ) -> list[Chunk]:
+        return list(self.iter_chunks(instances, since, until))
+
+    def read_chunk(self, chunk: Chunk) -> Iterator[str]:
+        with open(self.root / chunk.path, "rb") as f:
+            f.seek(chunk.offset)
+            data = decompress(f.read(chunk.length), chunk.codec)
+        for line in data.decode(errors="replace").splitlines():
+            yield line
+
+    def instances(self) -> list[str]:
+        with self._lock:
+            return [r[0] for r in self.db.execute("SELECT instance FROM cursors ORDER BY 1")]
+
+
+def parse_log_output(output: str, after: Optional[int]) -> list[tuple[int, str]]:
+    """Timestamped docker log lines newer than ``after``, in order.
+
+    Untimestamped continuation lines take the previous line's timestamp, so every
+    stored line starts with one.
+    """
+    entries = []
+    stamp, ts = None, None
+    for line in output.splitlines():
+        head = line.partition(" ")[0]
+        try:
+            ts = parse_docker_timestamp(head)
+            stamp = head
+        except ValueError:
+            if stamp is None:
+                continue
+            line = f"{stamp} {line}"
+        if after is not None and ts <= after:
+            continue
+        entries.append((ts, line))
+    return entries
+
+
+class LogCollector:
+    """Pulls only new log lines from each instance and appends them to a LogStore."""
+
+    def __init__(
+        self,
+        store: LogStore,
+        pool: Optional[SSHConnectionPool] = None,
+        max_workers: int = 8,
+        initial_lookback: str = DEFAULT_LOOKBACK,
+        container: str = CONTAINER_NAME,
+    ):
+        self.store = store
+        self.pool = pool or SSHConnectionPool()
+        self.max_workers = max_workers
+        self.initial_lookback = initial_lookback
+        self.container = container
+
+    def fetch_command(self, cursor: Optional[int]) -> str:
+        since = format_since(cursor) if cursor is not None else self.initial_lookback
+        return (
+            f"docker logs --timestamps --since {shlex.quote(since)} "
+            f"{shlex.quote(self.container)} 2>&1"
+        )
+
+    def collect_instance(self, instance: OpenCLAWInstance) -> CollectResult:
+        result = CollectResult(instance=instance.name)
+        try:
+            cursor = self.store.get_cursor(instance.name)
+            stdout, _, code = self.pool.get(instance).execute_command(self.fetch_command(cursor))
+            if code != 0:
+                raise RuntimeError(stdout.strip().splitlines()[-1] if stdout.strip() else code)
+            result.bytes_transferred = len(stdout.encode())
+            entries = parse_log_output(stdout, cursor)
+            result.segments = self.store.append(instance.name, entries)
+            result.lines = len(entries)
+        except Exception as e:
+            logger.error(f"Failed to collect logs from {instance.name}: {e}")
+            result.error = str(e)
+        return result
+
+    def collect(self, instances: list[OpenCLAWInstance]) -> list[CollectResult]:
+        """Collect from the OpenCLAW hosts among ``instances``; other services are skipped."""
+        skipped = [i.name for i in instances if not i.runs_openclaw]
+        if skipped:
+            logger.info(f"Not collecting logs from non-OpenCLAW instance(s): {', '.join(skipped)}")
+            instances = [i for i in instances if i.runs_openclaw]
+        if not instances:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(instances))) as executor:
+            return list(executor.map(self.collect_instance, instances))
@@ -0,0 +1,226 @@
+import fnmatch
+import logging
+import re
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from .log_collector import WORD_RE, LogStore, parse_docker_timestamp
+
+logger = logging.getLogger(__name__)
+
+# Shortest literal the trigram index can look up
+MIN_LITERAL = 3
+
+
+def _class_start(pattern: str, i: int) -> int:
+    """Index of the last char of a class opener, so a leading ``]`` or ``^]`` stays inside."""
+    if pattern[i + 1 : i + 2] == "^":
+        i += 1
+    if pattern[i + 1 : i + 2] == "]":
+        i += 1
+    return i
+
+
+def split_alternatives(pattern: str) -> list[str]:
+    """Split a regex on its top-level ``|``."""
+    branches, start = [], 0
+    depth, in_class, i = 0, False, 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            i += 2
+            continue
+        if in_class:
+            in_class = c != "]"
+        elif c == "[":
+            in_class = True
+            i = _class_start(pattern, i)
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        elif c == "|" and depth == 0:
+            branches.append(pattern[start:i])
+            start = i + 1
+        i += 1
+    branches.append(pattern[start:])
+    return branches
+
+
+def _skip_group(branch: str, i: int) -> int:
+    """Index just past the group or class starting at ``branch[i]``."""
+    depth, in_class = 0, False
+    while i < len(branch):
+        c = branch[i]
+        if c == "\\":
+            i += 2
+            continue
+        if in_class:
+            in_class = c != "]"
+        elif c == "[":
+            in_class = True
+            i = _class_start(branch, i)
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        i += 1
+        if depth == 0 and not in_class:
+            return i
+    return i
+
+
+def _escape_end(branch: str, i: int) -> int:
+    """Index just past the escape sequence starting at ``branch[i]`` (a backslash)."""
+    c = branch[i + 1 : i + 2]
+    if c == "x":
+        return i + 4
+    if c == "u":
+        return i + 6
+    if c == "U":
+        return i + 10
+    if c == "N" and branch[i + 2 : i + 3] == "{":
+        end = branch.find("}", i)
+        return len(branch) if end == -1 else end + 1
+    if c.isdigit():
+        # Octal (\0, \012) or a group reference (\1, \12); both are digits only
+        end = i + 1
+        while end < len(branch) and end < i + 4 and branch[end].isdigit():
+            end += 1
+        return end
+    return i + 2
+
+
+def required_literals(branch: str) -> list[str]:
+    """Word fragments every match of a single-branch regex must contain.
+
+    Conservative: groups and classes are skipped, and a character followed by a
+    quantifier that allows zero repetitions is dropped from its run.
+    """
+    literals, run = [], ""
+
+    def flush():
+        nonlocal run
+        if len(run) >= MIN_LITERAL:
+            literals.append(run)
+        run = ""
+
+    i = 0
+    while i < len(branch):
+        c = branch[i]
+        if c == "\\":
+            # Escaped punctuation is a literal non-word char; \d, \w, \b etc. are not
+            # literals, and neither are the digits of \x41, \u00e9 or octal escapes
+            flush()
+            i = _escape_end(branch, i)
+        elif c in "([":
+            flush()
+            i = _skip_group(branch, i)
+        elif c in "*?":
+            run = run[:-1]
+            flush()
+            i += 1
+        elif c == "{":
+            end = branch.find("}", i)
+            if end == -1:
+                flush()
+                i += 1
+                continue
+            if branch[i + 1 : end].split(",")[0].strip() in ("", "0"):
+                run = run[:-1]
+            flush()
+            i = end + 1
+        elif c.isascii() and WORD_RE.fullmatch(c):
+            run += c
+            i += 1
+        else:
+            flush()
+            i += 1
+    flush()
+    return literals
+
+
+def index_query(pattern: str) -> Optional[str]:
+    """FTS5 trigram query that every chunk with a match satisfies, or None to scan all."""
+    clauses = []
+    for branch in split_alternatives(pattern):
+        literals = required_literals(branch)
+        if not literals:
+            return None
+        terms = []
+        for literal in literals:
+            literal = literal.lower()
+            terms.extend(f'"{literal[k:k + 3]}"' for k in range(len(literal) - 2))
+        clauses.append(f"({' AND '.join(dict.fromkeys(terms))})")
+    return " OR ".join(clauses)
+
+
+@dataclass
+class LogMatch:
+    instance: str
+    timestamp: int
+    line: str
+
+    def to_dict(self) -> dict:
+        return {"instance": self.instance, "timestamp": self.timestamp, "line": self.line}
+
+
+@dataclass
+class SearchStats:
+    chunks_scanned: int = 0
+    lines_scanned: int = 0
+    matches: int = 0
+    used_index: bool = False
+
+
+class LogSearch:
+    """Regex search over collected logs that only decompresses candidate chunks.
+
+    Patterns are matched against the message, not docker's timestamp prefix;
+    use ``since``/``until`` for time. Matches are yielded as each chunk is read.
+    """
+
+    def __init__(self, store: LogStore):
+        self.store = store
+        self.stats = SearchStats()
+
+    def resolve_instances(self, patterns: Optional[list[str]]) -> Optional[list[str]]:
+        if not patterns:
+            return None
+        known = self.store.instances()
+        return [name for name in known if any(fnmatch.fnmatchcase(name, p) for p in patterns)]
+
+    def search(
+        self,
+        pattern: str,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        instances: Optional[list[str]] = None,
+        ignore_case: bool = False,
+        limit: Optional[int] = None,
+    ) -> Iterator[LogMatch]:
+        regex = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+        # The trigram index is case-insensitive, so its answer is a superset either way
+        match = index_query(pattern)
+        self.stats = SearchStats(used_index=match is not None and self.store.indexed)
+        names = self.resolve_instances(instances)
+        if names == []:
+            return
+
+        for chunk in self.store.iter_chunks(names, since=since, until=until, match=match):
+            self.stats.chunks_scanned += 1
+            for line in self.store.read_chunk(chunk):
+                self.stats.lines_scanned += 1
+                stamp, _, message = line.partition(" ")
+                if not regex.search(message):
+                    continue
+                try:
+                    ts = parse_docker_timestamp(stamp)
+                except ValueError:
+                    ts = chunk.first_ts
+                if (since is not None and ts < since) or (until is not None and ts > until):
+                    continue
+                self.stats.matches += 1
+                yield LogMatch(chunk.instance, ts, line)
+                if limit is not None and self.stats.matches >= limit:
+                    return
@@ -1,23 +1,59 @@
 import logging
-from typing import Optional
+import queue
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator, Optional
 from datetime import datetime
 
 from .models import Config, OpenCLAWInstance, InstanceStatus, InstanceType
-from .proxmox_client import ProxmoxClient
+from .proxmox_client import ProxmoxClient, vm_status_to_enum
+from .federation import ProxmoxFederation
 from .health_checker import HealthChecker
-from .ssh_client import SSHClient
+from .ssh_client import SSHConnectionPool
+from .anomaly import AnomalyDetector
+from .config_watcher import InstanceDiff, diff_instances
+from .singleflight import SingleFlight
+from .status_cache import StatusCache
+from .tracing import span
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SWEEP_WORKERS = 16
+
+
+def vm_usage(vm: Optional[dict]) -> tuple[Optional[float], Optional[float]]:
+    """(cpu, memory) in-use fractions from a bulk status entry; None when not running."""
+    if not vm or vm.get("status") != "running":
+        return None, None
+    maxmem = vm.get("maxmem") or 0
+    return vm.get("cpu"), (vm.get("memory", 0) / maxmem if maxmem else None)
+
 
 class InstanceManager:
-    def __init__(self, config: Config):
+    def __init__(
+        self,
+        config: Config,
+        status_cache: Optional[StatusCache] = None,
+        flights: Optional[SingleFlight] = None,
+        anomaly_detector: Optional[AnomalyDetector] = None,
+    ):
         self.config = config
-        self.proxmox_client: Optional[ProxmoxClient] = None
-        self.health_checker = HealthChecker()
+        # One coalescing group for every probe this manager makes, so consumers refreshing
+        # at the same moment (sweeps, exporters, watchers) share requests
+        self.flights = flights or SingleFlight()
+        self.proxmox = ProxmoxFederation(config.clusters, flights=self.flights)
+        self.health_checker = HealthChecker(flights=self.flights)
+        self.ssh_pool = SSHConnectionPool()
+        self.status_cache = status_cache
+        # Runs over every full sweep's results; None disables it
+        self.anomaly_detector = anomaly_detector
+
+    @property
+    def proxmox_client(self) -> Optional[ProxmoxClient]:
+        """Client for the default (or only) cluster."""
+        return self.proxmox.client()
 
-        if config.proxmox:
-            self.proxmox_client = ProxmoxClient(config.proxmox)
+    def proxmox_client_for(self, instance: OpenCLAWInstance) -> Optional[ProxmoxClient]:
+        return self.proxmox.client_for(instance)
 
     def get_all_instances(self) -> list[OpenCLAWInstance]:
         return self.config.openclaw_instances
@@ -28,25 +64,117 @@ class InstanceManager:
                 return instance
         return None
 
-    def update_instance_status(self, instance: OpenCLAWInstance) -> OpenCLAWInstance:
-        if instance.type == InstanceType.PROXMOX and instance.vm_id and self.proxmox_client:
+    def update_instance_status(
+        self, instance: OpenCLAWInstance, vm_statuses: Optional[dict[int, dict]] = None
+    ) -> OpenCLAWInstance:
+        with span("instance.status", instance=instance.name):
+            return self._update_instance_status(instance, vm_statuses)
+
+    def _update_instance_status(
+        self, instance: OpenCLAWInstance, vm_statuses: Optional[dict[int, dict]]
+    ) -> OpenCLAWInstance:
+        client = self.proxmox_client_for(instance)
+        if (
+            instance.type == InstanceType.PROXMOX
+            and instance.vm_id
+            and instance.cluster
+            and not client
+        ):
+            instance.status = InstanceStatus.ERROR
+            instance.error_message = f"Unknown Proxmox cluster '{instance.cluster}'"
+        elif instance.type == InstanceType.PROXMOX and instance.vm_id and client:
             try:
-                instance.status = self.proxmox_client.get_vm_status_enum(instance.vm_id)
+                if vm_statuses is not None:
+                    vm = vm_statuses.get(instance.vm_id)
+                    instance.status = (
+                        vm_status_to_enum(vm["status"]) if vm else InstanceStatus.ERROR
+                    )
+                    instance.error_message = None if vm else f"VM {instance.vm_id} not found"
+                    instance.cpu_usage, instance.memory_usage = vm_usage(vm)
+                else:
+                    instance.status = client.get_vm_status_enum(instance.vm_id)
+                    instance.cpu_usage = instance.memory_usage = None
             except Exception as e:
                 instance.status = InstanceStatus.ERROR
                 instance.error_message = str(e)
                 logger.error(f"Failed to update status for {instance.name}: {e}")
 
-        healthy, version = self.health_checker.check_instance_health(instance)
-        instance.health_check_passed = healthy
-        instance.version = version
+        health = self.health_checker.check(instance)
+        instance.response_time_ms = health.latency_ms
+        instance.health_check_passed = health.healthy
+        instance.version = health.version
         instance.last_health_check = datetime.now().isoformat()
 
         return instance
 
+    def iter_instance_statuses(
+        self,
+        instances: Optional[list[OpenCLAWInstance]] = None,
+        max_workers: int = DEFAULT_SWEEP_WORKERS,
+    ) -> Iterator[OpenCLAWInstance]:
+        """Check instances concurrently, yielding each one as soon as its check completes.
+
+        Proxmox VMs are grouped by cluster and each cluster's bulk status is fetched in
+        parallel; a cluster's instances are checked as soon as its own answer arrives.
+        """
+        full_sweep = instances is None
+        instances = self.config.openclaw_instances if instances is None else instances
+        if not instances:
+            return
+
+        by_cluster: dict[Optional[str], list[OpenCLAWInstance]] = {}
+        for instance in instances:
+            cluster = None
+            if instance.type == InstanceType.PROXMOX and instance.vm_id:
+                cluster = self.proxmox.resolve(instance.cluster)
+            by_cluster.setdefault(cluster, []).append(instance)
+
+        # Finished checks (futures) and bulk answers ((name, vm_statuses, error)) both land
+        # here; checks are only ever submitted from this thread, never from the fan-out
+        # threads, which may still be running once the executor has shut down
+        events: queue.Queue = queue.Queue()
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(instances))) as executor:
+
+            def submit(batch: list[OpenCLAWInstance], vm_statuses: Optional[dict[int, dict]]):
+                for instance in batch:
+                    future = executor.submit(self.update_instance_status, instance, vm_statuses)
+                    future.add_done_callback(events.put)
+
+            submit(by_cluster.pop(None, []), None)
+            self.proxmox.submit_all(
+                lambda c: c.get_cluster_vm_statuses(),
+                lambda name, vm_statuses, error: events.put((name, vm_statuses, error)),
+                by_cluster,
+            )
+
+            remaining = len(instances)
+            while remaining:
+                event = events.get()
+                if isinstance(event, tuple):
+                    name, vm_statuses, error = event
+                    if error is not None:
+                        # Fall back to per-VM lookups
+                        logger.warning(
+                            f"Bulk status from cluster '{name}' failed, "
+                            f"querying VMs one by one: {error}"
+                        )
+                    submit(by_cluster[name], vm_statuses)
+                    continue
+                remaining -= 1
+                yield event.result()
+
+        if full_sweep and self.anomaly_detector is not None:
+            with span("sweep.anomalies", instances=len(instances)):
+                self.anomaly_detector.observe(instances)
+        if self.status_cache is not None:
+            try:
+                self.status_cache.save(instances)
+            except OSError as e:
+                logger.warning(f"Failed to write status cache: {e}")
+
     def update_all_instance_statuses(self) -> list[OpenCLAWInstance]:
-        for instance in self.config.openclaw_instances:
-            self.update_instance_status(instance)
+        for _ in self.iter_instance_statuses():
+            pass
         return self.config.openclaw_instances
 
     def start_instance(self, name: str) -> bool:
@@ -55,19 +183,20 @@ class InstanceManager:
             logger.error(f"Instance {name} not found")
             return False
 
-        if instance.type == InstanceType.PROXMOX and instance.vm_id and self.proxmox_client:
+        client = self.proxmox_client_for(instance)
+        if instance.type == InstanceType.PROXMOX and instance.vm_id and client:
             try:
-                return self.proxmox_client.start_vm(instance.vm_id)
+                return client.start_vm(instance.vm_id)
             except Exception as e:
                 logger.error(f"Failed to start VM for {name}: {e}")
                 return False
 
         elif instance.type == InstanceType.DOCKER or instance.type == InstanceType.LOCAL:
-            ssh = SSHClient(instance)
             try:
-                return ssh.start_openclaw()
-            finally:
-                ssh.disconnect()
+                return self.ssh_pool.get(instance).start_openclaw()
+            except Exception as e:
+                logger.error(f"Failed to start OpenCLAW on {name}: {e}")
+                return False
 
         return False
 
@@ -77,19 +206,20 @@ class InstanceManager:
             logger.error(f"Instance {name} not found")
             return False
 
-        if instance.type == InstanceType.PROXMOX and instance.vm_id and self.proxmox_client:
+        client = self.proxmox_client_for(instance)
+        if instance.type == InstanceType.PROXMOX and instance.vm_id and client:
             try:
-                return self.proxmox_client.stop_vm(instance.vm_id)
+                return client.stop_vm(instance.vm_id)
             except Exception as e:
                 logger.error(f"Failed to stop VM for {name}: {e}")
                 return False
 
         elif instance.type == InstanceType.DOCKER or instance.type == InstanceType.LOCAL:
-            ssh = SSHClient(instance)
             try:
-                return ssh.stop_openclaw()
-            finally:
-                ssh.disconnect()
+                return self.ssh_pool.get(instance).stop_openclaw()
+            except Exception as e:
+                logger.error(f"Failed to stop OpenCLAW on {name}: {e}")
+                return False
 
         return False
 
@@ -99,19 +229,20 @@ class InstanceManager:
             logger.error(f"Instance {name} not found")
             return False
 
-        if instance.type == InstanceType.PROXMOX and instance.vm_id and self.proxmox_client:
+        client = self.proxmox_client_for(instance)
+        if instance.type == InstanceType.PROXMOX and instance.vm_id and client:
             try:
-                return self.proxmox_client.restart_vm(instance.vm_id)
+                return client.restart_vm(instance.vm_id)
             except Exception as e:
                 logger.error(f"Failed to restart VM for {name}: {e}")
                 return False
 
         elif instance.type == InstanceType.DOCKER or instance.type == InstanceType.LOCAL:
-            ssh = SSHClient(instance)
             try:
-                return ssh.restart_openclaw()
-            finally:
-                ssh.disconnect()
+                return self.ssh_pool.get(instance).restart_openclaw()
+            except Exception as e:
+                logger.error(f"Failed to restart OpenCLAW on {name}: {e}")
+                return False
 
         return False
 
@@ -121,16 +252,54 @@ class InstanceManager:
             logger.error(f"Instance {name} not found")
             return None
 
-        ssh = SSHClient(instance)
         try:
-            return ssh.get_openclaw_logs(lines)
-        finally:
-            ssh.disconnect()
+            return self.ssh_pool.get(instance).get_openclaw_logs(lines)
+        except Exception as e:
+            logger.error(f"Failed to get logs from {name}: {e}")
+            return f"Error: {e}"
 
     def get_proxmox_vms(self) -> list[dict]:
-        if not self.proxmox_client:
-            return []
-        return self.proxmox_client.get_all_vms()
+        """VMs from every cluster, each tagged with its ``cluster``; failed clusters are skipped."""
+        vms, _ = self.proxmox.get_all_vms()
+        return vms
+
+    def apply_config(self, new_config: Config, probe: bool = True) -> InstanceDiff:
+        """Swap in a re-parsed config, touching only instances that actually changed.
+
+        Unchanged instances keep their runtime state and warm connections; removed or
+        re-targeted ones have their pooled SSH connections closed; added and
+        re-targeted ones are probed right away.
+        """
+        diff = diff_instances(self.config.openclaw_instances, new_config.openclaw_instances)
+
+        for old, new in diff.unchanged:
+            old.description = new.description
+            old.depends_on = new.depends_on
+            old.compose_dir = new.compose_dir
+        for instance in diff.removed:
+            self.ssh_pool.close(instance)
+        for old, _ in diff.changed:
+            self.ssh_pool.close(old)
+
+        kept = {old.name: old for old, _ in diff.unchanged}
+        # Swap the list rather than mutating it so in-flight sweeps see a consistent set
+        self.config.openclaw_instances = [
+            kept.get(i.name, i) for i in new_config.openclaw_instances
+        ]
+
+        changed_clusters = self.proxmox.update(new_config.clusters)
+        if changed_clusters:
+            logger.info(f"Proxmox clusters reconfigured: {', '.join(changed_clusters)}")
+        self.config.proxmox = new_config.proxmox
+        self.config.proxmox_clusters = new_config.proxmox_clusters
+        self.config.orbstack = new_config.orbstack
+
+        logger.info(f"Applied config: {diff.summary()}")
+        to_probe = diff.added + [new for _, new in diff.changed]
+        if probe and to_probe:
+            for _ in self.iter_instance_statuses(to_probe):
+                pass
+        return diff
 
     def add_instance(self, instance: OpenCLAWInstance):
         self.config.openclaw_instances.append(instance)
@@ -3,6 +3,17 @@ from enum import Enum
 from typing import Optional
 import yaml
 
+# Name of the cluster configured under the top-level ``proxmox`` key
+DEFAULT_CLUSTER = "default"
+# Where the openclaw-docker bundle lives on each host (relative to the SSH user's home)
+OPENCLAW_COMPOSE_DIR = "openclaw-docker"
+
+
+def _as_list(value) -> list[str]:
+    if value is None:
+        return []
+    return [value] if isinstance(value, str) else list(value)
+
 
 class InstanceType(Enum):
     PROXMOX = "proxmox"
@@ -30,11 +41,27 @@ class OpenCLAWInstance:
     vm_id: Optional[int] = None
     openclaw_port: int = 8080
     description: str = ""
+    # Proxmox cluster the VM lives in; None means the default cluster
+    cluster: Optional[str] = None
+    # Instances that must pass their health check before this one is started
+    depends_on: list[str] = field(default_factory=list)
+    health_path: str = "/health"
+    # docker-compose directory on the host, relative to the SSH user's home
+    compose_dir: Optional[str] = None
     status: InstanceStatus = InstanceStatus.UNKNOWN
     last_health_check: Optional[str] = None
     health_check_passed: bool = False
     version: Optional[str] = None
     error_message: Optional[str] = None
+    response_time_ms: Optional[float] = None
+    # Fraction of the VM's vCPUs and memory in use, from the last bulk status sweep
+    cpu_usage: Optional[float] = None
+    memory_usage: Optional[float] = None
+
+    @property
+    def runs_openclaw(self) -> bool:
+        """False for other services (e.g. MinIO) monitored from their own ``compose_dir``."""
+        return self.compose_dir in (None, OPENCLAW_COMPOSE_DIR)
 
     @classmethod
     def from_dict(cls, data: dict) -> "OpenCLAWInstance":
@@ -48,6 +75,10 @@ class OpenCLAWInstance:
             vm_id=data.get("vm_id"),
             openclaw_port=data.get("openclaw_port", 8080),
             description=data.get("description", ""),
+            cluster=data.get("cluster"),
+            depends_on=_as_list(data.get("depends_on")),
+            health_path=data.get("health_path", "/health"),
+            compose_dir=data.get("compose_dir"),
         )
 
     def to_dict(self) -> dict:
@@ -60,11 +91,18 @@ class OpenCLAWInstance:
             "vm_id": self.vm_id,
             "openclaw_port": self.openclaw_port,
             "description": self.description,
+            "cluster": self.cluster,
+            "depends_on": self.depends_on,
+            "health_path": self.health_path,
+            "compose_dir": self.compose_dir,
             "status": self.status.value,
             "last_health_check": self.last_health_check,
             "health_check_passed": self.health_check_passed,
             "version": self.version,
             "error_message": self.error_message,
+            "response_time_ms": self.response_time_ms,
+            "cpu_usage": self.cpu_usage,
+            "memory_usage": self.memory_usage,
         }
 
 
@@ -78,6 +116,12 @@ class ProxmoxConfig:
     password: Optional[str] = None
     verify_ssl: bool = False
     timeout: int = 30
+    # Pooled HTTPS connections, and the ceiling for the adaptive API concurrency
+    # limit (which starts at half of it)
+    max_connections: int = 16
+    max_concurrency: int = 16
+    # Share password-auth tickets between runs via the on-disk ticket cache
+    cache_ticket: bool = True
 
     @classmethod
     def from_dict(cls, data: dict) -> "ProxmoxConfig":
@@ -90,6 +134,9 @@ class ProxmoxConfig:
             password=data.get("password"),
             verify_ssl=data.get("verify_ssl", False),
             timeout=data.get("timeout", 30),
+            max_connections=data.get("max_connections", 16),
+            max_concurrency=data.get("max_concurrency", 16),
+            cache_ticket=data.get("cache_ticket", True),
         )
 
 
@@ -111,6 +158,14 @@ class Config:
     openclaw_instances: list[OpenCLAWInstance] = field(default_factory=list)
     proxmox: Optional[ProxmoxConfig] = None
     orbstack: Optional[OrbStackConfig] = None
+    proxmox_clusters: dict[str, ProxmoxConfig] = field(default_factory=dict)
+
+    @property
+    def clusters(self) -> dict[str, ProxmoxConfig]:
+        """All Proxmox endpoints by name, with ``proxmox`` as the default cluster."""
+        clusters = {DEFAULT_CLUSTER: self.proxmox} if self.proxmox else {}
+        clusters.update(self.proxmox_clusters)
+        return clusters
 
     @classmethod
     def from_yaml(cls, path: str) -> "Config":
@@ -125,4 +180,8 @@ class Config:
             openclaw_instances=instances,
             proxmox=ProxmoxConfig.from_dict(proxmox_data) if proxmox_data else None,
             orbstack=OrbStackConfig.from_dict(orbstack_data) if orbstack_data else None,
+            proxmox_clusters={
+                name: ProxmoxConfig.from_dict(cluster)
+                for name, cluster in (data.get("proxmox_clusters") or {}).items()
+            },
         )
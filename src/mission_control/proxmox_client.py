@@ -1,60 +1,195 @@
 import logging
+import threading
+import time
+from contextlib import contextmanager
 from typing import Optional
 import proxmoxer
+import requests
 from proxmoxer import ProxmoxAPI
+from requests.adapters import HTTPAdapter
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from .adaptive_limiter import shared_limiter
 from .models import ProxmoxConfig, InstanceStatus
+from .singleflight import SingleFlight
+from .ticket_cache import CachedTicketAuth, TicketCache, ticket_key
+from .tracing import span
 
 logger = logging.getLogger(__name__)
 
 
+def vm_status_to_enum(vm_status: str) -> InstanceStatus:
+    if vm_status == "running":
+        return InstanceStatus.RUNNING
+    elif vm_status == "stopped":
+        return InstanceStatus.STOPPED
+    else:
+        return InstanceStatus.UNKNOWN
+
+
+def is_overload(error: BaseException) -> bool:
+    """Errors that mean pveproxy is struggling, rather than that the request was wrong."""
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    status = getattr(error, "status_code", None)
+    return status is not None and (status == 429 or status >= 502)
+
+
 class ProxmoxClient:
-    def __init__(self, config: ProxmoxConfig):
+    def __init__(
+        self,
+        config: ProxmoxConfig,
+        ticket_cache: Optional[TicketCache] = None,
+        flights: Optional[SingleFlight] = None,
+    ):
         self.config = config
+        # Concurrent status reads of the same VM (or the whole cluster) share one request
+        self.flights = flights or SingleFlight()
+        if ticket_cache is None and config.cache_ticket:
+            ticket_cache = TicketCache()
+        self.ticket_cache = ticket_cache
         self._client: Optional[ProxmoxAPI] = None
+        self._vm_nodes: dict[int, str] = {}
+        # Starts at half the configured ceiling and adapts to how pveproxy copes; shared by
+        # every client of the same endpoint, since they all load the same pveproxy
+        self._limit = shared_limiter(
+            "proxmox",
+            f"{config.host}:{config.port}",
+            initial=max(1, config.max_concurrency // 2),
+            max_limit=config.max_concurrency,
+            is_overload=is_overload,
+        )
+        # Sweeps call in from many threads at once
+        self._connect_lock = threading.Lock()
+        self._nodes_lock = threading.Lock()
 
     def connect(self) -> ProxmoxAPI:
         if self._client is not None:
             return self._client
 
         try:
-            if self.config.token_id and self.config.token_secret:
-                self._client = ProxmoxAPI(
-                    self.config.host,
-                    user=self.config.user,
-                    token_name=self.config.token_id,
-                    token_value=self.config.token_secret,
-                    verify_ssl=self.config.verify_ssl,
-                    timeout=self.config.timeout,
-                )
-            elif self.config.password:
-                self._client = ProxmoxAPI(
-                    self.config.host,
-                    user=self.config.user,
-                    password=self.config.password,
-                    verify_ssl=self.config.verify_ssl,
-                    timeout=self.config.timeout,
-                )
-            else:
-                raise ValueError("Either token_id/token_secret or password must be provided")
-
-            logger.info(f"Connected to Proxmox at {self.config.host}")
+            with self._connect_lock:
+                if self._client is None:
+                    with span("proxmox.connect", host=self.config.host):
+                        api = self._create_api()
+                    self._configure_session(api)
+                    self._client = api
+                    logger.info(f"Connected to Proxmox at {self.config.host}")
             return self._client
 
         except Exception as e:
             logger.error(f"Failed to connect to Proxmox: {e}")
             raise
 
+    def _create_api(self) -> ProxmoxAPI:
+        if self.config.token_id and self.config.token_secret:
+            return ProxmoxAPI(
+                self.config.host,
+                port=self.config.port,
+                user=self.config.user,
+                token_name=self.config.token_id,
+                token_value=self.config.token_secret,
+                verify_ssl=self.config.verify_ssl,
+                timeout=self.config.timeout,
+            )
+        elif self.config.password and self.ticket_cache is not None:
+            return self._create_ticket_api()
+        elif self.config.password:
+            return ProxmoxAPI(
+                self.config.host,
+                port=self.config.port,
+                user=self.config.user,
+                password=self.config.password,
+                verify_ssl=self.config.verify_ssl,
+                timeout=self.config.timeout,
+            )
+        else:
+            raise ValueError("Either token_id/token_secret or password must be provided")
+
+    def _create_ticket_api(self) -> ProxmoxAPI:
+        # proxmoxer's password auth logs in while the backend is built. Build it with
+        # token auth, which makes no request, then swap in the cached-ticket auth.
+        api = ProxmoxAPI(
+            self.config.host,
+            port=self.config.port,
+            user=self.config.user,
+            token_name="unused",
+            token_value="unused",
+            verify_ssl=self.config.verify_ssl,
+            timeout=self.config.timeout,
+        )
+        auth = CachedTicketAuth(
+            self.config.user,
+            self.config.password,
+            cache=self.ticket_cache,
+            key=ticket_key(self.config.host, self.config.port, self.config.user),
+            base_url=api._backend.get_base_url(),
+            verify_ssl=self.config.verify_ssl,
+            timeout=self.config.timeout,
+        )
+        api._backend.auth = auth
+        api._store["session"].auth = auth
+        return api
+
+    def _configure_session(self, api: ProxmoxAPI):
+        # requests keeps 10 connections per host by default; size the pool to this cluster.
+        # _backend.get_session() builds a new session, so mount on the one the API uses.
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.config.max_connections)
+        api._store["session"].mount("https://", adapter)
+
+    @contextmanager
+    def _call(self, name: str, **attrs):
+        """Span around one API request, holding one of this cluster's concurrency slots."""
+        with span(name, **attrs), self._limit.slot():
+            yield
+
+    def _flight_key(self, kind: str, vmid: Optional[int] = None) -> tuple:
+        return (kind, self.config.host, self.config.port, vmid)
+
     def disconnect(self):
         self._client = None
+        with self._nodes_lock:
+            self._vm_nodes.clear()
+
+    def _remember_nodes(self, nodes: dict[int, str]):
+        with self._nodes_lock:
+            self._vm_nodes.update(nodes)
+
+    def _forget_node(self, vmid: int):
+        with self._nodes_lock:
+            self._vm_nodes.pop(vmid, None)
+
+    def _node_for(self, vmid: int) -> str:
+        # VMs can live on any cluster node; resolve once from the cluster index.
+        # The lock is held across the fetch so concurrent misses share one request.
+        with self._nodes_lock:
+            node = self._vm_nodes.get(vmid)
+            if node is None:
+                with self._call("proxmox.cluster_resources"):
+                    resources = self.connect().cluster.resources.get(type="vm")
+                self._vm_nodes = {vm["vmid"]: vm["node"] for vm in resources if "vmid" in vm}
+                node = self._vm_nodes.get(vmid)
+        if node is None:
+            raise ValueError(f"VM {vmid} not found in cluster")
+        return node
+
+    def _fetch_status(self, client: ProxmoxAPI, vmid: int):
+        node_name = self._node_for(vmid)
+        with self._call("proxmox.status", vmid=vmid, node=node_name):
+            return client.nodes(node_name).qemu(vmid).status("current").get()
+
+    def _changed(self, vmid: int):
+        # The next status read must see the effect of the action
+        self.flights.forget(self._flight_key("proxmox.status", vmid))
+        self.flights.forget(self._flight_key("proxmox.cluster_statuses"))
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def get_vm_status(self, vmid: int) -> dict:
         client = self.connect()
         try:
-            node_name = client.nodes.get()[0]["node"]
-            status = client.nodes(node_name).qemu(vmid).status("current").get()
+            status = self.flights.do(
+                self._flight_key("proxmox.status", vmid), lambda: self._fetch_status(client, vmid)
+            )
             # Handle both dict and list responses
             if isinstance(status, list):
                 status = status[0] if status else {"status": "unknown"}
@@ -66,6 +201,7 @@ class ProxmoxClient:
                 "memory": status.get("mem", 0),
             }
         except Exception as e:
+            self._forget_node(vmid)
             logger.error(f"Failed to get VM status for {vmid}: {e}")
             raise
 
@@ -73,11 +209,14 @@ class ProxmoxClient:
     def start_vm(self, vmid: int) -> bool:
         client = self.connect()
         try:
-            node = client.nodes.get()[0]["node"]
-            client.nodes(node).qemu(vmid).status.post("start")
+            node = self._node_for(vmid)
+            with self._call("proxmox.start", vmid=vmid, node=node):
+                client.nodes(node).qemu(vmid).status.post("start")
+            self._changed(vmid)
             logger.info(f"Started VM {vmid}")
             return True
         except Exception as e:
+            self._forget_node(vmid)
             logger.error(f"Failed to start VM {vmid}: {e}")
             raise
 
@@ -85,11 +224,14 @@ class ProxmoxClient:
     def stop_vm(self, vmid: int) -> bool:
         client = self.connect()
         try:
-            node = client.nodes.get()[0]["node"]
-            client.nodes(node).qemu(vmid).status.post("stop")
+            node = self._node_for(vmid)
+            with self._call("proxmox.stop", vmid=vmid, node=node):
+                client.nodes(node).qemu(vmid).status.post("stop")
+            self._changed(vmid)
             logger.info(f"Stopped VM {vmid}")
             return True
         except Exception as e:
+            self._forget_node(vmid)
             logger.error(f"Failed to stop VM {vmid}: {e}")
             raise
 
@@ -97,11 +239,14 @@ class ProxmoxClient:
     def restart_vm(self, vmid: int) -> bool:
         client = self.connect()
         try:
-            node = client.nodes.get()[0]["node"]
-            client.nodes(node).qemu(vmid).status.post("restart")
+            node = self._node_for(vmid)
+            with self._call("proxmox.restart", vmid=vmid, node=node):
+                client.nodes(node).qemu(vmid).status.post("restart")
+            self._changed(vmid)
             logger.info(f"Restarted VM {vmid}")
             return True
         except Exception as e:
+            self._forget_node(vmid)
             logger.error(f"Failed to restart VM {vmid}: {e}")
             raise
 
@@ -110,9 +255,12 @@ class ProxmoxClient:
         client = self.connect()
         try:
             vms = []
-            for node in client.nodes.get():
+            with self._call("proxmox.nodes"):
+                nodes = client.nodes.get()
+            for node in nodes:
                 node_name = node["node"]
-                qemu_vms = client.nodes(node_name).qemu.get()
+                with self._call("proxmox.qemu_list", node=node_name):
+                    qemu_vms = client.nodes(node_name).qemu.get()
                 for vm in qemu_vms:
                     vms.append(
                         {
@@ -127,15 +275,143 @@ class ProxmoxClient:
             logger.error(f"Failed to get all VMs: {e}")
             raise
 
+    def _fetch_cluster_vms(self, client: ProxmoxAPI) -> list[dict]:
+        with self._call("proxmox.cluster_resources"):
+            return client.cluster.resources.get(type="vm")
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+    def get_cluster_vm_statuses(self) -> dict[int, dict]:
+        """Status of every VM in the cluster from a single /cluster/resources call."""
+        client = self.connect()
+        try:
+            statuses = {}
+            resources = self.flights.do(
+                self._flight_key("proxmox.cluster_statuses"),
+                lambda: self._fetch_cluster_vms(client),
+            )
+            for vm in resources:
+                if vm.get("type") != "qemu":
+                    continue
+                statuses[vm["vmid"]] = {
+                    "vmid": vm["vmid"],
+                    "name": vm.get("name", "unknown"),
+                    "status": vm.get("status", "unknown"),
+                    "node": vm.get("node"),
+                    "uptime": vm.get("uptime", 0),
+                    "cpu": vm.get("cpu", 0),
+                    "memory": vm.get("mem", 0),
+                    "maxmem": vm.get("maxmem", 0),
+                }
+            self._remember_nodes({vmid: s["node"] for vmid, s in statuses.items()})
+            return statuses
+        except Exception as e:
+            logger.error(f"Failed to get cluster VM statuses: {e}")
+            raise
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+    def get_vm_rrddata(self, vmid: int, timeframe: str = "week", cf: str = "AVERAGE") -> list[dict]:
+        client = self.connect()
+        try:
+            node = self._node_for(vmid)
+            with self._call("proxmox.rrddata", vmid=vmid, node=node, timeframe=timeframe):
+                return client.nodes(node).qemu(vmid).rrddata.get(timeframe=timeframe, cf=cf)
+        except Exception as e:
+            self._forget_node(vmid)
+            logger.error(f"Failed to get RRD data for VM {vmid}: {e}")
+            raise
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+    def get_cluster_resources(self, type: Optional[str] = None) -> list[dict]:
+        client = self.connect()
+        try:
+            with self._call("proxmox.cluster_resources", type=type):
+                if type is None:
+                    resources = client.cluster.resources.get()
+                else:
+                    resources = client.cluster.resources.get(type=type)
+            self._remember_nodes(
+                {item["vmid"]: item["node"] for item in resources if item.get("type") == "qemu"}
+            )
+            return resources
+        except Exception as e:
+            logger.error(f"Failed to get cluster resources: {e}")
+            raise
+
+    def clone_vm(
+        self,
+        vmid: int,
+        newid: int,
+        name: Optional[str] = None,
+        target_node: Optional[str] = None,
+        storage: Optional[str] = None,
+        full: bool = False,
+    ) -> str:
+        """Start a clone task and return its UPID.
+
+        Not retried: a clone that timed out client-side may still be running, and
+        re-posting it would fail on the now-taken VMID.
+        """
+        client = self.connect()
+        try:
+            node = self._node_for(vmid)
+            params = {"newid": newid, "full": int(full)}
+            if name:
+                params["name"] = name
+            if target_node and target_node != node:
+                params["target"] = target_node
+            if storage and full:
+                params["storage"] = storage
+            with self._call("proxmox.clone", vmid=vmid, newid=newid, node=node, storage=storage):
+                upid = client.nodes(node).qemu(vmid).clone.post(**params)
+            self._remember_nodes({newid: target_node or node})
+            self._changed(newid)
+            logger.info(f"Cloning VM {vmid} to {newid} ({upid})")
+            return upid
+        except Exception as e:
+            self._forget_node(vmid)
+            logger.error(f"Failed to clone VM {vmid} to {newid}: {e}")
+            raise
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+    def get_task_status(self, upid: str) -> dict:
+        # UPID:<node>:... - the task runs on the node that issued it
+        node = upid.split(":")[1]
+        with self._call("proxmox.task_status", node=node):
+            return self.connect().nodes(node).tasks(upid).status.get()
+
+    def wait_for_task(self, upid: str, timeout: float = 600, poll_interval: float = 1.0) -> dict:
+        """Poll a task until it stops; raises if it failed or ran past ``timeout``."""
+        deadline = time.monotonic() + timeout
+        while True:
+            status = self.get_task_status(upid)
+            if status.get("status") == "stopped":
+                if status.get("exitstatus") != "OK":
+                    raise RuntimeError(f"Task {upid} failed: {status.get('exitstatus')}")
+                return status
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Task {upid} still running after {timeout:.0f}s")
+            time.sleep(poll_interval)
+
+    def get_vm_ipv4(self, vmid: int) -> Optional[str]:
+        """First non-loopback IPv4 reported by the QEMU guest agent, if it is up."""
+        client = self.connect()
+        try:
+            node = self._node_for(vmid)
+            with self._call("proxmox.agent_interfaces", vmid=vmid, node=node):
+                data = client.nodes(node).qemu(vmid).agent("network-get-interfaces").get()
+        except Exception as e:
+            logger.debug(f"Guest agent not answering for VM {vmid}: {e}")
+            return None
+        for interface in data.get("result", []):
+            for address in interface.get("ip-addresses", []):
+                ip = address.get("ip-address", "")
+                if address.get("ip-address-type") == "ipv4" and not ip.startswith("127."):
+                    return ip
+        return None
+
     def get_vm_status_enum(self, vmid: int) -> InstanceStatus:
         try:
             status = self.get_vm_status(vmid)
-            vm_status = status.get("status", "unknown")
-            if vm_status == "running":
-                return InstanceStatus.RUNNING
-            elif vm_status == "stopped":
-                return InstanceStatus.STOPPED
-            else:
-                return InstanceStatus.UNKNOWN
+            return vm_status_to_enum(status.get("status", "unknown"))
         except Exception:
             return InstanceStatus.ERROR
@@ -0,0 +1,409 @@
+"""Sharded monitoring: one supervisor, one worker process per core.
+
+The supervisor splits ``openclaw_instances`` across workers with a consistent
+hash ring, so adding or removing instances (or workers) moves only the
+instances whose ring position changed owner. Each worker runs its own
+InstanceManager over its shard and streams batches of results back over a pipe;
+the supervisor applies them to its own instances, which stay the single fleet
+view for the dashboard, the status cache and anomaly detection.
+"""
+
+import bisect
+import hashlib
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field, replace
+from multiprocessing.connection import Connection, wait
+from typing import Callable, Optional
+
+from .config_watcher import InstanceDiff
+from .manager import DEFAULT_SWEEP_WORKERS, InstanceManager
+from .models import Config, OpenCLAWInstance
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPLICAS = 64
+# Results are sent in batches of this many, or when the sweep ends
+RESULT_BATCH = 64
+DEFAULT_MAX_RESTARTS = 3
+RESTART_WINDOW = 60.0
+STOP_TIMEOUT = 5.0
+POLL_INTERVAL = 0.5
+
+RUNTIME_FIELDS = (
+    "status",
+    "last_health_check",
+    "health_check_passed",
+    "version",
+    "error_message",
+    "response_time_ms",
+    "cpu_usage",
+    "memory_usage",
+)
+
+
+def runtime_state(instance: OpenCLAWInstance) -> tuple:
+    return tuple(getattr(instance, name) for name in RUNTIME_FIELDS)
+
+
+def apply_runtime_state(instance: OpenCLAWInstance, state: tuple):
+    for name, value in zip(RUNTIME_FIELDS, state):
+        setattr(instance, name, value)
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hash ring with ``replicas`` virtual points per node."""
+
+    def __init__(self, nodes: list[str] = (), replicas: int = DEFAULT_REPLICAS):
+        self.replicas = replicas
+        self._points: list[int] = []
+        self._owners: list[str] = []
+        self.nodes: list[str] = []
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node: str):
+        if node in self.nodes:
+            return
+        self.nodes.append(node)
+        for i in range(self.replicas):
+            point = _hash(f"{node}#{i}")
+            index = bisect.bisect(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, node)
+
+    def remove(self, node: str):
+        if node not in self.nodes:
+            return
+        self.nodes.remove(node)
+        kept = [(p, o) for p, o in zip(self._points, self._owners) if o != node]
+        self._points = [p for p, _ in kept]
+        self._owners = [o for _, o in kept]
+
+    def node_for(self, key: str) -> str:
+        if not self._points:
+            raise LookupError("Hash ring has no nodes")
+        index = bisect.bisect(self._points, _hash(key)) % len(self._points)
+        return self._owners[index]
+
+    def assign(self, keys: list[str]) -> dict[str, list[str]]:
+        """``keys`` grouped by owning node; every node appears, possibly with no keys."""
+        shards: dict[str, list[str]] = {node: [] for node in self.nodes}
+        for key in keys:
+            shards[self.node_for(key)].append(key)
+        return shards
+
+
+def _worker_main(
+    worker_id: str, conn: Connection, config: Config, interval: float, max_workers: int
+):
+    """Sweep the shard in ``config`` every ``interval`` seconds until told to stop."""
+    # Ctrl-C goes to the whole process group; the supervisor decides when workers exit
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    manager = InstanceManager(config)
+    next_sweep = 0.0
+    try:
+        while True:
+            if conn.poll(max(0.0, next_sweep - time.monotonic())):
+                kind, payload = conn.recv()
+                if kind == "stop":
+                    break
+                if kind == "assign":
+                    # A full shard config, so cluster settings and credentials follow reloads too
+                    manager.apply_config(payload, probe=False)
+                    next_sweep = 0.0
+                continue
+
+            started = time.monotonic()
+            batch = []
+            count = 0
+            for instance in manager.iter_instance_statuses(max_workers=max_workers):
+                batch.append((instance.name, runtime_state(instance)))
+                count += 1
+                if len(batch) >= RESULT_BATCH:
+                    conn.send(("results", batch))
+                    batch = []
+            if batch:
+                conn.send(("results", batch))
+            elapsed = time.monotonic() - started
+            conn.send(("sweep", {"instances": count, "ms": elapsed * 1000}))
+            next_sweep = started + interval
+    except (EOFError, BrokenPipeError):
+        # Supervisor went away
+        pass
+    finally:
+        manager.ssh_pool.close_all()
+
+
+@dataclass
+class ShardWorker:
+    worker_id: str
+    shard: list[str] = field(default_factory=list)
+    process: Optional[multiprocessing.process.BaseProcess] = None
+    conn: Optional[Connection] = None
+    sweeps: int = 0
+    results: int = 0
+    last_sweep_ms: Optional[float] = None
+    restarts: int = 0
+    crashes: deque = field(default_factory=deque)
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def to_dict(self) -> dict:
+        return {
+            "worker": self.worker_id,
+            "pid": self.process.pid if self.process else None,
+            "instances": len(self.shard),
+            "sweeps": self.sweeps,
+            "results": self.results,
+            "last_sweep_ms": self.last_sweep_ms,
+            "restarts": self.restarts,
+        }
+
+
+class ShardedMonitor:
+    """Monitors ``manager``'s instances from ``workers`` processes.
+
+    Results land on ``manager``'s own OpenCLAWInstance objects. ``on_result`` is
+    called (from the collector thread) for each updated instance and ``on_round``
+    once every worker has finished another sweep. A worker that dies is restarted
+    with the same shard; one that dies more than ``max_restarts`` times within
+    ``RESTART_WINDOW`` seconds is dropped from the ring and its shard spread over
+    the others.
+    """
+
+    def __init__(
+        self,
+        manager: InstanceManager,
+        workers: Optional[int] = None,
+        interval: float = 5.0,
+        max_restarts: int = DEFAULT_MAX_RESTARTS,
+        sweep_workers: int = DEFAULT_SWEEP_WORKERS,
+    ):
+        self.manager = manager
+        self.interval = interval
+        self.max_restarts = max_restarts
+        self.sweep_workers = sweep_workers
+        count = max(1, workers or os.cpu_count() or 1)
+        self.workers = {f"shard-{i}": ShardWorker(f"shard-{i}") for i in range(count)}
+        self.ring = HashRing(list(self.workers))
+        self.rounds = 0
+        self.on_result: Optional[Callable[[OpenCLAWInstance], None]] = None
+        self.on_round: Optional[Callable[["ShardedMonitor"], None]] = None
+        self._round: set[str] = set()
+        self._by_name: dict[str, OpenCLAWInstance] = {}
+        # Workers must not inherit the supervisor's thread pools, sockets and locks
+        self._context = multiprocessing.get_context("spawn")
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._collector: Optional[threading.Thread] = None
+
+    @property
+    def active(self) -> list[ShardWorker]:
+        return [self.workers[node] for node in self.ring.nodes]
+
+    def start(
+        self,
+        on_result: Optional[Callable[[OpenCLAWInstance], None]] = None,
+        on_round: Optional[Callable[["ShardedMonitor"], None]] = None,
+    ):
+        self.on_result = on_result
+        self.on_round = on_round
+        self._stop.clear()
+        with self._lock:
+            self._assign()
+            for worker in self.active:
+                self._spawn(worker)
+        self._collector = threading.Thread(
+            target=self._collect_loop, name="shard-collector", daemon=True
+        )
+        self._collector.start()
+        logger.info(
+            f"Monitoring {len(self._by_name)} instances from {len(self.workers)} worker processes"
+        )
+
+    def stop(self):
+        self._stop.set()
+        if self._collector is not None:
+            self._collector.join(timeout=STOP_TIMEOUT)
+        with self._lock:
+            for worker in self.workers.values():
+                self._send(worker, "stop", None)
+            for worker in self.workers.values():
+                self._reap(worker, timeout=STOP_TIMEOUT)
+
+    def apply_config(self, new_config: Config) -> InstanceDiff:
+        """Apply a re-parsed config and hand changed shards to their workers."""
+        clusters_changed = new_config.clusters != self.manager.config.clusters
+        diff = self.manager.apply_config(new_config, probe=False)
+        # Re-targeted instances keep their name, and cluster changes touch every shard
+        retargeted = frozenset(new.name for _, new in diff.changed)
+        with self._lock:
+            moved = self._assign(send=True, refresh=retargeted, refresh_all=clusters_changed)
+        if moved:
+            logger.info(f"Rebalanced shards: {moved} instance(s) moved")
+        return diff
+
+    def _instances_for(self, worker: ShardWorker) -> list[OpenCLAWInstance]:
+        return [self._by_name[name] for name in worker.shard]
+
+    def _shard_config(self, worker: ShardWorker) -> Config:
+        return replace(self.manager.config, openclaw_instances=self._instances_for(worker))
+
+    def _assign(
+        self, send: bool = False, refresh: frozenset[str] = frozenset(), refresh_all: bool = False
+    ) -> int:
+        """Recompute shards from the ring; returns how many instances changed worker.
+
+        With ``send``, workers whose shard changed, holds a name in ``refresh`` or (with
+        ``refresh_all``) any worker get their new shard config.
+        """
+        instances = self.manager.get_all_instances()
+        self._by_name = {i.name: i for i in instances}
+        previous = {name: w.worker_id for w in self.workers.values() for name in w.shard}
+        moved = 0
+        for worker_id, names in self.ring.assign(list(self._by_name)).items():
+            worker = self.workers[worker_id]
+            moved += sum(1 for n in names if previous.get(n, worker_id) != worker_id)
+            changed = refresh_all or names != worker.shard or not refresh.isdisjoint(names)
+            worker.shard = names
+            if send and changed:
+                self._send(worker, "assign", self._shard_config(worker))
+        for worker in self.workers.values():
+            if worker.worker_id not in self.ring.nodes:
+                worker.shard = []
+        self._round &= set(self.ring.nodes)
+        return moved
+
+    def _spawn(self, worker: ShardWorker):
+        parent, child = self._context.Pipe()
+        worker.process = self._context.Process(
+            target=_worker_main,
+            args=(
+                worker.worker_id,
+                child,
+                self._shard_config(worker),
+                self.interval,
+                self.sweep_workers,
+            ),
+            name=f"openclaw-{worker.worker_id}",
+            daemon=True,
+        )
+        worker.process.start()
+        child.close()
+        worker.conn = parent
+
+    def _send(self, worker: ShardWorker, kind: str, payload):
+        if worker.conn is None:
+            return
+        try:
+            worker.conn.send((kind, payload))
+        except (OSError, ValueError):
+            # Dead worker; the collector notices and restarts it
+            pass
+
+    def _reap(self, worker: ShardWorker, timeout: float = 0.0):
+        if worker.process is not None:
+            worker.process.join(timeout)
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join(timeout)
+        if worker.conn is not None:
+            worker.conn.close()
+        worker.conn = None
+
+    def _collect_loop(self):
+        while not self._stop.is_set():
+            with self._lock:
+                conns = {w.conn: w for w in self.active if w.conn is not None}
+            for conn in wait(list(conns), timeout=POLL_INTERVAL):
+                worker = conns[conn]
+                try:
+                    kind, payload = conn.recv()
+                except (EOFError, OSError):
+                    self._handle_crash(worker)
+                    continue
+                with self._lock:
+                    self._handle_message(worker, kind, payload)
+            with self._lock:
+                for worker in self.active:
+                    if worker.conn is not None and not worker.alive:
+                        self._handle_crash(worker)
+
+    def _handle_message(self, worker: ShardWorker, kind: str, payload):
+        if kind == "results":
+            for name, state in payload:
+                instance = self._by_name.get(name)
+                if instance is None:
+                    continue
+                apply_runtime_state(instance, state)
+                worker.results += 1
+                if self.on_result is not None:
+                    self.on_result(instance)
+        elif kind == "sweep":
+            worker.sweeps += 1
+            worker.last_sweep_ms = payload["ms"]
+            self._round.add(worker.worker_id)
+            if self._round >= {w.worker_id for w in self.active if w.shard}:
+                self._round.clear()
+                self._finish_round()
+
+    def _finish_round(self):
+        self.rounds += 1
+        detector = self.manager.anomaly_detector
+        if detector is not None:
+            detector.observe(self.manager.get_all_instances())
+        if self.manager.status_cache is not None:
+            try:
+                self.manager.status_cache.save(self.manager.get_all_instances())
+            except OSError as e:
+                logger.warning(f"Failed to write status cache: {e}")
+        if self.on_round is not None:
+            self.on_round(self)
+
+    def _handle_crash(self, worker: ShardWorker):
+        with self._lock:
+            if self._stop.is_set() or worker.worker_id not in self.ring.nodes:
+                return
+            exitcode = worker.process.exitcode if worker.process else None
+            self._reap(worker, timeout=1.0)
+            now = time.monotonic()
+            worker.crashes.append(now)
+            while worker.crashes and now - worker.crashes[0] > RESTART_WINDOW:
+                worker.crashes.popleft()
+
+            if len(worker.crashes) <= self.max_restarts:
+                logger.warning(
+                    f"Worker {worker.worker_id} exited ({exitcode}), restarting with "
+                    f"{len(worker.shard)} instance(s)"
+                )
+                worker.restarts += 1
+                self._spawn(worker)
+                return
+
+            if len(self.ring.nodes) == 1:
+                logger.error(f"Last worker {worker.worker_id} keeps crashing, restarting anyway")
+                worker.restarts += 1
+                self._spawn(worker)
+                return
+            logger.error(
+                f"Worker {worker.worker_id} crashed {len(worker.crashes)} times, "
+                f"moving its {len(worker.shard)} instance(s) to the other workers"
+            )
+            self.ring.remove(worker.worker_id)
+            self._assign(send=True)
+
+    def stats(self) -> list[dict]:
+        with self._lock:
+            return [w.to_dict() for w in self.workers.values()]
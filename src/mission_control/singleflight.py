@@ -0,0 +1,75 @@
+import threading
+import time
+from typing import Callable, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_TTL = 1.0
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.finished_at = 0.0
+
+
+class SingleFlight:
+    """Concurrent calls with the same key share one in-flight call and its result.
+
+    A successful result is also served to calls arriving within ``ttl`` seconds
+    after it finished. Failures are shared only with callers already waiting.
+    Keys look like ``(kind, host, port_or_vmid)``.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL):
+        self.ttl = ttl
+        self.calls = 0
+        self.shared = 0
+        self._flights: dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> T:
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None and (
+                not flight.done.is_set() or time.monotonic() - flight.finished_at < self.ttl
+            ):
+                self.shared += 1
+                owner = False
+            else:
+                flight = self._flights[key] = _Flight()
+                self.calls += 1
+                owner = True
+
+        if not owner:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = func()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                flight.finished_at = time.monotonic()
+                if flight.error is not None and self._flights.get(key) is flight:
+                    del self._flights[key]
+            flight.done.set()
+        return flight.result
+
+    def forget(self, key: Hashable):
+        """Make the next call for ``key`` run anew, e.g. after an action changed the target.
+
+        A call still in flight keeps serving the callers already waiting on it.
+        """
+        with self._lock:
+            self._flights.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._flights.clear()
@@ -1,16 +1,44 @@
 import logging
+import socket
+import threading
 from typing import Optional
 import paramiko
 
-from .models import OpenCLAWInstance
+from .adaptive_limiter import AdaptiveLimiter, shared_limiter
+from .models import OPENCLAW_COMPOSE_DIR, OpenCLAWInstance
+from .tracing import span
 
 logger = logging.getLogger(__name__)
 
+REMOTE_BUNDLE_DIR = OPENCLAW_COMPOSE_DIR
+# sshd's MaxSessions and the first MaxStartups threshold both default to 10
+SSH_MAX_CONCURRENCY = 10
+
+
+def is_overload(error: BaseException) -> bool:
+    """Refused channels, dropped handshakes and timeouts, but not bad credentials."""
+    if isinstance(error, paramiko.AuthenticationException):
+        return False
+    return isinstance(error, (paramiko.SSHException, socket.timeout, EOFError, ConnectionError))
+
+
+def ssh_limiter(instance: OpenCLAWInstance) -> AdaptiveLimiter:
+    # Command run times vary too much for latency to mean load; react to errors only
+    return shared_limiter(
+        "ssh",
+        f"{instance.host}:{instance.port}",
+        initial=SSH_MAX_CONCURRENCY // 2,
+        max_limit=SSH_MAX_CONCURRENCY,
+        tolerance=None,
+        is_overload=is_overload,
+    )
+
 
 class SSHClient:
     def __init__(self, instance: OpenCLAWInstance):
         self.instance = instance
         self._client: Optional[paramiko.SSHClient] = None
+        self.limiter = ssh_limiter(instance)
 
     def connect(self) -> paramiko.SSHClient:
         if self._client is not None:
@@ -20,12 +48,16 @@ class SSHClient:
             self._client = paramiko.SSHClient()
             self._client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
 
-            self._client.connect(
-                hostname=self.instance.host,
-                port=self.instance.port,
-                username=self.instance.user,
-                timeout=10,
-            )
+            with (
+                span("ssh.connect", instance=self.instance.name, host=self.instance.host),
+                self.limiter.slot(),
+            ):
+                self._client.connect(
+                    hostname=self.instance.host,
+                    port=self.instance.port,
+                    username=self.instance.user,
+                    timeout=10,
+                )
 
             logger.info(f"Connected to {self.instance.name} via SSH")
             return self._client
@@ -39,13 +71,37 @@ class SSHClient:
             self._client.close()
             self._client = None
 
+    @property
+    def compose_dir(self) -> str:
+        return self.instance.compose_dir or REMOTE_BUNDLE_DIR
+
+    def for_instance(self, instance: OpenCLAWInstance) -> "SSHClient":
+        """A client for another instance on the same host, sharing this connection."""
+        client = SSHClient(instance)
+        client._client = self.connect()
+        return client
+
+    def is_connected(self) -> bool:
+        if self._client is None:
+            return False
+        transport = self._client.get_transport()
+        return transport is not None and transport.is_active()
+
+    def open_sftp(self) -> paramiko.SFTPClient:
+        return self.connect().open_sftp()
+
     def execute_command(self, command: str) -> tuple[str, str, int]:
         client = self.connect()
         try:
-            stdin, stdout, stderr = client.exec_command(command)
-            exit_code = stdout.channel.recv_exit_status()
-            stdout_data = stdout.read().decode("utf-8")
-            stderr_data = stderr.read().decode("utf-8")
+            with (
+                span("ssh.exec", instance=self.instance.name, command=command[:60]) as s,
+                self.limiter.slot(),
+            ):
+                stdin, stdout, stderr = client.exec_command(command)
+                exit_code = stdout.channel.recv_exit_status()
+                stdout_data = stdout.read().decode("utf-8")
+                stderr_data = stderr.read().decode("utf-8")
+                s.set_attribute("exit_code", exit_code)
             return stdout_data, stderr_data, exit_code
         except Exception as e:
             logger.error(f"Failed to execute command on {self.instance.name}: {e}")
@@ -63,7 +119,7 @@ class SSHClient:
 
     def start_openclaw(self) -> bool:
         try:
-            self.execute_command("cd ~/openclaw-docker && docker-compose up -d")
+            self.execute_command(f"cd ~/{self.compose_dir} && docker-compose up -d")
             return True
         except Exception as e:
             logger.error(f"Failed to start OpenCLAW on {self.instance.name}: {e}")
@@ -71,7 +127,7 @@ class SSHClient:
 
     def stop_openclaw(self) -> bool:
         try:
-            self.execute_command("cd ~/openclaw-docker && docker-compose stop")
+            self.execute_command(f"cd ~/{self.compose_dir} && docker-compose stop")
             return True
         except Exception as e:
             logger.error(f"Failed to stop OpenCLAW on {self.instance.name}: {e}")
@@ -79,7 +135,7 @@ class SSHClient:
 
     def restart_openclaw(self) -> bool:
         try:
-            self.execute_command("cd ~/openclaw-docker && docker-compose restart")
+            self.execute_command(f"cd ~/{self.compose_dir} && docker-compose restart")
             return True
         except Exception as e:
             logger.error(f"Failed to restart OpenCLAW on {self.instance.name}: {e}")
@@ -103,3 +159,54 @@ class SSHClient:
             return None
         except Exception:
             return None
+
+
+class SSHConnectionPool:
+    """Keeps one live SSH connection per (host, port, user) for reuse across calls.
+
+    Paramiko multiplexes channels over a single transport, so concurrent exec/SFTP
+    calls from several threads can share the pooled connection. Instances on the
+    same host share it too, each through a client bound to its own settings.
+    """
+
+    def __init__(self):
+        self._clients: dict[tuple[str, int, str], SSHClient] = {}
+        self._locks: dict[tuple[str, int, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(instance: OpenCLAWInstance) -> tuple[str, int, str]:
+        return (instance.host, instance.port, instance.user)
+
+    def get(self, instance: OpenCLAWInstance) -> SSHClient:
+        key = self.key_for(instance)
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            client = self._clients.get(key)
+            if client is not None and not client.is_connected():
+                client.disconnect()
+                client = None
+            if client is None:
+                client = SSHClient(instance)
+                client.connect()
+                self._clients[key] = client
+        return client if client.instance is instance else client.for_instance(instance)
+
+    def close(self, instance: OpenCLAWInstance):
+        key = self.key_for(instance)
+        with self._lock:
+            client = self._clients.pop(key, None)
+        if client is not None:
+            client.disconnect()
+
+    def close_all(self):
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.disconnect()
+
+    def __len__(self) -> int:
+        return len(self._clients)
@@ -0,0 +1,289 @@
+import logging
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .models import InstanceStatus, OpenCLAWInstance
+from .tracing import span
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEALTH_TIMEOUT = 300
+DEFAULT_POLL_INTERVAL = 2.0
+
+
+class DependencyError(ValueError):
+    """``depends_on`` names an unknown instance or forms a cycle."""
+
+
+def dependency_graph(instances: list[OpenCLAWInstance]) -> dict[str, list[str]]:
+    names = {i.name for i in instances}
+    graph = {}
+    for instance in instances:
+        unknown = [d for d in instance.depends_on if d not in names]
+        if unknown:
+            raise DependencyError(
+                f"'{instance.name}' depends on unknown instance(s): {', '.join(unknown)}"
+            )
+        graph[instance.name] = list(dict.fromkeys(instance.depends_on))
+    return graph
+
+
+def find_cycle(graph: dict[str, list[str]]) -> Optional[list[str]]:
+    """A dependency cycle as ``[a, b, ..., a]``, or None."""
+    WHITE, GREY, BLACK = 0, 1, 2
+    color = dict.fromkeys(graph, WHITE)
+    path: list[str] = []
+
+    def visit(name: str) -> Optional[list[str]]:
+        color[name] = GREY
+        path.append(name)
+        for dep in graph[name]:
+            if color[dep] == GREY:
+                return path[path.index(dep) :] + [dep]
+            if color[dep] == WHITE:
+                cycle = visit(dep)
+                if cycle:
+                    return cycle
+        path.pop()
+        color[name] = BLACK
+        return None
+
+    for name in graph:
+        if color[name] == WHITE:
+            cycle = visit(name)
+            if cycle:
+                return cycle
+    return None
+
+
+def with_dependencies(graph: dict[str, list[str]], names: list[str]) -> list[str]:
+    """``names`` plus everything they transitively depend on, in config order."""
+    wanted: set[str] = set()
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name not in wanted:
+            wanted.add(name)
+            pending.extend(graph[name])
+    return [name for name in graph if name in wanted]
+
+
+@dataclass
+class StartResult:
+    name: str
+    depends_on: list[str] = field(default_factory=list)
+    success: bool = False
+    already_running: bool = False
+    error: Optional[str] = None
+    # Seconds since the run began
+    submitted_s: Optional[float] = None
+    started_s: Optional[float] = None
+    start_done_s: Optional[float] = None
+    ready_s: Optional[float] = None
+    # The dependency that became healthy last, i.e. the one this instance waited on
+    gated_by: Optional[str] = None
+
+    @property
+    def start_duration_s(self) -> Optional[float]:
+        if self.started_s is None or self.start_done_s is None:
+            return None
+        return self.start_done_s - self.started_s
+
+    @property
+    def health_wait_s(self) -> Optional[float]:
+        if self.start_done_s is None or self.ready_s is None:
+            return None
+        return self.ready_s - self.start_done_s
+
+    @property
+    def busy_s(self) -> float:
+        """Time spent starting and waiting for health, excluding time spent queued."""
+        if self.started_s is None or self.ready_s is None:
+            return 0.0
+        return self.ready_s - self.started_s
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "depends_on": self.depends_on,
+            "success": self.success,
+            "already_running": self.already_running,
+            "error": self.error,
+            "started_s": self.started_s,
+            "start_duration_s": self.start_duration_s,
+            "health_wait_s": self.health_wait_s,
+            "ready_s": self.ready_s,
+            "gated_by": self.gated_by,
+        }
+
+
+@dataclass
+class StartupReport:
+    results: dict[str, StartResult]
+    total_s: float
+
+    @property
+    def success(self) -> bool:
+        return all(r.success for r in self.results.values())
+
+    @property
+    def serial_s(self) -> float:
+        """How long the same starts would have taken one after another."""
+        return sum(r.busy_s for r in self.results.values())
+
+    @property
+    def critical_path(self) -> list[StartResult]:
+        """The chain of dependencies that decided the total time, first to last."""
+        ready = [r for r in self.results.values() if r.ready_s is not None]
+        if not ready:
+            return []
+        result = max(ready, key=lambda r: r.ready_s)
+        path = [result]
+        while result.gated_by is not None:
+            result = self.results[result.gated_by]
+            path.append(result)
+        return path[::-1]
+
+    def to_dict(self) -> dict:
+        return {
+            "success": self.success,
+            "total_s": self.total_s,
+            "serial_s": self.serial_s,
+            "critical_path": [r.name for r in self.critical_path],
+            "instances": [r.to_dict() for r in self.results.values()],
+        }
+
+
+class StartupScheduler:
+    """Starts instances in dependency order, as many at once as the graph allows.
+
+    An instance is started once every instance in its ``depends_on`` passes its
+    health check. Instances that already pass are not restarted. When one fails,
+    everything depending on it is skipped.
+    """
+
+    def __init__(
+        self,
+        manager,
+        health_timeout: float = DEFAULT_HEALTH_TIMEOUT,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        max_workers: int = 16,
+        restart_running: bool = False,
+    ):
+        self.manager = manager
+        self.health_timeout = health_timeout
+        self.poll_interval = poll_interval
+        self.max_workers = max_workers
+        self.restart_running = restart_running
+
+    def plan(self, names: Optional[list[str]] = None) -> list[str]:
+        """Instances to start for ``names`` (all when None); raises DependencyError."""
+        graph = dependency_graph(self.manager.get_all_instances())
+        cycle = find_cycle(graph)
+        if cycle:
+            raise DependencyError(f"Dependency cycle: {' -> '.join(cycle)}")
+        if names is None:
+            return list(graph)
+        unknown = [n for n in names if n not in graph]
+        if unknown:
+            raise DependencyError(f"Unknown instance(s): {', '.join(unknown)}")
+        return with_dependencies(graph, names)
+
+    def _healthy(self, instance: OpenCLAWInstance) -> bool:
+        self.manager.health_checker.forget(instance)
+        healthy, _ = self.manager.health_checker.check_instance_health(instance)
+        return healthy
+
+    def start_one(self, instance: OpenCLAWInstance, result: StartResult, t0: float) -> StartResult:
+        with span("startup.instance", instance=instance.name):
+            result.started_s = time.monotonic() - t0
+            try:
+                if not self.restart_running and self._healthy(instance):
+                    result.already_running = True
+                    result.start_done_s = result.started_s
+                else:
+                    instance.status = InstanceStatus.STARTING
+                    if not self.manager.start_instance(instance.name):
+                        raise RuntimeError("start failed")
+                    result.start_done_s = time.monotonic() - t0
+                    self._wait_healthy(instance)
+                result.ready_s = time.monotonic() - t0
+                result.success = True
+                self.manager.update_instance_status(instance)
+                instance.status = InstanceStatus.RUNNING
+            except Exception as e:
+                result.error = str(e)
+                instance.status = InstanceStatus.ERROR
+                instance.error_message = result.error
+                logger.error(f"Starting {instance.name} failed: {e}")
+        return result
+
+    def _wait_healthy(self, instance: OpenCLAWInstance):
+        deadline = time.monotonic() + self.health_timeout
+        with span("startup.health_wait", instance=instance.name):
+            while not self._healthy(instance):
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"not healthy after {self.health_timeout:.0f}s")
+                time.sleep(self.poll_interval)
+
+    def run(self, names: Optional[list[str]] = None) -> StartupReport:
+        order = self.plan(names)
+        instances = {i.name: i for i in self.manager.get_all_instances() if i.name in order}
+        results = {
+            name: StartResult(name=name, depends_on=list(instances[name].depends_on))
+            for name in order
+        }
+        if not order:
+            return StartupReport(results=results, total_s=0.0)
+
+        dependents: dict[str, list[str]] = {name: [] for name in order}
+        waiting = {}
+        for name in order:
+            for dep in results[name].depends_on:
+                dependents[dep].append(name)
+            waiting[name] = len(results[name].depends_on)
+
+        t0 = time.monotonic()
+        done: queue.Queue = queue.Queue()
+        finished = 0
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(order))) as executor:
+
+            def submit(name: str):
+                results[name].submitted_s = time.monotonic() - t0
+                future = executor.submit(self.start_one, instances[name], results[name], t0)
+                future.add_done_callback(done.put)
+
+            def skip(name: str, reason: str):
+                nonlocal finished
+                result = results[name]
+                if result.error is not None:
+                    return
+                result.error = reason
+                finished += 1
+                logger.warning(f"Not starting {name}: {reason}")
+                for child in dependents[name]:
+                    skip(child, f"dependency '{name}' did not start")
+
+            for name in order:
+                if waiting[name] == 0:
+                    submit(name)
+
+            while finished < len(order):
+                result = done.get().result()
+                finished += 1
+                for child in dependents[result.name]:
+                    if results[child].error is not None:
+                        continue
+                    if not result.success:
+                        skip(child, f"dependency '{result.name}' did not start")
+                        continue
+                    waiting[child] -= 1
+                    if waiting[child] == 0:
+                        deps = [results[d] for d in results[child].depends_on]
+                        results[child].gated_by = max(deps, key=lambda r: r.ready_s).name
+                        submit(child)
+
+        return StartupReport(results=results, total_s=time.monotonic() - t0)
@@ -0,0 +1,117 @@
+import fcntl
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+from .models import OpenCLAWInstance, InstanceStatus
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "openclaw-mgmt"
+DEFAULT_CACHE_PATH = CACHE_DIR / "status.json"
+CACHE_VERSION = 1
+
+_DURATION_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_duration(value: str) -> float:
+    """Parse durations like ``30``, ``30s``, ``5m``, ``1.5h`` or ``2d`` into seconds."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smhd]?)\s*", value.lower())
+    if not match:
+        raise ValueError(f"Invalid duration '{value}', expected e.g. 30s, 5m or 1h")
+    return float(match.group(1)) * _DURATION_UNITS[match.group(2)]
+
+
+def _identity(instance: OpenCLAWInstance) -> list:
+    return [instance.host, instance.openclaw_port, instance.vm_id, instance.cluster]
+
+
+class StatusCache:
+    """Last-known instance state on disk, rewritten atomically after every sweep.
+
+    Entries remember the cluster/host/port/VM they were probed at, so a re-targeted
+    instance is never served another machine's state. Saves merge into the current
+    file under an flock, so concurrent CLI runs don't drop each other's entries.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or DEFAULT_CACHE_PATH)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _locked(self):
+        # The cache file itself is replaced on every save, so lock a sibling instead
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lock_path = self.path.with_name(self.path.name + ".lock")
+        with self._lock, open(lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def load(self) -> dict[str, dict]:
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable status cache {self.path}: {e}")
+            return {}
+        if data.get("version") != CACHE_VERSION:
+            return {}
+        return data.get("instances", {})
+
+    def save(self, instances: list[OpenCLAWInstance]):
+        if not instances:
+            return
+        now = time.time()
+        with self._locked():
+            entries = self.load()
+            for instance in instances:
+                if instance.last_health_check is None:
+                    continue
+                entries[instance.name] = {
+                    "identity": _identity(instance),
+                    "checked_at": now,
+                    "status": instance.status.value,
+                    "health_check_passed": instance.health_check_passed,
+                    "version": instance.version,
+                    "last_health_check": instance.last_health_check,
+                    "response_time_ms": instance.response_time_ms,
+                    "error_message": instance.error_message,
+                }
+
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=".status-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump({"version": CACHE_VERSION, "instances": entries}, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+
+    def apply(self, instances: list[OpenCLAWInstance]) -> dict[str, float]:
+        """Fill instances from cache; returns the age in seconds of each entry used."""
+        entries = self.load()
+        now = time.time()
+        ages = {}
+        for instance in instances:
+            entry = entries.get(instance.name)
+            if entry is None or entry.get("identity") != _identity(instance):
+                continue
+            instance.status = InstanceStatus(entry["status"])
+            instance.health_check_passed = entry["health_check_passed"]
+            instance.version = entry["version"]
+            instance.last_health_check = entry["last_health_check"]
+            instance.response_time_ms = entry.get("response_time_ms")
+            instance.error_message = entry.get("error_message")
+            ages[instance.name] = max(0.0, now - entry["checked_at"])
+        return ages
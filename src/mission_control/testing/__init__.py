@@ -0,0 +1,14 @@
+"""Local stand-ins for the backends Mission Control talks to, for tests and benchmarks."""
+
+from .fake_fleet import FakeFleet, FakeFleetServer, FakeOpenCLAW, Latency
+from .fake_proxmox import FakeProxmoxCluster, FakeProxmoxServer, FakeVM
+
+__all__ = [
+    "FakeFleet",
+    "FakeFleetServer",
+    "FakeOpenCLAW",
+    "FakeProxmoxCluster",
+    "FakeProxmoxServer",
+    "FakeVM",
+    "Latency",
+]
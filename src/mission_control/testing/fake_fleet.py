@@ -0,0 +1,409 @@
+"""A simulated OpenCLAW fleet on loopback: thousands of /health endpoints in one process.
+
+Every instance listens on its own port, served by one asyncio loop in a
+background thread. Instances have scriptable latency, flapping, hangs, version
+changes and (with SSH stubs) docker-compose lifecycle, and the server writes a
+matching config.yaml, so sweeps, monitoring and lifecycle batches can be load
+tested on one box with no network.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import resource
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field, fields
+from typing import Optional, Union
+
+import yaml
+
+from ..models import Config, InstanceType, OpenCLAWInstance
+
+SIM_USER = "openclaw"
+HTTP_BACKLOG = 512
+# How often a hung request checks whether it has been released
+HANG_POLL_S = 0.1
+
+
+@dataclass(frozen=True)
+class Latency:
+    """Response-time distribution in milliseconds: fixed, uniform or lognormal."""
+
+    kind: str = "fixed"
+    a: float = 0.0
+    b: float = 0.0
+
+    @classmethod
+    def fixed(cls, ms: float) -> "Latency":
+        return cls("fixed", ms)
+
+    @classmethod
+    def uniform(cls, low_ms: float, high_ms: float) -> "Latency":
+        return cls("uniform", low_ms, high_ms)
+
+    @classmethod
+    def lognormal(cls, median_ms: float, sigma: float) -> "Latency":
+        return cls("lognormal", median_ms, sigma)
+
+    @classmethod
+    def parse(cls, spec: str) -> "Latency":
+        """``5``, ``fixed:5``, ``uniform:2:20`` or ``lognormal:5:0.8``."""
+        kind, _, rest = spec.partition(":")
+        if not rest:
+            return cls.fixed(float(kind))
+        args = [float(x) for x in rest.split(":")]
+        factory = {"fixed": cls.fixed, "uniform": cls.uniform, "lognormal": cls.lognormal}
+        if kind not in factory:
+            raise ValueError(f"Unknown latency distribution '{kind}'")
+        return factory[kind](*args)
+
+    def sample(self, rng: random.Random) -> float:
+        """One response time, in seconds."""
+        if self.kind == "uniform":
+            ms = rng.uniform(self.a, self.b)
+        elif self.kind == "lognormal":
+            ms = self.a * math.exp(rng.gauss(0.0, self.b))
+        else:
+            ms = self.a
+        return max(ms, 0.0) / 1000
+
+
+@dataclass
+class FakeOpenCLAW:
+    name: str
+    version: str = "1.0.0"
+    latency: Latency = field(default_factory=Latency)
+    health_path: str = "/health"
+    # Alternate healthy/503 every flap_period seconds
+    flap_period: Optional[float] = None
+    # Accept requests but never answer them while set
+    hang: bool = False
+    # Stopped containers drop connections; started ones pass health after boot_s
+    running: bool = True
+    boot_s: float = 0.0
+    ready_at: float = 0.0
+    http_port: Optional[int] = None
+    ssh_port: Optional[int] = None
+    requests: int = 0
+    commands: list[str] = field(default_factory=list)
+    flap_epoch: float = field(default_factory=time.monotonic)
+
+    def up(self, now: float) -> bool:
+        return self.running and now >= self.ready_at
+
+    def flapping_down(self, now: float) -> bool:
+        if not self.flap_period:
+            return False
+        return int((now - self.flap_epoch) / self.flap_period) % 2 == 1
+
+    def exec(self, command: str) -> tuple[str, str, int]:
+        """Answer the docker commands SSHClient sends: (stdout, stderr, exit code)."""
+        self.commands.append(command)
+        now = time.monotonic()
+        if "up -d" in command:
+            if not self.running:
+                self.running, self.ready_at = True, now + self.boot_s
+            return "", f"Container {self.name} Started\n", 0
+        if "compose stop" in command or "compose down" in command:
+            self.running = False
+            return "", f"Container {self.name} Stopped\n", 0
+        if "compose restart" in command:
+            self.running, self.ready_at = True, now + self.boot_s
+            return "", f"Container {self.name} Restarted\n", 0
+        if command.startswith("docker ps"):
+            return ("Up 5 minutes\n" if self.running else ""), "", 0
+        if "logs --tail=" in command:
+            lines = int(command.split("--tail=")[1].split()[0])
+            return "".join(f"openclaw | {self.name} log line {i}\n" for i in range(lines)), "", 0
+        if "--version" in command:
+            return f"openclaw {self.version}\n", "", 0
+        return "", f"sh: {command.split()[0]}: command not found\n", 127
+
+
+@dataclass
+class FakeFleet:
+    instances: list[FakeOpenCLAW] = field(default_factory=list)
+
+    @classmethod
+    def build(
+        cls,
+        count: int,
+        prefix: str = "oc-sim",
+        latency: Latency = Latency.fixed(1.0),
+        versions: tuple[str, ...] = ("1.0.0",),
+        flapping: float = 0.0,
+        hanging: float = 0.0,
+        flap_period: float = 5.0,
+        seed: Optional[int] = None,
+    ) -> "FakeFleet":
+        """``count`` instances; ``flapping`` and ``hanging`` are fractions of the fleet."""
+        rng = random.Random(seed)
+        instances = [
+            FakeOpenCLAW(
+                name=f"{prefix}-{i:04d}", version=versions[i % len(versions)], latency=latency
+            )
+            for i in range(count)
+        ]
+        for instance in rng.sample(instances, round(count * flapping)):
+            instance.flap_period = flap_period
+        for instance in rng.sample(instances, round(count * hanging)):
+            instance.hang = True
+        return cls(instances)
+
+    def get(self, name: str) -> FakeOpenCLAW:
+        for instance in self.instances:
+            if instance.name == name:
+                return instance
+        raise KeyError(name)
+
+
+class FakeFleetServer:
+    """Serves a FakeFleet's /health endpoints (and optionally SSH) on loopback ports."""
+
+    def __init__(
+        self,
+        fleet: Optional[FakeFleet] = None,
+        ssh: bool = False,
+        host: str = "127.0.0.1",
+        seed: Optional[int] = None,
+    ):
+        self.fleet = fleet or FakeFleet.build(10)
+        self.host = host
+        self.ssh = ssh
+        self.open_connections = 0
+        self.peak_connections = 0
+        self._rng = random.Random(seed)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._servers: list[asyncio.AbstractServer] = []
+        self._stopping = False
+        self._ssh_server = None
+
+    @property
+    def total_requests(self) -> int:
+        return sum(i.requests for i in self.fleet.instances)
+
+    @property
+    def ssh_connections(self) -> int:
+        """SSH connections accepted so far (0 without the SSH stubs)."""
+        return self._ssh_server.connections if self._ssh_server is not None else 0
+
+    def start(self) -> "FakeFleetServer":
+        self._stopping = False
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="fake-fleet", daemon=True
+        )
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._listen(), self._loop).result()
+        if self.ssh:
+            from .fake_ssh import FakeSSHServer
+
+            self._ssh_server = FakeSSHServer(self.fleet.instances, self.host).start()
+        return self
+
+    def stop(self):
+        if self._ssh_server is not None:
+            self._ssh_server.stop()
+            self._ssh_server = None
+        if self._loop is None:
+            return
+        self._stopping = True
+        asyncio.run_coroutine_threadsafe(self._close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    def __enter__(self) -> "FakeFleetServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def update(self, names: Union[str, Iterable[str], None] = None, **changes):
+        """Change instances (all when ``names`` is None) right away, e.g. ``version="2.0"``."""
+        unknown = [k for k in changes if k not in {f.name for f in fields(FakeOpenCLAW)}]
+        if unknown:
+            raise ValueError(f"Unknown instance attribute(s): {', '.join(unknown)}")
+        if names is None:
+            targets = self.fleet.instances
+        elif isinstance(names, str):
+            targets = [self.fleet.get(names)]
+        else:
+            targets = [self.fleet.get(n) for n in names]
+        for instance in targets:
+            for key, value in changes.items():
+                setattr(instance, key, value)
+
+    def schedule(self, after_s: float, names: Union[str, Iterable[str], None] = None, **changes):
+        """Apply ``update(names, **changes)`` ``after_s`` seconds from now."""
+        names = names if names is None or isinstance(names, str) else list(names)
+        self._loop.call_soon_threadsafe(
+            lambda: self._loop.call_later(after_s, lambda: self.update(names, **changes))
+        )
+
+    def instance_configs(self, **overrides) -> list[OpenCLAWInstance]:
+        return [
+            OpenCLAWInstance(
+                name=sim.name,
+                host=self.host,
+                port=sim.ssh_port or 22,
+                user=SIM_USER,
+                type=InstanceType.DOCKER,
+                openclaw_port=sim.http_port,
+                health_path=sim.health_path,
+                description="simulated",
+                **overrides,
+            )
+            for sim in self.fleet.instances
+        ]
+
+    def config(self, **overrides) -> Config:
+        return Config(openclaw_instances=self.instance_configs(**overrides))
+
+    def write_config(self, path: str):
+        keys = (
+            "name",
+            "host",
+            "port",
+            "user",
+            "type",
+            "openclaw_port",
+            "health_path",
+            "description",
+        )
+        instances = [
+            {k: v for k, v in i.to_dict().items() if k in keys} for i in self.instance_configs()
+        ]
+        with open(path, "w") as f:
+            yaml.safe_dump({"openclaw_instances": instances}, f, sort_keys=False)
+
+    async def _listen(self):
+        for sim in self.fleet.instances:
+            server = await asyncio.start_server(
+                lambda r, w, sim=sim: self._serve(sim, r, w),
+                self.host,
+                sim.http_port or 0,
+                backlog=HTTP_BACKLOG,
+            )
+            sim.http_port = server.sockets[0].getsockname()[1]
+            self._servers.append(server)
+
+    async def _close(self):
+        for server in self._servers:
+            server.close()
+        self._servers = []
+        current = asyncio.current_task()
+        for task in asyncio.all_tasks():
+            if task is not current:
+                task.cancel()
+
+    async def _serve(self, sim: FakeOpenCLAW, reader, writer):
+        self.open_connections += 1
+        self.peak_connections = max(self.peak_connections, self.open_connections)
+        try:
+            while not self._stopping:
+                request = await reader.readuntil(b"\r\n\r\n")
+                method, target, *_ = request.split(b"\r\n", 1)[0].decode("latin-1").split(" ")
+                sim.requests += 1
+                if not sim.up(time.monotonic()):
+                    # Stopped or still booting: nothing is listening behind the port
+                    break
+                while sim.hang and not self._stopping:
+                    await asyncio.sleep(HANG_POLL_S)
+                await asyncio.sleep(sim.latency.sample(self._rng))
+
+                if method != "GET" or target.split("?", 1)[0] != sim.health_path:
+                    code, reason, body = 404, "Not Found", {"error": "not found"}
+                elif sim.flapping_down(time.monotonic()):
+                    code, reason, body = 503, "Service Unavailable", {"status": "unhealthy"}
+                else:
+                    code, reason, body = 200, "OK", {"status": "ok", "version": sim.version}
+                payload = json.dumps(body).encode()
+                writer.write(
+                    f"HTTP/1.1 {code} {reason}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload
+                )
+                await writer.drain()
+                if b"connection: close" in request.lower():
+                    break
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        finally:
+            self.open_connections -= 1
+            writer.close()
+
+
+def raise_fd_limit(wanted: int) -> int:
+    """Raise the soft open-file limit towards ``wanted`` (capped at the hard limit)."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    target = wanted if hard == resource.RLIM_INFINITY else min(wanted, hard)
+    if target > soft:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+        soft = target
+    return soft
+
+
+def process_stats() -> dict:
+    """This process's resident memory (MB), open file descriptors and threads."""
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    rss_mb = int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        fds = len(os.listdir("/proc/self/fd"))
+    except OSError:
+        fds = None
+    return {"rss_mb": round(rss_mb, 1), "fds": fds, "threads": threading.active_count()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a simulated OpenCLAW fleet on loopback")
+    parser.add_argument("--instances", type=int, default=100)
+    parser.add_argument(
+        "--latency", default="1", help="ms: 5, uniform:2:20 or lognormal:MEDIAN:SIGMA"
+    )
+    parser.add_argument("--versions", default="1.0.0", help="Comma-separated, assigned in turn")
+    parser.add_argument("--flapping", type=float, default=0.0, help="Fraction that flap")
+    parser.add_argument("--flap-period", type=float, default=5.0)
+    parser.add_argument("--hanging", type=float, default=0.0, help="Fraction that never answer")
+    parser.add_argument("--ssh", action="store_true", help="Also start SSH stubs")
+    parser.add_argument("--config", default="simulated-fleet.yaml", help="Where to write config")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    raise_fd_limit(args.instances * (3 if args.ssh else 2) + 256)
+    fleet = FakeFleet.build(
+        args.instances,
+        latency=Latency.parse(args.latency),
+        versions=tuple(args.versions.split(",")),
+        flapping=args.flapping,
+        hanging=args.hanging,
+        flap_period=args.flap_period,
+        seed=args.seed,
+    )
+    server = FakeFleetServer(fleet, ssh=args.ssh, seed=args.seed).start()
+    server.write_config(args.config)
+    print(
+        f"{args.instances} simulated instances on {server.host}, config in {args.config} "
+        f"({process_stats()['fds']} fds open)"
+    )
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,530 @@
+import argparse
+import datetime
+import functools
+import json
+import math
+import random
+import re
+import ssl
+import tempfile
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from ..models import ProxmoxConfig
+
+API_PREFIX = "/api2/json"
+FAKE_USER = "root@pam"
+FAKE_TOKEN_ID = "bench"
+FAKE_TOKEN_SECRET = "fake-secret"
+FAKE_PASSWORD = "fake-password"
+# PVE returns ~70 consolidated points per timeframe
+RRD_POINTS = 70
+RRD_STEPS = {"hour": 60, "day": 1800, "week": 10800, "month": 43200, "year": 604800}
+
+_cert_lock = threading.Lock()
+_cert_paths: Optional[tuple[str, str]] = None
+
+
+def _self_signed_cert() -> tuple[str, str]:
+    global _cert_paths
+    with _cert_lock:
+        if _cert_paths is not None:
+            return _cert_paths
+
+        from cryptography import x509
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import ec
+        from cryptography.x509.oid import NameOID
+
+        key = ec.generate_private_key(ec.SECP256R1())
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "fake-pve")])
+        now = datetime.datetime.now(datetime.timezone.utc)
+        cert = (
+            x509.CertificateBuilder()
+            .subject_name(name)
+            .issuer_name(name)
+            .public_key(key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - datetime.timedelta(days=1))
+            .not_valid_after(now + datetime.timedelta(days=30))
+            .sign(key, hashes.SHA256())
+        )
+
+        directory = Path(tempfile.mkdtemp(prefix="fake-pve-"))
+        cert_path = directory / "cert.pem"
+        key_path = directory / "key.pem"
+        cert_path.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+        key_path.write_bytes(
+            key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            )
+        )
+        _cert_paths = (str(cert_path), str(key_path))
+        return _cert_paths
+
+
+@dataclass
+class FakeVM:
+    vmid: int
+    name: str
+    node: str
+    status: str = "running"
+    cpu: float = 0.05
+    mem: int = 512 * 1024**2
+    maxmem: int = 2 * 1024**3
+    maxcpu: int = 2
+    uptime: int = 3600
+    template: bool = False
+    storage: str = "local-lvm"
+    # Config lock held by a running clone (monotonic deadline)
+    locked_until: float = 0.0
+
+    @property
+    def locked(self) -> bool:
+        return time.monotonic() < self.locked_until
+
+    def summary(self) -> dict:
+        return {
+            "vmid": self.vmid,
+            "name": self.name,
+            "status": self.status,
+            "cpu": self.cpu if self.status == "running" else 0,
+            "mem": self.mem if self.status == "running" else 0,
+            "maxmem": self.maxmem,
+            "cpus": self.maxcpu,
+            "uptime": self.uptime if self.status == "running" else 0,
+            "template": int(self.template),
+        }
+
+
+@dataclass
+class FakeTask:
+    upid: str
+    node: str
+    started: float
+    duration: float
+    exitstatus: str = "OK"
+
+    def status(self) -> dict:
+        done = time.monotonic() - self.started >= self.duration
+        data = {"upid": self.upid, "node": self.node, "status": "stopped" if done else "running"}
+        if done:
+            data["exitstatus"] = self.exitstatus
+        return data
+
+
+@dataclass
+class FakeProxmoxCluster:
+    nodes: dict[str, dict[int, FakeVM]] = field(default_factory=dict)
+    tasks: dict[str, FakeTask] = field(default_factory=dict)
+    task_duration: float = 0.0
+    clone_duration: float = 0.0
+
+    @classmethod
+    def build(
+        cls,
+        vm_count: int,
+        node_count: int = 1,
+        start_vmid: int = 100,
+        stopped_every: int = 5,
+        seed: Optional[int] = None,
+    ) -> "FakeProxmoxCluster":
+        rng = random.Random(seed)
+        nodes: dict[str, dict[int, FakeVM]] = {f"pve{i + 1}": {} for i in range(node_count)}
+        node_names = list(nodes)
+        for i in range(vm_count):
+            vmid = start_vmid + i
+            node = node_names[i % node_count]
+            nodes[node][vmid] = FakeVM(
+                vmid=vmid,
+                name=f"openclaw-{vmid}",
+                node=node,
+                status=(
+                    "stopped"
+                    if stopped_every and i % stopped_every == stopped_every - 1
+                    else "running"
+                ),
+                cpu=round(rng.uniform(0.01, 0.9), 4),
+                mem=rng.randint(256, 2048) * 1024**2,
+            )
+        return cls(nodes=nodes)
+
+    def find(self, vmid: int) -> Optional[FakeVM]:
+        for vms in self.nodes.values():
+            if vmid in vms:
+                return vms[vmid]
+        return None
+
+    def all_vms(self) -> list[FakeVM]:
+        return [vm for vms in self.nodes.values() for vm in vms.values()]
+
+    def new_task(self, node: str, kind: str, vmid: int, duration: Optional[float] = None) -> str:
+        upid = (
+            f"UPID:{node}:{len(self.tasks):08X}:{int(time.time()):08X}:{kind}:{vmid}:{FAKE_USER}:"
+        )
+        self.tasks[upid] = FakeTask(
+            upid=upid,
+            node=node,
+            started=time.monotonic(),
+            duration=self.task_duration if duration is None else duration,
+        )
+        return upid
+
+
+@functools.lru_cache(maxsize=None)
+def _route_pattern(template: str) -> re.Pattern:
+    return re.compile(re.sub(r"\{(\w+)\}", r"(?P<\1>[^/]+)", template))
+
+
+class _HTTPError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+class FakeProxmoxServer:
+    """In-process HTTPS server speaking enough of the PVE API for ProxmoxClient.
+
+    Latency (seconds, plus uniform jitter) and a random 5xx error rate are applied
+    to every API call; request counts are tracked per route for benchmarks.
+    """
+
+    def __init__(
+        self,
+        cluster: Optional[FakeProxmoxCluster] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.cluster = cluster or FakeProxmoxCluster.build(10)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.host = host
+        self.requested_port = port
+        self.calls: Counter = Counter()
+        self.tickets_issued = 0
+        self._tickets: set[str] = set()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._routes = [
+            ("POST", "/access/ticket", self._ticket),
+            ("GET", "/nodes", self._nodes),
+            ("GET", "/nodes/{node}/qemu", self._qemu_list),
+            ("GET", "/nodes/{node}/qemu/{vmid}/status/current", self._vm_status),
+            ("POST", "/nodes/{node}/qemu/{vmid}/status/{action}", self._vm_action),
+            ("POST", "/nodes/{node}/qemu/{vmid}/clone", self._clone),
+            ("GET", "/nodes/{node}/qemu/{vmid}/agent/network-get-interfaces", self._agent_ifaces),
+            ("GET", "/nodes/{node}/qemu/{vmid}/rrddata", self._rrddata),
+            ("GET", "/nodes/{node}/tasks/{upid}/status", self._task_status),
+            ("GET", "/cluster/resources", self._cluster_resources),
+        ]
+
+    @property
+    def port(self) -> int:
+        assert self._httpd is not None, "server not started"
+        return self._httpd.server_address[1]
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def reset_stats(self):
+        with self._lock:
+            self.calls.clear()
+            self.tickets_issued = 0
+
+    def revoke_tickets(self):
+        """Invalidate every issued ticket, as a Proxmox restart or key rotation would."""
+        with self._lock:
+            self._tickets.clear()
+
+    def proxmox_config(self, password_auth: bool = False, **overrides) -> ProxmoxConfig:
+        config = ProxmoxConfig(
+            host=self.host,
+            port=self.port,
+            user=FAKE_USER,
+            token_id=None if password_auth else FAKE_TOKEN_ID,
+            token_secret=None if password_auth else FAKE_TOKEN_SECRET,
+            password=FAKE_PASSWORD if password_auth else None,
+            verify_ssl=False,
+            timeout=10,
+        )
+        for key, value in overrides.items():
+            setattr(config, key, value)
+        return config
+
+    def start(self) -> "FakeProxmoxServer":
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; avoid Nagle/delayed-ACK stalls
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                server._handle(self, "GET")
+
+            def do_POST(self):
+                server._handle(self, "POST")
+
+        self._httpd = ThreadingHTTPServer((self.host, self.requested_port), Handler)
+        self._httpd.daemon_threads = True
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(*_self_signed_cert())
+        self._httpd.socket = context.wrap_socket(self._httpd.socket, server_side=True)
+
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self) -> "FakeProxmoxServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _authorized(self, handler: BaseHTTPRequestHandler, path: str) -> bool:
+        if path == "/access/ticket":
+            return True
+        expected = f"PVEAPIToken={FAKE_USER}!{FAKE_TOKEN_ID}={FAKE_TOKEN_SECRET}"
+        if handler.headers.get("Authorization") == expected:
+            return True
+        cookies = SimpleCookie(handler.headers.get("Cookie") or "")
+        if "PVEAuthCookie" not in cookies:
+            return False
+        with self._lock:
+            return cookies["PVEAuthCookie"].value in self._tickets
+
+    def _handle(self, handler: BaseHTTPRequestHandler, method: str):
+        url = urlsplit(handler.path)
+        path = unquote(url.path).removeprefix(API_PREFIX).rstrip("/")
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        length = int(handler.headers.get("Content-Length") or 0)
+        if length:
+            body = handler.rfile.read(length).decode()
+            params.update({k: v[-1] for k, v in parse_qs(body).items()})
+
+        delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            time.sleep(delay)
+
+        try:
+            if not self._authorized(handler, path):
+                raise _HTTPError(401, "authentication failure")
+            for route_method, template, func in self._routes:
+                match = re.fullmatch(_route_pattern(template), path)
+                if route_method == method and match:
+                    with self._lock:
+                        self.calls[f"{method} {template}"] += 1
+                        fail = self.error_rate and self._rng.random() < self.error_rate
+                    if fail:
+                        raise _HTTPError(500, "injected failure")
+                    with self._lock:
+                        data = func(params=params, **match.groupdict())
+                    break
+            else:
+                raise _HTTPError(501, f"Method '{method} {path}' not implemented")
+            self._respond(handler, 200, {"data": data})
+        except _HTTPError as e:
+            self._respond(handler, e.code, {"data": None, "errors": {"message": str(e)}})
+
+    @staticmethod
+    def _respond(handler: BaseHTTPRequestHandler, code: int, payload: dict):
+        body = json.dumps(payload).encode()
+        handler.send_response(code)
+        handler.send_header("Content-Type", "application/json;charset=UTF-8")
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def _vm_on_node(self, node: str, vmid: str) -> FakeVM:
+        if node not in self.cluster.nodes:
+            raise _HTTPError(595, f"no such node '{node}'")
+        vm = self.cluster.nodes[node].get(int(vmid))
+        if vm is None:
+            raise _HTTPError(
+                500, f"Configuration file 'nodes/{node}/qemu-server/{vmid}.conf' does not exist"
+            )
+        return vm
+
+    def _ticket(self, params: dict):
+        if params.get("username") != FAKE_USER or not (
+            params.get("password") == FAKE_PASSWORD or params.get("password") in self._tickets
+        ):
+            raise _HTTPError(401, "authentication failure")
+        self.tickets_issued += 1
+        ticket = f"PVE:{FAKE_USER}:{self.tickets_issued:08X}::fake"
+        self._tickets.add(ticket)
+        return {
+            "username": FAKE_USER,
+            "ticket": ticket,
+            "CSRFPreventionToken": f"{self.tickets_issued:08X}:fake-csrf",
+        }
+
+    def _nodes(self, params: dict):
+        return [{"node": name, "status": "online", "type": "node"} for name in self.cluster.nodes]
+
+    def _qemu_list(self, params: dict, node: str):
+        if node not in self.cluster.nodes:
+            raise _HTTPError(595, f"no such node '{node}'")
+        return [vm.summary() for vm in self.cluster.nodes[node].values()]
+
+    def _vm_status(self, params: dict, node: str, vmid: str):
+        return self._vm_on_node(node, vmid).summary()
+
+    def _vm_action(self, params: dict, node: str, vmid: str, action: str):
+        vm = self._vm_on_node(node, vmid)
+        if vm.locked:
+            raise _HTTPError(500, f"VM {vmid} is locked (clone)")
+        if action in ("start", "resume"):
+            vm.status = "running"
+        elif action in ("stop", "shutdown"):
+            vm.status = "stopped"
+        elif action not in ("restart", "reboot", "reset"):
+            raise _HTTPError(501, f"unknown action '{action}'")
+        return self.cluster.new_task(node, f"qm{action}", vm.vmid)
+
+    def _clone(self, params: dict, node: str, vmid: str):
+        source = self._vm_on_node(node, vmid)
+        newid = int(params["newid"])
+        target = params.get("target", node)
+        full = params.get("full", "0") == "1" or not source.template
+        if target not in self.cluster.nodes:
+            raise _HTTPError(500, f"no such node '{target}'")
+        if self.cluster.find(newid) is not None:
+            raise _HTTPError(500, f"unable to create VM {newid} - VM {newid} already exists")
+        # Templates can be cloned in parallel; a plain VM is locked for the duration
+        if source.locked:
+            raise _HTTPError(500, f"VM {vmid} is locked (clone)")
+        if "storage" in params and not full:
+            raise _HTTPError(400, "parameter 'storage' is only allowed for full clones")
+
+        duration = self.cluster.clone_duration
+        self.cluster.nodes[target][newid] = FakeVM(
+            vmid=newid,
+            name=params.get("name", f"Copy-of-VM-{source.name}"),
+            node=target,
+            status="stopped",
+            maxmem=source.maxmem,
+            maxcpu=source.maxcpu,
+            storage=params.get("storage", source.storage),
+            locked_until=time.monotonic() + duration,
+        )
+        if not source.template:
+            source.locked_until = time.monotonic() + duration
+        return self.cluster.new_task(node, "qmclone", source.vmid, duration=duration)
+
+    def _agent_ifaces(self, params: dict, node: str, vmid: str):
+        vm = self._vm_on_node(node, vmid)
+        if vm.status != "running":
+            raise _HTTPError(500, "QEMU guest agent is not running")
+        address = f"10.{(vm.vmid >> 16) & 255}.{(vm.vmid >> 8) & 255}.{vm.vmid & 255}"
+        return {
+            "result": [
+                {
+                    "name": "lo",
+                    "ip-addresses": [{"ip-address-type": "ipv4", "ip-address": "127.0.0.1"}],
+                },
+                {
+                    "name": "eth0",
+                    "ip-addresses": [{"ip-address-type": "ipv4", "ip-address": address}],
+                },
+            ]
+        }
+
+    def _rrddata(self, params: dict, node: str, vmid: str):
+        vm = self._vm_on_node(node, vmid)
+        step = RRD_STEPS.get(params.get("timeframe", "hour"))
+        if step is None:
+            raise _HTTPError(400, f"invalid timeframe '{params.get('timeframe')}'")
+        rng = random.Random(vm.vmid)
+        end = int(time.time()) // step * step
+        points = []
+        for i in range(RRD_POINTS):
+            t = end - (RRD_POINTS - 1 - i) * step
+            # Daily cycle around the VM's current load, clipped to the VM's limits
+            wave = 1 + 0.5 * math.sin(2 * math.pi * t / 86400 + vm.vmid)
+            cpu = min(1.0, vm.cpu * wave * rng.uniform(0.8, 1.2))
+            mem = min(vm.maxmem, int(vm.mem * (0.9 + 0.2 * rng.random())))
+            point = {"time": t, "maxcpu": vm.maxcpu}
+            if vm.status == "running":
+                point.update(cpu=cpu, mem=mem, maxmem=vm.maxmem)
+            points.append(point)
+        return points
+
+    def _task_status(self, params: dict, node: str, upid: str):
+        task = self.cluster.tasks.get(upid)
+        if task is None:
+            raise _HTTPError(500, f"no such task '{upid}'")
+        return task.status()
+
+    def _cluster_resources(self, params: dict):
+        resources = []
+        wanted = params.get("type")
+        if wanted in (None, "node"):
+            resources.extend(
+                {"id": f"node/{name}", "type": "node", "node": name, "status": "online"}
+                for name in self.cluster.nodes
+            )
+        if wanted in (None, "vm"):
+            resources.extend(
+                {"id": f"qemu/{vm.vmid}", "type": "qemu", "node": vm.node, **vm.summary()}
+                for vm in self.cluster.all_vms()
+            )
+        return resources
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake Proxmox VE API for local testing")
+    parser.add_argument("--vms", type=int, default=10)
+    parser.add_argument("--nodes", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8006)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added per call")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = FakeProxmoxServer(
+        FakeProxmoxCluster.build(args.vms, args.nodes),
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        port=args.port,
+    ).start()
+    print(
+        f"Fake Proxmox on https://{server.host}:{server.port} "
+        f"(token {FAKE_USER}!{FAKE_TOKEN_ID}={FAKE_TOKEN_SECRET}, password {FAKE_PASSWORD})"
+    )
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""paramiko SSH stubs for simulated instances, answering the commands SSHClient sends.
+
+Any user and any key or password is accepted. Clients still need a key to offer:
+``write_client_key`` puts one where paramiko looks for it (``~/.ssh``), so point
+``HOME`` at a scratch directory rather than touching the real one.
+"""
+
+import logging
+import selectors
+import socket
+import threading
+from pathlib import Path
+from typing import Optional
+
+import paramiko
+
+from .fake_fleet import FakeOpenCLAW
+
+logger = logging.getLogger(__name__)
+
+ACCEPT_POLL_S = 0.2
+
+
+def write_client_key(home: Path) -> Path:
+    """Create ``home/.ssh/id_ecdsa`` for paramiko's default key lookup."""
+    ssh_dir = Path(home) / ".ssh"
+    ssh_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+    path = ssh_dir / "id_ecdsa"
+    paramiko.ECDSAKey.generate().write_private_key_file(str(path))
+    return path
+
+
+class _StubServer(paramiko.ServerInterface):
+    def __init__(self, instance: FakeOpenCLAW):
+        self.instance = instance
+
+    def get_allowed_auths(self, username: str) -> str:
+        return "publickey,password"
+
+    def check_auth_publickey(self, username, key) -> int:
+        return paramiko.AUTH_SUCCESSFUL
+
+    def check_auth_password(self, username, password) -> int:
+        return paramiko.AUTH_SUCCESSFUL
+
+    def check_channel_request(self, kind: str, chanid: int) -> int:
+        if kind == "session":
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_exec_request(self, channel, command: bytes) -> bool:
+        # Reply from another thread: the exec request must be acknowledged first
+        threading.Thread(target=self._run, args=(channel, command.decode()), daemon=True).start()
+        return True
+
+    def _run(self, channel, command: str):
+        try:
+            stdout, stderr, code = self.instance.exec(command)
+            if stdout:
+                channel.sendall(stdout.encode())
+            if stderr:
+                channel.sendall_stderr(stderr.encode())
+            channel.send_exit_status(code)
+            # EOF rather than close: a close can overtake the exec reply, which the
+            # client would see as a failed exec. The channel goes with the transport.
+            channel.shutdown_write()
+        except Exception as e:
+            logger.debug(f"SSH stub for {self.instance.name} failed on '{command}': {e}")
+
+
+class FakeSSHServer:
+    """One listening port per instance, accepted by a single thread."""
+
+    def __init__(self, instances: list[FakeOpenCLAW], host: str = "127.0.0.1"):
+        self.instances = instances
+        self.host = host
+        self.host_key = paramiko.ECDSAKey.generate()
+        self.connections = 0
+        self._selector = selectors.DefaultSelector()
+        self._transports: list[paramiko.Transport] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "FakeSSHServer":
+        for instance in self.instances:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind((self.host, instance.ssh_port or 0))
+            sock.listen(64)
+            sock.setblocking(False)
+            instance.ssh_port = sock.getsockname()[1]
+            self._selector.register(sock, selectors.EVENT_READ, instance)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._accept_loop, name="fake-ssh", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        for key in list(self._selector.get_map().values()):
+            self._selector.unregister(key.fileobj)
+            key.fileobj.close()
+        for transport in self._transports:
+            transport.close()
+        self._transports = []
+
+    def _accept_loop(self):
+        while not self._stop.is_set():
+            for key, _ in self._selector.select(timeout=ACCEPT_POLL_S):
+                try:
+                    conn, _ = key.fileobj.accept()
+                except BlockingIOError:
+                    continue
+                conn.setblocking(True)
+                self.connections += 1
+                transport = paramiko.Transport(conn)
+                transport.add_server_key(self.host_key)
+                # Negotiation runs on the transport's own thread
+                transport.start_server(event=threading.Event(), server=_StubServer(key.data))
+                self._transports = [t for t in self._transports if t.is_active()]
+                self._transports.append(transport)
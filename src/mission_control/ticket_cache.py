@@ -0,0 +1,222 @@
+import fcntl
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+from proxmoxer import AuthenticationError
+from proxmoxer.backends.https import ProxmoxHTTPAuth, ProxmoxHTTPAuthBase
+
+from .status_cache import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TICKET_PATH = CACHE_DIR / "tickets.json"
+CACHE_VERSION = 1
+# Proxmox tickets are valid for 2 hours; renew after one, like proxmoxer does
+TICKET_LIFETIME = 7200
+RENEW_AGE = 3600
+# Never start a request with a ticket this close to expiry
+EXPIRY_MARGIN = 60
+
+
+def ticket_key(host: str, port: int, user: str) -> str:
+    return f"{user}@{host}:{port}"
+
+
+@dataclass
+class Ticket:
+    ticket: str
+    csrf_token: str
+    # Wall clock, so ages compare across processes
+    issued_at: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.issued_at
+
+    @property
+    def expired(self) -> bool:
+        return self.age >= TICKET_LIFETIME - EXPIRY_MARGIN
+
+
+class TicketCache:
+    """Proxmox auth tickets on disk, keyed by user, host and port.
+
+    The file is private to the current user (mode 0600); a file anyone else can
+    read or write is ignored rather than trusted. Updates hold an flock, so
+    concurrent CLI runs and cron jobs don't drop each other's tickets.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or DEFAULT_TICKET_PATH)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _locked(self):
+        # The cache file itself is replaced on every update, so lock a sibling instead
+        self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        lock_path = self.path.with_name(self.path.name + ".lock")
+        with self._lock, open(os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)) as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def _load(self) -> dict[str, dict]:
+        try:
+            with open(self.path, "r") as f:
+                stat = os.fstat(f.fileno())
+                if stat.st_uid != os.getuid() or stat.st_mode & 0o077:
+                    logger.warning(
+                        f"Ignoring ticket cache {self.path}: it must be yours with mode 0600"
+                    )
+                    return {}
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable ticket cache {self.path}: {e}")
+            return {}
+        if data.get("version") != CACHE_VERSION:
+            return {}
+        return data.get("tickets", {})
+
+    def get(self, key: str) -> Optional[Ticket]:
+        entry = self._load().get(key)
+        if entry is None:
+            return None
+        try:
+            ticket = Ticket(**entry)
+        except TypeError:
+            return None
+        return None if ticket.expired else ticket
+
+    def put(self, key: str, ticket: Optional[Ticket]):
+        """Store ``ticket`` under ``key`` (None removes it), dropping expired entries."""
+        with self._locked():
+            now = time.time()
+            entries = {
+                k: v
+                for k, v in self._load().items()
+                if k != key and now - v.get("issued_at", 0) < TICKET_LIFETIME
+            }
+            if ticket is not None:
+                entries[key] = asdict(ticket)
+
+            # mkstemp creates the file with mode 0600
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=".tickets-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump({"version": CACHE_VERSION, "tickets": entries}, f)
+                os.replace(tmp, self.path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+
+    def invalidate(self, key: str):
+        self.put(key, None)
+
+
+class CachedTicketAuth(ProxmoxHTTPAuth):
+    """proxmoxer password auth that shares its ticket with other processes.
+
+    Starts from a cached ticket when one is fresh, so there is no login round
+    trip. The ticket is renewed once it is ``RENEW_AGE`` old, and a request
+    rejected with 401 logs in again and is resent once.
+    """
+
+    renew_age = RENEW_AGE
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        cache: TicketCache,
+        key: str,
+        base_url: str,
+        **kwargs,
+    ):
+        # ProxmoxHTTPAuth.__init__ logs in straight away; we do it lazily
+        ProxmoxHTTPAuthBase.__init__(self, **kwargs)
+        self.username = username
+        self.base_url = base_url
+        self.cache = cache
+        self.key = key
+        self._password = password
+        self._lock = threading.Lock()
+        self.pve_auth_ticket = ""
+        self.csrf_prevention_token = ""
+        self.issued_at = 0.0
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.issued_at
+
+    def _use(self, ticket: Ticket):
+        self.pve_auth_ticket = ticket.ticket
+        self.csrf_prevention_token = ticket.csrf_token
+        self.issued_at = ticket.issued_at
+
+    def _login(self):
+        # Another process may already have renewed it
+        cached = self.cache.get(self.key)
+        if cached is not None and cached.ticket != self.pve_auth_ticket:
+            self._use(cached)
+            if cached.age < self.renew_age:
+                return
+
+        renewed = False
+        if self.pve_auth_ticket and self.age < TICKET_LIFETIME - EXPIRY_MARGIN:
+            try:
+                self._get_new_tokens()
+                renewed = True
+            except AuthenticationError as e:
+                logger.debug(f"Ticket renewal for {self.key} refused: {e}")
+        if not renewed:
+            self._get_new_tokens(password=self._password)
+        self.issued_at = time.time()
+        logger.debug(f"Got new Proxmox ticket for {self.key}")
+        self.cache.put(
+            self.key, Ticket(self.pve_auth_ticket, self.csrf_prevention_token, self.issued_at)
+        )
+
+    def _apply(self, req):
+        # ProxmoxHttpSession picks the cookie before calling us, so it may be stale
+        req.headers.pop("Cookie", None)
+        req.prepare_cookies(self.get_cookies())
+        if req.method != "GET":
+            req.headers["CSRFPreventionToken"] = self.csrf_prevention_token
+        req.pve_ticket = self.pve_auth_ticket
+
+    def __call__(self, req):
+        with self._lock:
+            if not self.pve_auth_ticket or self.age >= self.renew_age:
+                self._login()
+            self._apply(req)
+        req.register_hook("response", self._handle_401)
+        return req
+
+    def _handle_401(self, r, **kwargs):
+        if r.status_code != 401 or getattr(r.request, "pve_retried", False):
+            return r
+        with self._lock:
+            if self.pve_auth_ticket == getattr(r.request, "pve_ticket", None):
+                logger.info(f"Proxmox ticket for {self.key} was rejected, logging in again")
+                self.cache.invalidate(self.key)
+                self.pve_auth_ticket = ""
+                self._login()
+            # Release the connection so the resend can reuse it
+            r.content
+            r.close()
+            prep = r.request.copy()
+            self._apply(prep)
+        prep.pve_retried = True
+        retried = r.connection.send(prep, **kwargs)
+        retried.history.append(r)
+        retried.request = prep
+        return retried
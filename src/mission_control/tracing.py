@@ -0,0 +1,226 @@
+"""Lightweight spans around backend calls, reported by the CLI ``--profile`` flag.
+
+Tracing is off by default: ``span()`` then returns a shared no-op context manager,
+so instrumented hot paths pay one global flag check.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+SERVICE_NAME = "openclaw-mgmt"
+
+_enabled = False
+_spans: list["Span"] = []
+_spans_lock = threading.Lock()
+_local = threading.local()
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    thread: str = ""
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    @property
+    def instance(self) -> Optional[str]:
+        return self.attributes.get("instance")
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+
+class _NoopSpan:
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+def _new_id(nbytes: int) -> str:
+    return os.urandom(nbytes).hex()
+
+
+def _stack() -> list[Span]:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+class _ActiveSpan:
+    def __init__(self, name: str, parent: Optional[Span], attributes: dict[str, Any]):
+        self.name = name
+        self.parent = parent
+        self.attributes = attributes
+        self.span: Optional[Span] = None
+
+    def __enter__(self) -> Span:
+        stack = _stack()
+        parent = self.parent or (stack[-1] if stack else None)
+        attributes = dict(self.attributes)
+        if parent is not None and "instance" not in attributes and parent.instance:
+            attributes["instance"] = parent.instance
+        self.span = Span(
+            name=self.name,
+            trace_id=parent.trace_id if parent else _new_id(16),
+            span_id=_new_id(8),
+            parent_id=parent.span_id if parent else None,
+            start_ns=time.time_ns(),
+            attributes=attributes,
+            thread=threading.current_thread().name,
+        )
+        stack.append(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        span = self.span
+        span.end_ns = time.time_ns()
+        if exc is not None:
+            span.error = f"{exc_type.__name__}: {exc}"
+        stack = _stack()
+        if stack and stack[-1] is span:
+            stack.pop()
+        with _spans_lock:
+            _spans.append(span)
+        return False
+
+
+def span(name: str, parent: Optional[Span] = None, **attributes):
+    """Time a block as a child of the current span (or of ``parent``, across threads)."""
+    if not _enabled:
+        return _NOOP
+    return _ActiveSpan(name, parent, attributes)
+
+
+def traced(name: str) -> Callable:
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _ActiveSpan(name, None, {}):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def current_span() -> Optional[Span]:
+    if not _enabled:
+        return None
+    stack = _stack()
+    return stack[-1] if stack else None
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset():
+    with _spans_lock:
+        _spans.clear()
+
+
+def collected_spans() -> list[Span]:
+    with _spans_lock:
+        return sorted(_spans, key=lambda s: s.start_ns)
+
+
+def slowest_spans(limit: int = 10) -> list[Span]:
+    return sorted(collected_spans(), key=lambda s: s.end_ns - s.start_ns, reverse=True)[:limit]
+
+
+def waterfalls() -> dict[str, list[tuple[int, Span]]]:
+    """Spans grouped by instance, in start order, each paired with its tree depth."""
+    spans = collected_spans()
+    by_id = {s.span_id: s for s in spans}
+    groups: dict[str, list[tuple[int, Span]]] = {}
+    for s in spans:
+        depth = 0
+        parent = by_id.get(s.parent_id) if s.parent_id else None
+        while parent is not None:
+            depth += 1
+            parent = by_id.get(parent.parent_id) if parent.parent_id else None
+        groups.setdefault(s.instance or "(global)", []).append((depth, s))
+    return groups
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(spans: Optional[list[Span]] = None) -> dict:
+    spans = collected_spans() if spans is None else spans
+    otlp_spans = []
+    for s in spans:
+        item = {
+            "traceId": s.trace_id,
+            "spanId": s.span_id,
+            "name": s.name,
+            "kind": 3,  # SPAN_KIND_CLIENT
+            "startTimeUnixNano": str(s.start_ns),
+            "endTimeUnixNano": str(s.end_ns),
+            "attributes": [
+                {"key": k, "value": _otlp_value(v)}
+                for k, v in {**s.attributes, "thread.name": s.thread}.items()
+            ],
+            "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+        }
+        if s.parent_id:
+            item["parentSpanId"] = s.parent_id
+        otlp_spans.append(item)
+
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]
+                },
+                "scopeSpans": [{"scope": {"name": "mission_control"}, "spans": otlp_spans}],
+            }
+        ]
+    }
+
+
+def export_otlp_json(path: str):
+    with open(path, "w") as f:
+        json.dump(to_otlp(), f, indent=2)
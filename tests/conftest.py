@@ -3,3 +3,27 @@ import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+_benchmark_rows: list[tuple] = []
+
+
+@pytest.fixture(scope="session")
+def benchmark_report():
+    return _benchmark_rows
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _benchmark_rows:
+        return
+    terminalreporter.section("benchmark")
+    terminalreporter.write_line(f"{'operation':<28}{'VMs':>6}{'API calls':>11}{'wall (ms)':>11}")
+    for operation, vms, calls, wall in _benchmark_rows:
+        terminalreporter.write_line(f"{operation:<28}{vms:>6}{calls:>11}{wall * 1000:>11.1f}")
+
+
+@pytest.fixture(autouse=True)
+def isolated_ticket_cache(tmp_path, monkeypatch):
+    # Keep password-auth tests from reading or writing the user's real ticket cache
+    monkeypatch.setattr(
+        "mission_control.ticket_cache.DEFAULT_TICKET_PATH", tmp_path / "tickets.json"
+    )
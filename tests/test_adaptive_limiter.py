@@ -0,0 +1,121 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from proxmoxer import ResourceException
+from mission_control import adaptive_limiter
+from mission_control.adaptive_limiter import AdaptiveLimiter, shared_limiter
+from mission_control.federation import ProxmoxFederation
+from mission_control.proxmox_client import ProxmoxClient, is_overload
+from mission_control.testing import FakeProxmoxCluster, FakeProxmoxServer
+
+
+def record(limiter: AdaptiveLimiter, latency: float, times: int = 1):
+    for _ in range(times):
+        limiter.acquire()
+        limiter.release(time.monotonic() - latency)
+
+
+class TestAdaptiveLimiter:
+    def test_grows_while_latency_is_flat(self):
+        limiter = AdaptiveLimiter("test", "grow", initial=2, max_limit=8)
+
+        def call(_):
+            with limiter.slot():
+                time.sleep(0.005)
+
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(call, range(200)))
+
+        assert limiter.limit == 8
+        assert limiter.peak_queued > 0
+        assert limiter.drops == 0
+
+    def test_latency_rise_cuts_limit(self):
+        limiter = AdaptiveLimiter("test", "latency", initial=8, max_limit=8)
+        record(limiter, 0.01, times=20)
+
+        record(limiter, 0.2, times=3)
+
+        assert limiter.limit < 8
+        assert limiter.decreases >= 1
+
+    def test_only_overload_errors_cut_limit(self):
+        limiter = AdaptiveLimiter(
+            "test", "errors", initial=8, is_overload=lambda e: isinstance(e, TimeoutError)
+        )
+
+        with pytest.raises(ValueError), limiter.slot():
+            raise ValueError("VM not found")
+        assert limiter.limit == 8
+
+        with pytest.raises(TimeoutError), limiter.slot():
+            raise TimeoutError()
+        assert limiter.limit == pytest.approx(8 * adaptive_limiter.DEFAULT_BACKOFF)
+        assert (limiter.calls, limiter.drops, limiter.in_flight) == (2, 1, 0)
+
+    def test_queue_depth(self):
+        limiter = AdaptiveLimiter("test", "queue", initial=1, max_limit=1)
+        started = limiter.acquire()
+        waiter = threading.Thread(target=lambda: record(limiter, 0))
+        waiter.start()
+        time.sleep(0.05)
+
+        assert limiter.queued == 1
+
+        limiter.release(started)
+        waiter.join(timeout=1)
+        assert limiter.queued == 0 and limiter.calls == 2
+
+    def test_shared_limiter_is_registered_once(self):
+        first = shared_limiter("test", "shared", initial=3)
+
+        assert shared_limiter("test", "shared", initial=5) is first
+        assert first in adaptive_limiter.limiters()
+
+    def test_shared_limiter_takes_the_latest_ceiling(self):
+        limiter = shared_limiter("test", "ceiling", initial=8, max_limit=16)
+
+        assert shared_limiter("test", "ceiling", initial=1, max_limit=4) is limiter
+        assert (limiter.max_limit, limiter.limit) == (4, 4)
+        shared_limiter("test", "ceiling", max_limit=32)
+        # Raising the ceiling leaves the limit to grow into it
+        assert (limiter.max_limit, limiter.limit) == (32, 4)
+
+
+class TestProxmoxLimiter:
+    def test_overload_classification(self):
+        assert is_overload(ResourceException(503, "Service Unavailable", ""))
+        assert is_overload(ResourceException(596, "Connection timed out", ""))
+        assert not is_overload(ResourceException(500, "Internal Server Error", "no such VM"))
+
+    def test_slow_pveproxy_lowers_limit(self):
+        with FakeProxmoxServer(FakeProxmoxCluster.build(2, seed=1), latency=0.01) as server:
+            client = ProxmoxClient(server.proxmox_config(max_concurrency=8))
+            for _ in range(10):
+                client.get_cluster_resources()
+            assert client._limit.limit == 4
+
+            server.latency = 0.15
+            for _ in range(4):
+                client.get_cluster_resources()
+
+        assert client._limit.limit < 4
+
+    def test_clients_of_one_endpoint_share_a_limiter(self):
+        with FakeProxmoxServer(FakeProxmoxCluster.build(1, seed=1)) as server:
+            first = ProxmoxClient(server.proxmox_config(max_concurrency=8))
+            second = ProxmoxClient(server.proxmox_config(max_concurrency=8))
+            target = f"{server.host}:{server.port}"
+
+        assert first._limit is second._limit
+        assert shared_limiter("proxmox", target) is first._limit
+
+    def test_reload_with_lower_ceiling_applies(self):
+        with FakeProxmoxServer(FakeProxmoxCluster.build(1, seed=1)) as server:
+            federation = ProxmoxFederation({"default": server.proxmox_config(max_concurrency=16)})
+            federation.update({"default": server.proxmox_config(max_concurrency=2)})
+            limiter = federation.client()._limit
+
+        assert limiter.max_limit == 2
+        assert limiter.limit == 2
@@ -0,0 +1,172 @@
+import time
+import numpy as np
+import pytest
+from unittest.mock import patch
+from mission_control.anomaly import AnomalyDetector
+from mission_control.dashboard import FleetWatcher
+from mission_control.health_checker import HealthResult
+from mission_control.manager import InstanceManager, vm_usage
+from mission_control.models import Config, InstanceType, OpenCLAWInstance
+
+FLEET_SIZE = 50
+
+
+class Fleet:
+    """Instances whose samples follow a steady baseline plus noise, overridable per sweep."""
+
+    def __init__(self, size: int = FLEET_SIZE, seed: int = 1):
+        self.rng = np.random.default_rng(seed)
+        self.instances = [
+            OpenCLAWInstance(name=f"oc-{i}", host=f"10.0.0.{i}", health_check_passed=True)
+            for i in range(size)
+        ]
+        self.latency = self.rng.uniform(15, 25, size)
+        self.cpu = np.full(size, 0.2)
+        self.memory = np.full(size, 0.5)
+
+    def remove(self, index: int):
+        del self.instances[index]
+        self.latency, self.cpu, self.memory = (
+            np.delete(a, index) for a in (self.latency, self.cpu, self.memory)
+        )
+
+    def sweep(self, detector: AnomalyDetector, times: int = 1):
+        size = len(self.instances)
+        for _ in range(times):
+            latency = self.latency + self.rng.normal(0, 1, size)
+            cpu = self.cpu + self.rng.normal(0, 0.02, size)
+            memory = self.memory + self.rng.normal(0, 0.005, size)
+            for i, instance in enumerate(self.instances):
+                instance.response_time_ms = float(latency[i])
+                instance.cpu_usage = float(cpu[i])
+                instance.memory_usage = float(memory[i])
+            found = detector.observe(self.instances)
+        return found
+
+
+def kinds(found, name: str) -> set[tuple[str, str]]:
+    return {(a.metric, a.kind) for a in found if a.instance == name}
+
+
+class TestAnomalyDetector:
+    def test_quiet_fleet_raises_nothing(self):
+        fleet, detector = Fleet(size=500), AnomalyDetector()
+
+        found = [a for _ in range(80) for a in fleet.sweep(detector)]
+
+        assert found == []
+
+    def test_latency_spike(self):
+        fleet, detector = Fleet(), AnomalyDetector()
+        fleet.sweep(detector, times=20)
+
+        fleet.latency[3] += 60
+        found = fleet.sweep(detector)
+        fleet.latency[3] -= 60
+
+        assert kinds(found, "oc-3") == {("latency_ms", "spike")}
+        assert {a.instance for a in found} == {"oc-3"}
+        assert found[0].value > found[0].baseline + 50
+
+    def test_level_shift_located(self):
+        fleet, detector = Fleet(), AnomalyDetector()
+        fleet.sweep(detector, times=30)
+
+        fleet.cpu[7] = 0.45
+        found = fleet.sweep(detector, times=8)
+
+        (shift,) = [a for a in found if a.kind == "shift"]
+        assert (shift.instance, shift.metric, shift.sweeps_ago) == ("oc-7", "cpu", 8)
+        assert shift.value == pytest.approx(0.45, abs=0.03)
+        assert shift.baseline == pytest.approx(0.2, abs=0.03)
+
+    def test_instance_drifting_from_fleet(self):
+        fleet, detector = Fleet(), AnomalyDetector()
+        fleet.memory[11] = 0.9
+
+        found = fleet.sweep(detector, times=20)
+
+        assert kinds(found, "oc-11") == {("memory", "fleet")}
+        assert {a.instance for a in found} == {"oc-11"}
+        assert "above fleet" in detector.summary("oc-11")
+
+    def test_failed_probes_and_missing_data_are_gaps(self):
+        fleet, detector = Fleet(), AnomalyDetector()
+        fleet.sweep(detector, times=20)
+        fleet.instances[0].health_check_passed = False
+        fleet.instances[1].cpu_usage = None
+
+        # A timed-out probe is not a latency spike
+        fleet.latency[0] = 10_000
+        found = detector.observe(fleet.instances)
+
+        assert found == []
+        assert np.isnan(detector.history()[0, 0, -1])
+
+    def test_removed_instances_dropped_after_window(self):
+        fleet, detector = Fleet(size=10), AnomalyDetector(window=10)
+        fleet.sweep(detector, times=5)
+        fleet.remove(4)
+
+        fleet.sweep(detector, times=9)
+        assert "oc-4" in detector.names
+        fleet.sweep(detector)
+        assert "oc-4" not in detector.names
+        assert detector.values.shape[1] == 9
+
+    def test_thousands_of_instances_in_milliseconds(self):
+        fleet, detector = Fleet(size=2000), AnomalyDetector()
+        fleet.sweep(detector, times=60)
+
+        started = time.perf_counter()
+        fleet.sweep(detector)
+        elapsed = time.perf_counter() - started
+
+        assert detector.last_analysis_ms < 250
+        assert elapsed < 0.5
+
+
+class TestSweepIntegration:
+    def test_vm_usage(self):
+        vm = {"status": "running", "cpu": 0.25, "memory": 512, "maxmem": 2048}
+
+        assert vm_usage(vm) == (0.25, 0.25)
+        assert vm_usage({**vm, "status": "stopped"}) == (None, None)
+        assert vm_usage(None) == (None, None)
+
+    @patch("mission_control.manager.HealthChecker.check")
+    def test_full_sweeps_feed_the_detector(self, mock_health):
+        mock_health.return_value = HealthResult(True, "1.0", 1.0)
+        instances = [
+            OpenCLAWInstance(name=f"oc-{i}", host="h", type=InstanceType.DOCKER) for i in range(3)
+        ]
+        detector = AnomalyDetector()
+        manager = InstanceManager(Config(openclaw_instances=instances), anomaly_detector=detector)
+
+        manager.update_all_instance_statuses()
+        list(manager.iter_instance_statuses(instances[:1]))
+
+        assert detector.sweeps == 1
+        assert detector.names == ["oc-0", "oc-1", "oc-2"]
+
+    @patch("mission_control.manager.HealthChecker.check")
+    def test_watch_shows_anomalies(self, mock_health):
+        mock_health.return_value = HealthResult(True, "1.0", 1.0)
+        fleet = Fleet(size=10)
+        detector = AnomalyDetector()
+        fleet.sweep(detector, times=20)
+        fleet.instances[2].memory_usage = 0.99
+        detector.observe(fleet.instances)
+        manager = InstanceManager(
+            Config(openclaw_instances=fleet.instances), anomaly_detector=detector
+        )
+        watcher = FleetWatcher(manager)
+
+        for instance in fleet.instances:
+            watcher.observe(instance)
+        table = watcher.build_table()
+
+        assert table.columns[-1].header == "Anomaly"
+        assert "memory spike up" in watcher._rows["oc-2"][1][-1]
+        assert watcher._rows["oc-1"][1][-1] == ""
+        assert "1 anomalous" in table.title
@@ -0,0 +1,84 @@
+import time
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from mission_control.capacity import FleetMetrics, RRDFetcher, analyze_capacity, fleet_summary
+from mission_control.proxmox_client import ProxmoxClient
+from mission_control.testing import FakeProxmoxCluster, FakeProxmoxServer
+
+GIB = 1024**3
+
+
+def series(cpu, mem, maxcpu=2, maxmem=2 * GIB, start=0):
+    return [
+        {"time": start + i * 60, "cpu": c, "mem": m, "maxcpu": maxcpu, "maxmem": maxmem}
+        for i, (c, m) in enumerate(zip(cpu, mem))
+    ]
+
+
+class TestAnalyzeCapacity:
+    def test_recommendations(self):
+        metrics = FleetMetrics.from_series(
+            {
+                # Mostly idle on 4 vCPUs / 8 GiB -> downsize
+                100: series([0.05] * 20, [1 * GIB] * 20, maxcpu=4, maxmem=8 * GIB),
+                # Pegged on 2 vCPUs -> upsize
+                101: series([0.95] * 20, [1.9 * GIB] * 20),
+                # Stopped: no samples
+                102: [{"time": 0, "maxcpu": 2}],
+            },
+            errors={},
+        )
+
+        by_vmid = {r.vmid: r for r in analyze_capacity(metrics, target_utilization=0.7)}
+
+        assert by_vmid[100].action == "downsize"
+        assert by_vmid[100].recommended_cpus == 1
+        assert by_vmid[100].cpu_headroom == pytest.approx(0.95)
+        assert by_vmid[101].action == "upsize"
+        assert by_vmid[101].recommended_cpus == 3
+        assert by_vmid[101].recommended_memory > 2 * GIB
+        assert by_vmid[102].action == "no data"
+        assert by_vmid[102].cpu_peak is None
+
+    def test_series_aligned_on_shared_time_axis(self):
+        metrics = FleetMetrics.from_series(
+            {100: series([0.1, 0.2], [GIB, GIB]), 101: series([0.3], [GIB], start=60)},
+            errors={},
+        )
+
+        assert metrics.cpu.shape == (2, 2)
+        assert np.isnan(metrics.cpu[1, 0])
+        assert metrics.cpu[1, 1] == pytest.approx(0.3)
+
+    def test_fleet_summary(self):
+        metrics = FleetMetrics.from_series(
+            {100: series([0.05] * 5, [GIB] * 5, maxcpu=4)}, errors={}
+        )
+
+        summary = fleet_summary(analyze_capacity(metrics))
+
+        assert summary["allocated_cpus"] == 4
+        assert summary["recommended_cpus"] == 1
+        assert summary["downsize"] == 1
+
+
+@pytest.mark.benchmark
+def test_fleet_capacity_500_vms_week(benchmark_report):
+    cluster = FakeProxmoxCluster.build(500, node_count=4, seed=3)
+    with FakeProxmoxServer(cluster) as server:
+        client = ProxmoxClient(server.proxmox_config())
+        client.connect()
+        server.reset_stats()
+
+        started = time.perf_counter()
+        metrics = RRDFetcher(client).fetch([vm.vmid for vm in cluster.all_vms()], "week")
+        recommendations = analyze_capacity(metrics)
+        wall = time.perf_counter() - started
+
+    benchmark_report.append(("capacity fetch+analyze", 500, server.total_calls, wall))
+    assert metrics.cpu.shape[0] == 500
+    assert len(recommendations) == 500
+    assert server.total_calls == 501
+    assert not metrics.errors
@@ -0,0 +1,161 @@
+import json
+import socket
+from dataclasses import asdict
+import pytest
+import yaml
+from typer.testing import CliRunner
+from mission_control import cli
+from mission_control.models import Config, InstanceStatus
+from mission_control.status_cache import StatusCache
+from mission_control.testing import (
+    FakeFleet,
+    FakeFleetServer,
+    FakeProxmoxCluster,
+    FakeProxmoxServer,
+)
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def fleet_server():
+    with FakeFleetServer(FakeFleet.build(3), seed=1) as server:
+        yield server
+
+
+@pytest.fixture
+def cache_path(tmp_path, monkeypatch):
+    path = tmp_path / "status.json"
+    monkeypatch.setattr("mission_control.status_cache.DEFAULT_CACHE_PATH", path)
+    return path
+
+
+class TestStatusMaxAge:
+    def test_serves_cache_and_revalidates_stale_in_foreground(
+        self, fleet_server, cache_path, tmp_path, mocker
+    ):
+        config_path = tmp_path / "config.yaml"
+        fleet_server.write_config(str(config_path))
+        fresh, stale, missing = Config.from_yaml(str(config_path)).openclaw_instances
+        for instance in (fresh, stale):
+            instance.status = InstanceStatus.RUNNING
+            instance.health_check_passed = True
+            instance.version = "0.9.0"
+            instance.last_health_check = "2026-01-01T00:00:00"
+        StatusCache(cache_path).save([fresh, stale])
+        data = json.loads(cache_path.read_text())
+        data["instances"][stale.name]["checked_at"] -= 3600
+        cache_path.write_text(json.dumps(data))
+        # No fork: the stale instance is revalidated before the command returns
+        mocker.patch("mission_control.cli.os.fork", side_effect=OSError("no fork"))
+
+        result = runner.invoke(
+            cli.app, ["status", "-c", str(config_path), "--max-age", "30s", "-o", "json"]
+        )
+
+        assert result.exit_code == 0, result.output
+        records = {r["name"]: r for r in json.loads(result.stdout)}
+        assert records[fresh.name]["stale"] is False
+        assert records[fresh.name]["version"] == "0.9.0"
+        assert records[stale.name]["stale"] is True
+        assert records[stale.name]["cache_age_s"] >= 3600
+        assert records[missing.name]["stale"] is False
+        assert records[missing.name]["cache_age_s"] == 0.0
+        assert records[missing.name]["version"] == "1.0.0"
+        # The missing instance was probed before output, the stale one after; not the fresh one
+        assert [sim.requests for sim in fleet_server.fleet.instances] == [0, 1, 1]
+        entries = StatusCache(cache_path).load()
+        assert entries[stale.name]["version"] == "1.0.0"
+        assert entries[fresh.name]["version"] == "0.9.0"
+
+    def test_invalid_max_age(self, fleet_server, cache_path, tmp_path):
+        config_path = tmp_path / "config.yaml"
+        fleet_server.write_config(str(config_path))
+
+        result = runner.invoke(cli.app, ["status", "-c", str(config_path), "--max-age", "soon"])
+
+        assert result.exit_code == 1
+        assert "Invalid duration 'soon'" in result.output
+
+
+class TestProxmoxStatus:
+    def test_unavailable_cluster_reported_on_stderr(self, tmp_path):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            closed_port = sock.getsockname()[1]
+        with FakeProxmoxServer(FakeProxmoxCluster.build(2, seed=1)) as server:
+            clusters = {
+                "up": asdict(server.proxmox_config()),
+                "down": {
+                    "host": "127.0.0.1",
+                    "port": closed_port,
+                    "token_id": "t",
+                    "token_secret": "s",
+                    "verify_ssl": False,
+                },
+            }
+            config_path = tmp_path / "config.yaml"
+            config_path.write_text(yaml.safe_dump({"proxmox_clusters": clusters}))
+
+            result = runner.invoke(
+                cli.app, ["proxmox-status", "-c", str(config_path), "-o", "json", "--timeout", "5"]
+            )
+
+        assert {vm["cluster"] for vm in json.loads(result.stdout)} == {"up"}
+        assert "Cluster 'down' unavailable" in result.stderr
+
+
+@pytest.fixture
+def proxmox_server():
+    cluster = FakeProxmoxCluster.build(5, node_count=2, seed=1)
+    cluster.find(100).template = True
+    with FakeProxmoxServer(cluster) as server:
+        yield server
+
+
+class TestClone:
+    def write_config(self, path, server):
+        path.write_text(
+            "# fleet\n"
+            + yaml.safe_dump(
+                {"proxmox": asdict(server.proxmox_config()), "openclaw_instances": []},
+                sort_keys=False,
+            )
+        )
+
+    def test_json_output_is_clean_and_unstarted_clones_not_registered(
+        self, proxmox_server, tmp_path
+    ):
+        config_path = tmp_path / "config.yaml"
+        self.write_config(config_path, proxmox_server)
+        before = config_path.read_text()
+
+        result = runner.invoke(
+            cli.app,
+            ["clone", "100", "-n", "2", "--storage", "local", "-o", "json", "-c", str(config_path)],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert [r["name"] for r in json.loads(result.stdout)] == [
+            "openclaw-test-01",
+            "openclaw-test-02",
+        ]
+        assert "--storage only applies to full clones" in result.stderr
+        # Registering is opt-in without --start, so there is nothing to warn about either
+        assert "no IP address" not in result.stderr
+        assert config_path.read_text() == before
+
+    def test_started_clones_registered_by_default(self, proxmox_server, tmp_path):
+        config_path = tmp_path / "config.yaml"
+        self.write_config(config_path, proxmox_server)
+
+        result = runner.invoke(
+            cli.app, ["clone", "100", "-n", "2", "--start", "-o", "ndjson", "-c", str(config_path)]
+        )
+
+        assert result.exit_code == 0, result.output
+        assert len([json.loads(line) for line in result.stdout.splitlines()]) == 2
+        assert "Registered 2 instance(s)" in result.stderr
+        assert config_path.read_text().startswith("# fleet\n")
+        instances = Config.from_yaml(str(config_path)).openclaw_instances
+        assert [i.name for i in instances] == ["openclaw-test-01", "openclaw-test-02"]
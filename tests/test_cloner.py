@@ -0,0 +1,160 @@
+import time
+import pytest
+import yaml
+from mission_control.cloner import (
+    CloneEngine,
+    allocate_vmids,
+    instances_from_clones,
+    parse_storage_limits,
+    register_instances,
+)
+from mission_control.models import Config, OpenCLAWInstance
+from mission_control.proxmox_client import ProxmoxClient
+from mission_control.testing import FakeProxmoxCluster, FakeProxmoxServer
+from mission_control.testing.fake_proxmox import FakeVM
+
+CLONE_SECONDS = 0.3
+
+
+def max_overlap(results) -> int:
+    events = sorted(
+        [(r.started_s, 1) for r in results] + [(r.finished_s, -1) for r in results],
+        key=lambda e: (e[0], e[1]),
+    )
+    running = peak = 0
+    for _, delta in events:
+        running += delta
+        peak = max(peak, running)
+    return peak
+
+
+@pytest.fixture
+def server():
+    cluster = FakeProxmoxCluster.build(5, node_count=2, seed=1)
+    cluster.clone_duration = CLONE_SECONDS
+    cluster.find(100).template = True
+    with FakeProxmoxServer(cluster) as server:
+        yield server
+
+
+@pytest.fixture
+def engine(server):
+    return CloneEngine(ProxmoxClient(server.proxmox_config()), poll_interval=0.02)
+
+
+class TestHelpers:
+    def test_allocate_vmids_skips_used(self):
+        assert allocate_vmids({100, 101, 103}, 3) == [102, 104, 105]
+
+    def test_parse_storage_limits(self):
+        assert parse_storage_limits(["local-lvm=4", "ceph"], 2) == {"local-lvm": 4, "ceph": 2}
+        with pytest.raises(ValueError):
+            parse_storage_limits(["ceph=x"], 2)
+
+
+class TestCloneEngine:
+    def test_parallel_clones_from_template(self, server, engine):
+        plans = engine.plan(
+            "100", 20, "test", nodes=["pve1", "pve2"], storages=["local-lvm", "ceph"]
+        )
+        engine.storage_limits = {"local-lvm": 5, "ceph": 5}
+
+        started = time.monotonic()
+        results = engine.run(plans, full=True)
+        elapsed = time.monotonic() - started
+
+        assert all(r.success for r in results), [r.error for r in results]
+        vmids = [r.plan.vmid for r in results]
+        assert len(set(vmids)) == 20 and min(vmids) == 105
+        # 10 slots for 20 clones: two waves, where serial cloning would take 20
+        assert elapsed < 20 * CLONE_SECONDS / 3
+        assert max_overlap(results) == 10
+        assert {server.cluster.find(v).node for v in vmids} == {"pve1", "pve2"}
+        assert server.cluster.find(vmids[1]).storage == "ceph"
+
+    def test_storage_limit_respected(self, engine):
+        engine.default_storage_limit = 2
+        plans = engine.plan("100", 4, "test")
+
+        results = engine.run(plans)
+
+        assert all(r.success for r in results)
+        assert max_overlap(results) == 2
+
+    def test_plain_vm_source_is_serialized(self, engine):
+        plans = engine.plan("openclaw-101", 2, "test")
+
+        results = engine.run(plans, full=True)
+
+        assert all(r.success for r in results), [r.error for r in results]
+        assert max_overlap(results) == 1
+
+    def test_vmid_taken_after_planning(self, server, engine):
+        plans = engine.plan("100", 1, "test")
+        server.cluster.nodes["pve1"][105] = FakeVM(vmid=105, name="intruder", node="pve1")
+
+        results = engine.run(plans)
+
+        assert results[0].success
+        assert results[0].plan.vmid == 106
+
+    def test_start_and_register(self, server, engine, tmp_path):
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(yaml.safe_dump({"openclaw_instances": []}))
+        base = OpenCLAWInstance(name="golden", host="10.0.0.1", user="nosrc", openclaw_port=18789)
+        plans = engine.plan("100", 2, "test")
+
+        results = engine.run(plans, start=True)
+        engine.wait_for_addresses(results, timeout=5)
+        register_instances(str(config_path), instances_from_clones(results, base))
+
+        instances = Config.from_yaml(str(config_path)).openclaw_instances
+        assert [(i.name, i.vm_id, i.host) for i in instances] == [
+            ("test-01", 105, "10.0.0.105"),
+            ("test-02", 106, "10.0.0.106"),
+        ]
+        assert instances[0].user == "nosrc" and instances[0].openclaw_port == 18789
+
+    def test_unstarted_clones_not_registered(self, engine):
+        results = engine.run(engine.plan("100", 2, "test"))
+
+        assert all(r.success for r in results)
+        assert instances_from_clones(results) == []
+
+
+class TestRegisterInstances:
+    def test_keeps_comments_and_following_sections(self, tmp_path):
+        config_path = tmp_path / "config.yaml"
+        original = (
+            "# Fleet\n"
+            "openclaw_instances:  # managed instances\n"
+            "    - name: golden   # template\n"
+            "      host: 10.0.0.1\n"
+            "\n"
+            "# Monitoring\n"
+            "monitoring:\n"
+            "  check_interval: 60\n"
+        )
+        config_path.write_text(original)
+        clone = OpenCLAWInstance(name="test-01", host="10.0.0.105", vm_id=105, cluster="lab")
+
+        register_instances(str(config_path), [clone])
+
+        text = config_path.read_text()
+        assert text.startswith(original.split("\n\n")[0] + "\n    - name: test-01\n")
+        assert text.endswith("\n\n# Monitoring\nmonitoring:\n  check_interval: 60\n")
+        config = Config.from_yaml(str(config_path))
+        assert [(i.name, i.host, i.cluster) for i in config.openclaw_instances] == [
+            ("golden", "10.0.0.1", None),
+            ("test-01", "10.0.0.105", "lab"),
+        ]
+        assert yaml.safe_load(text)["monitoring"] == {"check_interval": 60}
+
+    def test_flow_list_left_alone(self, tmp_path):
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text("openclaw_instances: [{name: a, host: b}]\n")
+
+        with pytest.raises(ValueError):
+            register_instances(str(config_path), [OpenCLAWInstance(name="c", host="d")])
+
+        assert config_path.read_text() == "openclaw_instances: [{name: a, host: b}]\n"
@@ -0,0 +1,130 @@
+import threading
+import time
+import pytest
+import yaml
+from unittest.mock import patch
+from mission_control.config_watcher import ConfigWatcher, diff_instances
+from mission_control.health_checker import HealthResult
+from mission_control.manager import InstanceManager
+from mission_control.models import Config, OpenCLAWInstance, InstanceType, InstanceStatus
+
+
+def make_instances(*specs):
+    return [
+        OpenCLAWInstance(name=name, host=host, type=InstanceType.DOCKER) for name, host in specs
+    ]
+
+
+def write_config(path, instances):
+    path.write_text(
+        yaml.safe_dump(
+            {
+                "openclaw_instances": [
+                    {"name": name, "host": host, "type": "docker"} for name, host in instances
+                ]
+            }
+        )
+    )
+
+
+class TestDiffInstances:
+    def test_diff_by_name_and_identity(self):
+        old = make_instances(("keep", "10.0.0.1"), ("move", "10.0.0.2"), ("drop", "10.0.0.3"))
+        new = make_instances(("keep", "10.0.0.1"), ("move", "10.0.0.9"), ("add", "10.0.0.4"))
+
+        diff = diff_instances(old, new)
+
+        assert [i.name for i in diff.added] == ["add"]
+        assert [i.name for i in diff.removed] == ["drop"]
+        assert [(o.host, n.host) for o, n in diff.changed] == [("10.0.0.2", "10.0.0.9")]
+        assert [o.name for o, _ in diff.unchanged] == ["keep"]
+        assert diff.has_changes
+
+
+class TestApplyConfig:
+    @patch("mission_control.manager.HealthChecker.check")
+    def test_apply_config_keeps_unchanged_state(self, mock_health):
+        mock_health.return_value = HealthResult(True, "2.0.0", 1.0)
+        manager = InstanceManager(
+            Config(openclaw_instances=make_instances(("keep", "10.0.0.1"), ("drop", "10.0.0.3")))
+        )
+        kept = manager.get_instance_by_name("keep")
+        kept.status = InstanceStatus.RUNNING
+        kept.version = "1.0.0"
+
+        with patch.object(manager.ssh_pool, "close") as mock_close:
+            diff = manager.apply_config(
+                Config(openclaw_instances=make_instances(("keep", "10.0.0.1"), ("add", "10.0.0.4")))
+            )
+
+        assert manager.get_instance_by_name("keep") is kept
+        assert kept.version == "1.0.0"
+        assert manager.get_instance_by_name("drop") is None
+        assert manager.get_instance_by_name("add").version == "2.0.0"
+        assert mock_close.call_args[0][0].name == "drop"
+        assert mock_health.call_count == 1
+        assert [i.name for i in diff.added] == ["add"]
+
+
+class TestConfigWatcher:
+    def test_check_reloads_on_change(self, tmp_path):
+        path = tmp_path / "config.yaml"
+        write_config(path, [("a", "10.0.0.1")])
+        seen = []
+        watcher = ConfigWatcher(str(path), seen.append)
+
+        assert watcher.check() is False
+        write_config(path, [("a", "10.0.0.1"), ("b", "10.0.0.2")])
+        assert watcher.check() is True
+
+        assert [i.name for i in seen[0].openclaw_instances] == ["a", "b"]
+
+    def test_invalid_config_is_ignored(self, tmp_path):
+        path = tmp_path / "config.yaml"
+        write_config(path, [("a", "10.0.0.1")])
+        seen = []
+        watcher = ConfigWatcher(str(path), seen.append)
+
+        path.write_text("openclaw_instances: [{name: broken}]\n")
+
+        assert watcher.check() is False
+        assert seen == []
+
+    @pytest.mark.parametrize("use_inotify", [True, False])
+    def test_background_watch(self, tmp_path, use_inotify):
+        path = tmp_path / "config.yaml"
+        write_config(path, [("a", "10.0.0.1")])
+        reloaded = threading.Event()
+        watcher = ConfigWatcher(
+            str(path), lambda cfg: reloaded.set(), poll_interval=0.05, use_inotify=use_inotify
+        )
+
+        watcher.start()
+        try:
+            write_config(path, [("a", "10.0.0.1"), ("b", "10.0.0.2")])
+            assert reloaded.wait(5)
+        finally:
+            watcher.stop()
+
+    def test_inotify_waits_for_in_place_write_to_finish(self, tmp_path):
+        path = tmp_path / "config.yaml"
+        write_config(path, [("a", "10.0.0.1"), ("b", "10.0.0.2")])
+        seen = []
+        watcher = ConfigWatcher(str(path), seen.append, poll_interval=0.05)
+
+        watcher.start()
+        try:
+            with open(path, "w") as f:
+                # A prefix of the new file that still parses
+                f.write("openclaw_instances:\n- {name: a, host: 10.0.0.1, type: docker}\n")
+                f.flush()
+                time.sleep(0.3)
+                assert seen == []
+                f.write("- {name: b, host: 10.0.0.9, type: docker}\n")
+            wait = time.monotonic() + 5
+            while not seen and time.monotonic() < wait:
+                time.sleep(0.05)
+        finally:
+            watcher.stop()
+
+        assert [[i.host for i in c.openclaw_instances] for c in seen] == [["10.0.0.1", "10.0.0.9"]]
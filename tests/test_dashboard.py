@@ -0,0 +1,84 @@
+import pytest
+from unittest.mock import patch
+from mission_control.dashboard import LATENCY_COLUMN, FleetWatcher
+from mission_control.health_checker import HealthResult
+from mission_control.manager import InstanceManager
+from mission_control.models import Config, OpenCLAWInstance, InstanceType, InstanceStatus
+
+
+@pytest.fixture
+def manager():
+    return InstanceManager(
+        Config(
+            openclaw_instances=[
+                OpenCLAWInstance(name="b-docker", host="10.0.0.2", type=InstanceType.DOCKER),
+                OpenCLAWInstance(name="a-vm", host="10.0.0.1", type=InstanceType.PROXMOX),
+                OpenCLAWInstance(name="c-local", host="10.0.0.3", type=InstanceType.LOCAL),
+            ]
+        )
+    )
+
+
+class TestFleetWatcher:
+    def test_observe_only_marks_changed_rows(self, manager):
+        watcher = FleetWatcher(manager)
+        instance = manager.get_instance_by_name("a-vm")
+        instance.response_time_ms = 12.2
+
+        assert watcher.observe(instance) is True
+        instance.response_time_ms = 17.9
+        assert watcher.observe(instance) is False
+        instance.status = InstanceStatus.RUNNING
+        assert watcher.observe(instance) is True
+        instance.response_time_ms = 95.0
+        assert watcher.observe(instance) is True
+        instance.response_time_ms = 110.0
+        assert watcher.observe(instance) is False
+        assert watcher.rows_rendered == 3
+
+    @patch("mission_control.manager.HealthChecker.check")
+    def test_sweep_renders_each_row_once_when_stable(self, mock_health, manager):
+        jitter = iter([1.0, 4.0, 2.0, 6.0, 3.0, 1.0])
+        mock_health.side_effect = lambda instance: HealthResult(True, "1.0.0", next(jitter))
+        watcher = FleetWatcher(manager)
+
+        watcher.sweep()
+        watcher.sweep()
+
+        assert watcher.sweeps == 2
+        assert watcher.rows_rendered == 3
+
+    def test_sort_and_filter(self, manager):
+        for i, instance in enumerate(manager.get_all_instances()):
+            instance.response_time_ms = [30.0, 5.0, 120.0][i]
+
+        watcher = FleetWatcher(manager, sort="latency", reverse=True)
+        assert [i.name for i in watcher.visible_instances()] == ["c-local", "b-docker", "a-vm"]
+
+        watcher = FleetWatcher(manager, type_filter=InstanceType.DOCKER)
+        assert [i.name for i in watcher.visible_instances()] == ["b-docker"]
+
+        watcher = FleetWatcher(manager, slower_than=25)
+        assert [i.name for i in watcher.visible_instances()] == ["b-docker", "c-local"]
+
+    def test_latency_cell_is_current_without_a_rerender(self, manager):
+        watcher = FleetWatcher(manager, sort="latency")
+        for i, instance in enumerate(manager.get_all_instances()):
+            instance.response_time_ms = [3.0, 12.0, 7.0][i]
+            watcher.observe(instance)
+        # Same band, so no row is re-rendered, but the order changes
+        manager.get_instance_by_name("b-docker").response_time_ms = 1.0
+
+        column = watcher.build_table().columns[LATENCY_COLUMN]
+
+        assert watcher.rows_rendered == 3
+        assert list(column.cells) == ["1", "7", "12"]
+
+    def test_build_table_limits_rows(self, manager):
+        table = FleetWatcher(manager).build_table(max_rows=2)
+
+        assert table.row_count == 2
+
+    def test_unknown_sort_key(self, manager):
+        with pytest.raises(ValueError):
+            FleetWatcher(manager, sort="uptime")
@@ -0,0 +1,103 @@
+import hashlib
+import pytest
+from unittest.mock import MagicMock
+from mission_control.deployer import Deployer, hash_bundle, parse_size
+from mission_control.models import OpenCLAWInstance, InstanceType
+
+
+@pytest.fixture
+def bundle(tmp_path):
+    (tmp_path / "docker-compose.yml").write_text("services: {}\n")
+    (tmp_path / "deploy-openclaw.sh").write_text("#!/bin/bash\n")
+    (tmp_path / "repository").mkdir()
+    (tmp_path / "repository" / "Dockerfile").write_text("FROM scratch\n")
+    (tmp_path / "ws.code-workspace").write_text("{}")
+    return tmp_path
+
+
+@pytest.fixture
+def instance():
+    return OpenCLAWInstance(name="test-docker", host="localhost", type=InstanceType.DOCKER)
+
+
+def sha(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class TestHashBundle:
+    def test_hash_bundle_skips_excluded(self, bundle):
+        hashes = hash_bundle(bundle)
+
+        assert set(hashes) == {"docker-compose.yml", "deploy-openclaw.sh"}
+        assert hashes["docker-compose.yml"] == sha("services: {}\n")
+
+    def test_parse_size(self):
+        assert parse_size("512") == 512
+        assert parse_size("2K") == 2048
+        assert parse_size("1.5MB") == int(1.5 * 1024**2)
+        with pytest.raises(ValueError, match="Invalid size '2X'"):
+            parse_size("2X")
+
+
+class TestDeployer:
+    def make_deployer(self, bundle, remote_output):
+        pool = MagicMock()
+        pool.get.return_value.execute_command.return_value = (remote_output, "", 0)
+        return Deployer(source_dir=bundle, pool=pool), pool
+
+    def test_plan_only_changed_files(self, bundle, instance):
+        remote = sha("services: {}\n") + "  docker-compose.yml\n"
+        deployer, pool = self.make_deployer(bundle, remote)
+
+        plan = deployer.plan_instance(instance)
+
+        assert plan.changed == ["deploy-openclaw.sh"]
+        assert plan.unchanged == ["docker-compose.yml"]
+        pool.get.return_value.execute_command.assert_called_once()
+
+    def test_deploy_uploads_delta(self, bundle, instance):
+        deployer, pool = self.make_deployer(bundle, "")
+        sftp = pool.get.return_value.open_sftp.return_value
+
+        results = deployer.deploy([instance])
+
+        assert results[0].success
+        assert sorted(results[0].uploaded) == ["deploy-openclaw.sh", "docker-compose.yml"]
+        assert sftp.posix_rename.call_count == 2
+        sftp.close.assert_called_once()
+
+    def test_deploy_dry_run_does_not_upload(self, bundle, instance):
+        deployer, pool = self.make_deployer(bundle, "")
+
+        results = deployer.deploy([instance], dry_run=True)
+
+        assert len(results[0].uploaded) == 2
+        pool.get.return_value.open_sftp.assert_not_called()
+
+    def test_other_services_skipped(self, bundle, instance):
+        deployer, pool = self.make_deployer(bundle, "")
+        minio = OpenCLAWInstance(
+            name="minio", host="backup", type=InstanceType.DOCKER, compose_dir="backup/minio"
+        )
+
+        results = deployer.deploy([minio, instance])
+
+        assert [r.instance.name for r in results] == ["test-docker"]
+        assert all(c.args[0] is instance for c in pool.get.call_args_list)
+
+    def test_missing_or_empty_bundle_rejected(self, tmp_path):
+        with pytest.raises(ValueError, match="not found"):
+            Deployer(source_dir=tmp_path / "missing", pool=MagicMock())
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+        with pytest.raises(ValueError, match="no files"):
+            Deployer(source_dir=tmp_path, pool=MagicMock())
+
+    def test_remote_failure_reported(self, bundle, instance):
+        deployer, pool = self.make_deployer(bundle, "")
+        pool.get.side_effect = Exception("Connection refused")
+
+        results = deployer.deploy([instance])
+
+        assert results[0].success is False
+        assert "Connection refused" in results[0].error
@@ -0,0 +1,180 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import yaml
+from mission_control.federation import ProxmoxFederation
+from mission_control.health_checker import HealthResult
+from mission_control.manager import InstanceManager
+from mission_control.models import Config, OpenCLAWInstance, InstanceType, InstanceStatus
+from mission_control.proxmox_client import ProxmoxClient
+from mission_control.testing import FakeProxmoxCluster, FakeProxmoxServer
+
+SLOW_SECONDS = 0.3
+
+
+@pytest.fixture
+def fast():
+    with FakeProxmoxServer(FakeProxmoxCluster.build(3, seed=1)) as server:
+        yield server
+
+
+@pytest.fixture
+def slow():
+    cluster = FakeProxmoxCluster.build(3, start_vmid=100, stopped_every=1, seed=2)
+    with FakeProxmoxServer(cluster, latency=SLOW_SECONDS) as server:
+        yield server
+
+
+def vm_instances(server, cluster):
+    return [
+        OpenCLAWInstance(
+            name=f"{cluster}-{vm.vmid}",
+            host="127.0.0.1",
+            type=InstanceType.PROXMOX,
+            vm_id=vm.vmid,
+            cluster=cluster,
+        )
+        for vm in server.cluster.all_vms()
+    ]
+
+
+class TestConfig:
+    def test_named_clusters(self, tmp_path):
+        path = tmp_path / "config.yaml"
+        path.write_text(
+            yaml.safe_dump(
+                {
+                    "proxmox": {"host": "pve-a"},
+                    "proxmox_clusters": {"lab": {"host": "pve-b", "max_concurrency": 2}},
+                    "openclaw_instances": [{"name": "a", "host": "h", "cluster": "lab"}],
+                }
+            )
+        )
+
+        config = Config.from_yaml(str(path))
+
+        assert {n: c.host for n, c in config.clusters.items()} == {
+            "default": "pve-a",
+            "lab": "pve-b",
+        }
+        assert config.clusters["lab"].max_concurrency == 2
+        assert config.openclaw_instances[0].cluster == "lab"
+
+
+class TestProxmoxFederation:
+    def test_get_all_vms_merges_clusters(self, fast, slow):
+        federation = ProxmoxFederation(
+            {"fast": fast.proxmox_config(), "slow": slow.proxmox_config()}
+        )
+
+        vms, errors = federation.get_all_vms()
+
+        assert errors == {}
+        assert sorted((vm["cluster"], vm["vmid"]) for vm in vms) == [
+            ("fast", 100),
+            ("fast", 101),
+            ("fast", 102),
+            ("slow", 100),
+            ("slow", 101),
+            ("slow", 102),
+        ]
+
+    def test_slow_cluster_times_out(self, fast, slow):
+        federation = ProxmoxFederation(
+            {"fast": fast.proxmox_config(), "slow": slow.proxmox_config()}
+        )
+
+        started = time.monotonic()
+        vms, errors = federation.get_all_vms(timeout=SLOW_SECONDS / 2)
+
+        assert time.monotonic() - started < SLOW_SECONDS
+        assert errors == {"slow": "timed out"}
+        assert {vm["cluster"] for vm in vms} == {"fast"}
+
+    def test_concurrency_limit(self, slow):
+        client = ProxmoxClient(slow.proxmox_config(max_concurrency=2))
+        client.get_cluster_vm_statuses()
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(4) as executor:
+            list(executor.map(client.get_vm_status, [100, 101, 102, 100]))
+
+        # 4 calls, 2 at a time
+        assert time.monotonic() - started >= 2 * SLOW_SECONDS
+
+    def test_pool_sized_on_the_session_in_use(self, fast):
+        client = ProxmoxClient(fast.proxmox_config(max_connections=3))
+        base_url = f"https://{fast.host}:{fast.port}/"
+
+        client.get_cluster_vm_statuses()
+
+        adapter = client.connect()._store["session"].get_adapter(base_url)
+        assert adapter._pool_maxsize == 3
+
+
+class TestManagerFederation:
+    def test_sweep_streams_fast_cluster_first(self, fast, slow, mocker):
+        mocker.patch(
+            "mission_control.manager.HealthChecker.check",
+            return_value=HealthResult(True, "1.0.0", 1.0),
+        )
+        instances = vm_instances(slow, "slow") + vm_instances(fast, "fast")
+        manager = InstanceManager(
+            Config(
+                openclaw_instances=instances,
+                proxmox_clusters={"fast": fast.proxmox_config(), "slow": slow.proxmox_config()},
+            )
+        )
+
+        order = [i.cluster for i in manager.iter_instance_statuses()]
+
+        assert order == ["fast"] * 3 + ["slow"] * 3
+        # Same VMIDs in both clusters resolve against their own cluster
+        assert {i.status for i in instances if i.cluster == "slow"} == {InstanceStatus.STOPPED}
+        assert InstanceStatus.RUNNING in {i.status for i in instances if i.cluster == "fast"}
+        assert fast.total_calls == 1 and slow.total_calls == 1
+
+    def test_checks_submitted_from_the_sweep_thread(self, fast, slow, mocker):
+        mocker.patch(
+            "mission_control.manager.HealthChecker.check",
+            return_value=HealthResult(True, "1.0.0", 1.0),
+        )
+        submitted_from = set()
+        submit = ThreadPoolExecutor.submit
+
+        def record(executor, *args, **kwargs):
+            submitted_from.add(threading.current_thread())
+            return submit(executor, *args, **kwargs)
+
+        mocker.patch.object(ThreadPoolExecutor, "submit", record)
+        instances = vm_instances(slow, "slow") + vm_instances(fast, "fast")
+        manager = InstanceManager(
+            Config(
+                openclaw_instances=instances,
+                proxmox_clusters={"fast": fast.proxmox_config(), "slow": slow.proxmox_config()},
+            )
+        )
+
+        checked = list(manager.iter_instance_statuses())
+
+        assert len(checked) == 6
+        # Not from the per-cluster fan-out threads, which outlive the sweep's executor
+        assert submitted_from == {threading.current_thread()}
+
+    def test_unknown_cluster(self, fast, mocker):
+        mocker.patch(
+            "mission_control.manager.HealthChecker.check",
+            return_value=HealthResult(False, None, 1.0),
+        )
+        instance = OpenCLAWInstance(
+            name="lost", host="127.0.0.1", type=InstanceType.PROXMOX, vm_id=100, cluster="nope"
+        )
+        manager = InstanceManager(
+            Config(openclaw_instances=[instance], proxmox=fast.proxmox_config())
+        )
+
+        manager.update_all_instance_statuses()
+
+        assert instance.status == InstanceStatus.ERROR
+        assert "nope" in instance.error_message
@@ -0,0 +1,165 @@
+import random
+import threading
+from dataclasses import replace
+import time
+import pytest
+from mission_control.health_checker import HealthChecker
+from mission_control.manager import InstanceManager
+from mission_control.models import Config
+from mission_control.testing import FakeFleet, FakeFleetServer, Latency
+from mission_control.testing.fake_fleet import process_stats, raise_fd_limit
+from mission_control.testing.fake_ssh import write_client_key
+
+
+@pytest.fixture
+def simulator():
+    servers = []
+
+    def start(fleet: FakeFleet, **kwargs) -> FakeFleetServer:
+        server = FakeFleetServer(fleet, seed=1, **kwargs).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def sweep(manager: InstanceManager) -> dict:
+    manager.flights.clear()
+    manager.update_all_instance_statuses()
+    return {i.name: i for i in manager.get_all_instances()}
+
+
+class TestLatency:
+    def test_parse(self):
+        assert Latency.parse("5") == Latency.fixed(5)
+        assert Latency.parse("uniform:2:20") == Latency.uniform(2, 20)
+        with pytest.raises(ValueError):
+            Latency.parse("pareto:1:2")
+
+    def test_lognormal_median(self):
+        rng = random.Random(1)
+        samples = sorted(Latency.lognormal(20, 0.5).sample(rng) for _ in range(2001))
+
+        assert samples[1000] == pytest.approx(0.020, rel=0.1)
+
+
+class TestFleetSimulator:
+    def test_sweep_sees_every_instance(self, simulator):
+        server = simulator(FakeFleet.build(50, versions=("1.0.0", "1.1.0")))
+        manager = InstanceManager(server.config())
+
+        instances = sweep(manager)
+
+        assert len({i.openclaw_port for i in instances.values()}) == 50
+        assert all(i.health_check_passed for i in instances.values())
+        assert {i.version for i in instances.values()} == {"1.0.0", "1.1.0"}
+        assert server.total_requests == 50
+
+    def test_scripted_version_change_and_flap(self, simulator):
+        server = simulator(FakeFleet.build(4))
+        manager = InstanceManager(server.config())
+        sweep(manager)
+
+        server.schedule(0.1, "oc-sim-0001", version="2.0.0")
+        server.update(["oc-sim-0002"], flap_period=0.3, flap_epoch=time.monotonic() - 0.3)
+        time.sleep(0.2)
+        instances = sweep(manager)
+
+        assert instances["oc-sim-0001"].version == "2.0.0"
+        assert not instances["oc-sim-0002"].health_check_passed
+        time.sleep(0.3)
+        assert sweep(manager)["oc-sim-0002"].health_check_passed
+        with pytest.raises(ValueError):
+            server.update(colour="blue")
+
+    def test_hang_times_out_then_recovers(self, simulator):
+        server = simulator(FakeFleet.build(2))
+        server.update("oc-sim-0000", hang=True)
+        instance = server.instance_configs()[0]
+        checker = HealthChecker(timeout=0.3)
+
+        started = time.monotonic()
+        assert checker.check_instance_health(instance) == (False, None)
+        assert time.monotonic() - started >= 0.3
+
+        server.update("oc-sim-0000", hang=False)
+        checker.forget(instance)
+        assert checker.check_instance_health(instance) == (True, "1.0.0")
+
+    def test_shared_probes_report_the_probe_latency(self, simulator):
+        server = simulator(FakeFleet.build(1, latency=Latency.fixed(300)))
+        manager = InstanceManager(server.config())
+        instance = manager.get_all_instances()[0]
+        joined = replace(instance)
+
+        first = threading.Thread(target=manager.update_instance_status, args=(instance,))
+        first.start()
+        time.sleep(0.15)
+        # Joins the flight halfway through, then one served from the TTL
+        manager.update_instance_status(joined)
+        first.join()
+        cached = manager.update_instance_status(replace(instance))
+
+        assert server.total_requests == 1
+        assert instance.response_time_ms >= 300
+        assert joined.response_time_ms == cached.response_time_ms == instance.response_time_ms
+
+    def test_generated_config_round_trips(self, simulator, tmp_path):
+        server = simulator(FakeFleet.build(3, latency=Latency.uniform(1, 3)))
+        path = tmp_path / "config.yaml"
+
+        server.write_config(str(path))
+        instances = Config.from_yaml(str(path)).openclaw_instances
+
+        assert [i.openclaw_port for i in instances] == [s.http_port for s in server.fleet.instances]
+        assert sweep(InstanceManager(Config(openclaw_instances=instances)))
+
+    def test_ssh_lifecycle(self, simulator, tmp_path, monkeypatch):
+        monkeypatch.setenv("HOME", str(tmp_path))
+        monkeypatch.delenv("SSH_AUTH_SOCK", raising=False)
+        write_client_key(tmp_path)
+        fleet = FakeFleet.build(2)
+        fleet.instances[0].boot_s = 0.3
+        server = simulator(fleet, ssh=True)
+        manager = InstanceManager(server.config())
+        name = "oc-sim-0000"
+
+        assert manager.stop_instance(name)
+        assert not sweep(manager)[name].health_check_passed
+        assert manager.start_instance(name)
+        assert not sweep(manager)[name].health_check_passed
+        time.sleep(0.3)
+        assert sweep(manager)[name].health_check_passed
+
+        logs = manager.get_instance_logs(name, lines=3)
+        assert logs.count("log line") == 3
+        assert fleet.instances[0].commands[0] == "cd ~/openclaw-docker && docker-compose stop"
+        # Lifecycle calls reuse one pooled connection, which a reload re-targeting it closes
+        assert server.ssh_connections == 1
+        moved = replace(manager.get_instance_by_name(name), port=server.fleet.instances[1].ssh_port)
+        manager.apply_config(replace(manager.config, openclaw_instances=[moved]), probe=False)
+        assert len(manager.ssh_pool) == 0
+
+
+@pytest.mark.benchmark
+class TestFleetSimulatorBenchmark:
+    @pytest.mark.parametrize("count", [200, 1000])
+    def test_sweep_at_scale(self, simulator, benchmark_report, count):
+        raise_fd_limit(count * 2 + 256)
+        fleet = FakeFleet.build(count, latency=Latency.lognormal(2, 0.5), seed=1)
+        server = simulator(fleet)
+        manager = InstanceManager(server.config())
+        before = process_stats()
+
+        started = time.perf_counter()
+        instances = sweep(manager)
+        wall = time.perf_counter() - started
+        benchmark_report.append(("simulated fleet sweep", count, server.total_requests, wall))
+
+        assert all(i.health_check_passed for i in instances.values())
+        assert server.total_requests == count
+        # One listener per instance, and connections are closed after each probe
+        after = process_stats()
+        assert after["fds"] - before["fds"] < count // 10 + 50
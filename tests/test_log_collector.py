@@ -0,0 +1,115 @@
+import pytest
+from unittest.mock import MagicMock
+from mission_control.log_collector import (
+    LogCollector,
+    LogStore,
+    parse_docker_timestamp,
+    parse_log_output,
+    segment_dir,
+)
+from mission_control.models import OpenCLAWInstance, InstanceType
+
+BATCH_1 = (
+    "2026-01-05T10:59:58.5Z first\n"
+    "2026-01-05T10:59:59.123456789Z second\n"
+    "2026-01-05T11:00:01Z third\n"
+)
+BATCH_2 = "2026-01-05T11:00:01Z third\n" "2026-01-05T11:00:02.25Z fourth\n"
+
+
+@pytest.fixture
+def instance():
+    return OpenCLAWInstance(name="test-docker", host="localhost", type=InstanceType.DOCKER)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LogStore(tmp_path / "logs", codec="gzip")
+    yield store
+    store.close()
+
+
+def make_collector(store, outputs):
+    pool = MagicMock()
+    pool.get.return_value.execute_command.side_effect = [(out, "", 0) for out in outputs]
+    return LogCollector(store, pool=pool), pool
+
+
+class TestParsing:
+    def test_timestamp_with_trimmed_fraction(self):
+        base = parse_docker_timestamp("2026-01-05T11:00:01Z")
+
+        assert parse_docker_timestamp("2026-01-05T11:00:01.5Z") == base + 500_000_000
+        assert parse_docker_timestamp("2026-01-05T11:00:01.000000001Z") == base + 1
+
+    def test_drops_lines_at_or_before_cursor(self):
+        cursor = parse_docker_timestamp("2026-01-05T11:00:01Z")
+
+        entries = parse_log_output(BATCH_2, cursor)
+
+        assert [line.split()[-1] for _, line in entries] == ["fourth"]
+
+    def test_segment_dir_stays_under_root(self):
+        assert segment_dir("hl-01") == "hl-01"
+        assert segment_dir("../etc") == "%2E.%2Fetc"
+        assert segment_dir("..") == "%2E."
+        assert segment_dir("a/b") == "a%2Fb"
+
+
+class TestLogCollector:
+    def test_incremental_collect(self, store, instance):
+        collector, pool = make_collector(store, [BATCH_1, BATCH_2])
+
+        first = collector.collect([instance])[0]
+        second = collector.collect([instance])[0]
+
+        assert first.lines == 3 and first.segments == 2
+        assert second.lines == 1
+        commands = [c.args[0] for c in pool.get.return_value.execute_command.call_args_list]
+        assert "--since 24h" in commands[0]
+        assert f"--since {parse_docker_timestamp('2026-01-05T11:00:01Z') // 10**9}." in commands[1]
+
+        lines = [line for c in store.chunks() for line in store.read_chunk(c)]
+        assert [line.split()[-1] for line in lines] == ["first", "second", "third", "fourth"]
+
+    def test_chunks_filtered_by_time(self, store, instance):
+        collector, _ = make_collector(store, [BATCH_1])
+        collector.collect([instance])
+
+        since = parse_docker_timestamp("2026-01-05T11:00:00Z")
+        chunks = store.chunks(instances=["test-docker"], since=since)
+
+        assert len(chunks) == 1
+        assert list(store.read_chunk(chunks[0])) == ["2026-01-05T11:00:01Z third"]
+        assert store.instances() == ["test-docker"]
+
+    def test_other_services_skipped(self, store, instance):
+        collector, pool = make_collector(store, [BATCH_1])
+        minio = OpenCLAWInstance(
+            name="minio", host="backup", type=InstanceType.DOCKER, compose_dir="backup/minio"
+        )
+
+        results = collector.collect([minio, instance])
+
+        assert [r.instance for r in results] == ["test-docker"]
+        pool.get.assert_called_once_with(instance)
+
+    def test_failure_keeps_cursor(self, store, instance):
+        collector, pool = make_collector(store, [])
+        pool.get.return_value.execute_command.side_effect = None
+        pool.get.return_value.execute_command.return_value = ("No such container", "", 1)
+
+        result = collector.collect([instance])[0]
+
+        assert result.error == "No such container"
+        assert store.get_cursor("test-docker") is None
+
+    def test_hostile_instance_name_stays_in_store(self, store, tmp_path):
+        instance = OpenCLAWInstance(name="../../escape", host="localhost", type=InstanceType.DOCKER)
+        collector, _ = make_collector(store, [BATCH_1])
+
+        assert collector.collect([instance])[0].lines == 3
+
+        written = [p for p in tmp_path.rglob("*.log.gz")]
+        assert written and all(p.is_relative_to(store.root) for p in written)
+        assert [c.instance for c in store.chunks()] == ["../../escape"] * 2
@@ -0,0 +1,88 @@
+import time
+import pytest
+from mission_control.log_collector import LogStore, NS_PER_SECOND
+from mission_control.log_search import LogSearch, index_query, required_literals
+
+BASE = 1_767_610_800 * NS_PER_SECOND  # 2026-01-05T11:00:00Z
+
+
+def line(ts: int, message: str) -> tuple[int, str]:
+    seconds, nanos = divmod(ts, NS_PER_SECOND)
+    stamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+    return ts, f"{stamp}.{nanos:09d}Z {message}"
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LogStore(tmp_path / "logs", codec="gzip")
+    store.append("hl-web", [line(BASE, "GET /health 200"), line(BASE + 1, "kernel panic: oops")])
+    store.append("hl-db", [line(BASE + 2, "patched CVE-2024-1234")])
+    store.append("other", [line(BASE + 3, "panic in other")])
+    yield store
+    store.close()
+
+
+class TestIndexQuery:
+    def test_required_literals(self):
+        assert required_literals("kernel panic") == ["kernel", "panic"]
+        assert required_literals("colou?r") == ["colo"]
+        assert required_literals("err(or)?s happened") == ["err", "happened"]
+        assert required_literals(r"\d+\.\d+") == []
+
+    def test_multi_char_escapes_are_not_literals(self):
+        assert required_literals(r"\x41BC error") == ["error"]
+        assert required_literals(r"caf\u00e9 open") == ["caf", "open"]
+        assert required_literals(r"\U0001F600 smile") == ["smile"]
+        assert required_literals(r"\N{LATIN SMALL LETTER E WITH ACUTE}clair") == ["clair"]
+        assert required_literals(r"tab\011here") == ["tab", "here"]
+
+    def test_alternation(self):
+        assert index_query("CVE|panic") == '("cve") OR ("pan" AND "ani" AND "nic")'
+
+    def test_unindexable_branch_scans(self):
+        assert index_query("panic|.*") is None
+
+
+class TestLogSearch:
+    def test_search_across_instances(self, store):
+        matches = list(LogSearch(store).search("CVE|panic"))
+
+        assert [(m.instance, m.line.split(" ", 1)[1]) for m in matches] == [
+            ("hl-web", "kernel panic: oops"),
+            ("hl-db", "patched CVE-2024-1234"),
+            ("other", "panic in other"),
+        ]
+
+    def test_instance_glob_and_time(self, store):
+        searcher = LogSearch(store)
+
+        matches = list(searcher.search("panic|CVE", instances=["hl-*"], since=BASE + 2))
+
+        assert [m.instance for m in matches] == ["hl-db"]
+
+    def test_index_skips_chunks(self, store):
+        for n in range(50):
+            store.append("hl-web", [line(BASE + 10 + n, f"request {n} ok")])
+        searcher = LogSearch(store)
+
+        matches = list(searcher.search("PANIC", ignore_case=True))
+
+        assert len(matches) == 2
+        assert searcher.stats.used_index
+        assert searcher.stats.chunks_scanned == 2
+
+    def test_escaped_characters_still_match(self, store):
+        matches = list(LogSearch(store).search(r"\x70anic|CVE\x2d2024\0551234"))
+
+        assert [m.instance for m in matches] == ["hl-web", "hl-db", "other"]
+
+    def test_reindex_existing_store(self, store):
+        store.db.execute("DROP TABLE chunk_terms")
+        store.db.commit()
+        store.close()
+
+        reopened = LogStore(store.root, codec="gzip")
+        try:
+            assert [m.instance for m in LogSearch(reopened).search("CVE")] == ["hl-db"]
+        finally:
+            reopened.close()
@@ -1,6 +1,8 @@
 import pytest
 from unittest.mock import Mock, patch, MagicMock
+from mission_control.health_checker import HealthResult
 from mission_control.manager import InstanceManager
+from mission_control.ssh_client import SSHConnectionPool
 from mission_control.models import (
     Config,
     OpenCLAWInstance,
@@ -79,9 +81,9 @@ class TestInstanceManager:
         result = manager.remove_instance("nonexistent")
         assert result is False
 
-    @patch("mission_control.manager.HealthChecker.check_instance_health")
+    @patch("mission_control.manager.HealthChecker.check")
     def test_update_instance_status(self, mock_health, manager):
-        mock_health.return_value = (True, "1.0.0")
+        mock_health.return_value = HealthResult(True, "1.0.0", 1.0)
 
         instance = manager.get_all_instances()[0]
         result = manager.update_instance_status(instance)
@@ -91,10 +93,10 @@ class TestInstanceManager:
         assert result.last_health_check is not None
 
     @patch("mission_control.manager.ProxmoxClient.get_vm_status_enum")
-    @patch("mission_control.manager.HealthChecker.check_instance_health")
+    @patch("mission_control.manager.HealthChecker.check")
     def test_update_instance_status_proxmox(self, mock_health, mock_pve_status, manager):
         mock_pve_status.return_value = InstanceStatus.RUNNING
-        mock_health.return_value = (True, "1.0.0")
+        mock_health.return_value = HealthResult(True, "1.0.0", 1.0)
 
         instance = manager.get_all_instances()[0]
         result = manager.update_instance_status(instance)
@@ -110,13 +112,20 @@ class TestInstanceManager:
         assert result is True
         mock_start.assert_called_once_with(100)
 
-    @patch("mission_control.manager.SSHClient.start_openclaw")
-    def test_start_docker_instance(self, mock_start, manager):
-        mock_start.return_value = True
+    @patch("mission_control.manager.SSHConnectionPool.get")
+    def test_start_docker_instance(self, mock_get, manager):
+        mock_get.return_value.start_openclaw.return_value = True
 
         result = manager.start_instance("test-docker")
 
         assert result is True
+        mock_get.assert_called_once_with(manager.get_instance_by_name("test-docker"))
+
+    @patch("mission_control.manager.SSHConnectionPool.get")
+    def test_start_docker_instance_unreachable(self, mock_get, manager):
+        mock_get.side_effect = OSError("No route to host")
+
+        assert manager.start_instance("test-docker") is False
 
     @patch("mission_control.manager.ProxmoxClient.stop_vm")
     def test_stop_proxmox_instance(self, mock_stop, manager):
@@ -136,9 +145,9 @@ class TestInstanceManager:
         assert result is True
         mock_restart.assert_called_once_with(100)
 
-    @patch("mission_control.manager.SSHClient.get_openclaw_logs")
-    def test_get_instance_logs(self, mock_logs, manager):
-        mock_logs.return_value = "Log output here"
+    @patch("mission_control.manager.SSHConnectionPool.get")
+    def test_get_instance_logs(self, mock_get, manager):
+        mock_get.return_value.get_openclaw_logs.return_value = "Log output here"
 
         result = manager.get_instance_logs("test-docker")
 
@@ -163,3 +172,33 @@ class TestInstanceManager:
         vms = manager.get_proxmox_vms()
 
         assert vms == []
+
+    @patch("mission_control.manager.ProxmoxClient.get_cluster_vm_statuses")
+    @patch("mission_control.manager.HealthChecker.check")
+    def test_iter_instance_statuses(self, mock_health, mock_cluster, manager):
+        mock_cluster.return_value = {100: {"vmid": 100, "status": "stopped"}}
+        mock_health.return_value = HealthResult(False, None, 1.0)
+
+        results = list(manager.iter_instance_statuses())
+
+        assert {i.name for i in results} == {"test-vm", "test-docker"}
+        assert manager.get_instance_by_name("test-vm").status == InstanceStatus.STOPPED
+        mock_cluster.assert_called_once()
+
+
+class TestSSHConnectionPool:
+    @patch("mission_control.ssh_client.SSHClient.is_connected", return_value=True)
+    @patch("mission_control.ssh_client.SSHClient.connect")
+    def test_instances_on_one_host_share_a_connection(self, mock_connect, _):
+        a = OpenCLAWInstance(name="a", host="10.0.0.5", type=InstanceType.DOCKER)
+        b = OpenCLAWInstance(
+            name="b", host="10.0.0.5", type=InstanceType.DOCKER, compose_dir="b-stack"
+        )
+        pool = SSHConnectionPool()
+
+        assert pool.get(a).instance is a
+        client = pool.get(b)
+
+        assert client.instance is b
+        assert client.compose_dir == "b-stack"
+        assert len(pool) == 1
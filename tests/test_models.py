@@ -7,7 +7,7 @@ from mission_control.models import (
     ProxmoxConfig,
     Config,
 )
-from mission_control.health_checker import HealthChecker
+from mission_control.health_checker import HealthChecker, HealthResult
 
 
 class TestOpenCLAWInstance:
@@ -49,6 +49,11 @@ class TestOpenCLAWInstance:
         assert data["health_check_passed"] is True
         assert data["version"] == "1.0.0"
 
+    def test_runs_openclaw(self):
+        assert OpenCLAWInstance(name="a", host="h").runs_openclaw
+        assert OpenCLAWInstance(name="a", host="h", compose_dir="openclaw-docker").runs_openclaw
+        assert not OpenCLAWInstance(name="m", host="h", compose_dir="backup/minio").runs_openclaw
+
 
 class TestProxmoxConfig:
     def test_from_dict_with_token(self):
@@ -118,14 +123,15 @@ class TestHealthChecker:
             OpenCLAWInstance(name="instance-2", host="localhost", openclaw_port=8081),
         ]
 
-        with patch.object(health_checker, "check_instance_health") as mock_check:
+        with patch.object(health_checker, "check") as mock_check:
             mock_check.side_effect = [
-                (True, "1.0.0"),
-                (False, None),
+                HealthResult(True, "1.0.0", 12.5),
+                HealthResult(False, None, 3.0),
             ]
 
             result = health_checker.check_all_instances(instances)
 
             assert result[0].health_check_passed is True
             assert result[0].version == "1.0.0"
+            assert result[0].response_time_ms == 12.5
             assert result[1].health_check_passed is False
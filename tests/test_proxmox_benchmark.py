@@ -0,0 +1,98 @@
+import time
+import pytest
+from mission_control.health_checker import HealthResult
+from mission_control.manager import InstanceManager
+from mission_control.models import Config, OpenCLAWInstance, InstanceType, InstanceStatus
+from mission_control.proxmox_client import ProxmoxClient
+from mission_control.testing import FakeProxmoxCluster, FakeProxmoxServer
+
+NODE_COUNT = 3
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.fixture(scope="module", params=[10, 100, 1000])
+def server(request):
+    cluster = FakeProxmoxCluster.build(request.param, node_count=NODE_COUNT, seed=1)
+    with FakeProxmoxServer(cluster) as server:
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    client = ProxmoxClient(server.proxmox_config())
+    client.connect()
+    server.reset_stats()
+    return client
+
+
+def vm_count(server) -> int:
+    return len(server.cluster.all_vms())
+
+
+def measure(benchmark_report, server, operation, func):
+    server.reset_stats()
+    started = time.perf_counter()
+    result = func()
+    wall = time.perf_counter() - started
+    benchmark_report.append((operation, vm_count(server), server.total_calls, wall))
+    return result
+
+
+class TestProxmoxClientBenchmark:
+    def test_per_vm_status_sweep(self, benchmark_report, server, client):
+        vmids = [vm.vmid for vm in server.cluster.all_vms()]
+
+        statuses = measure(
+            benchmark_report,
+            server,
+            "get_vm_status sweep",
+            lambda: [client.get_vm_status(vmid) for vmid in vmids],
+        )
+
+        assert len(statuses) == len(vmids)
+        # one status call per VM plus a single node-index lookup
+        assert server.total_calls == len(vmids) + 1
+
+    def test_get_all_vms(self, benchmark_report, server, client):
+        vms = measure(benchmark_report, server, "get_all_vms", client.get_all_vms)
+
+        assert len(vms) == vm_count(server)
+        assert server.total_calls == 1 + NODE_COUNT
+
+    def test_cluster_status_sweep(self, benchmark_report, server, client):
+        statuses = measure(
+            benchmark_report, server, "get_cluster_vm_statuses", client.get_cluster_vm_statuses
+        )
+
+        assert len(statuses) == vm_count(server)
+        assert server.total_calls == 1
+
+    def test_manager_sweep_uses_bulk_status(self, benchmark_report, server, mocker):
+        mocker.patch(
+            "mission_control.manager.HealthChecker.check",
+            return_value=HealthResult(True, "1.0.0", 1.0),
+        )
+        instances = [
+            OpenCLAWInstance(
+                name=vm.name, host="127.0.0.1", type=InstanceType.PROXMOX, vm_id=vm.vmid
+            )
+            for vm in server.cluster.all_vms()
+        ]
+        manager = InstanceManager(
+            Config(openclaw_instances=instances, proxmox=server.proxmox_config())
+        )
+        manager.proxmox_client.connect()
+
+        measure(
+            benchmark_report, server, "manager status sweep", manager.update_all_instance_statuses
+        )
+
+        assert server.total_calls == 1
+        expected = {vm.vmid: vm.status for vm in server.cluster.all_vms()}
+        for instance in instances:
+            assert instance.status == (
+                InstanceStatus.RUNNING
+                if expected[instance.vm_id] == "running"
+                else InstanceStatus.STOPPED
+            )
@@ -0,0 +1,69 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from mission_control.models import InstanceStatus
+from mission_control.proxmox_client import ProxmoxClient
+from mission_control.testing import FakeProxmoxCluster, FakeProxmoxServer
+
+
+@pytest.fixture(scope="module")
+def server():
+    with FakeProxmoxServer(FakeProxmoxCluster.build(6, node_count=2, seed=1)) as server:
+        yield server
+
+
+@pytest.fixture
+def no_retry_wait(mocker):
+    mocker.patch.object(ProxmoxClient.get_vm_status.retry, "sleep", lambda seconds: None)
+
+
+@pytest.fixture
+def client(server):
+    return ProxmoxClient(server.proxmox_config())
+
+
+class TestProxmoxClient:
+    def test_get_vm_status_on_second_node(self, server, client):
+        vm = server.cluster.nodes["pve2"][101]
+
+        status = client.get_vm_status(101)
+
+        assert status["vmid"] == 101
+        assert status["status"] == vm.status
+
+    def test_lifecycle_calls(self, server, client):
+        assert client.stop_vm(103) is True
+        assert client.get_vm_status_enum(103) == InstanceStatus.STOPPED
+
+        assert client.start_vm(103) is True
+        assert client.get_vm_status_enum(103) == InstanceStatus.RUNNING
+
+    def test_get_all_vms_spans_nodes(self, client):
+        vms = client.get_all_vms()
+
+        assert {vm["node"] for vm in vms} == {"pve1", "pve2"}
+        assert len(vms) == 6
+
+    def test_unknown_vm_is_error(self, client, no_retry_wait):
+        assert client.get_vm_status_enum(999) == InstanceStatus.ERROR
+
+    def test_password_auth(self, server):
+        client = ProxmoxClient(server.proxmox_config(password_auth=True))
+
+        assert client.get_vm_status(100)["vmid"] == 100
+        assert server.tickets_issued >= 1
+
+    def test_rejects_bad_token(self, server, no_retry_wait):
+        client = ProxmoxClient(server.proxmox_config(token_secret="wrong"))
+
+        assert client.get_vm_status_enum(100) == InstanceStatus.ERROR
+
+    def test_concurrent_first_calls_share_login_and_node_index(self, server):
+        client = ProxmoxClient(server.proxmox_config(password_auth=True))
+        server.reset_stats()
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            statuses = list(executor.map(client.get_vm_status, range(100, 106)))
+
+        assert [s["vmid"] for s in statuses] == list(range(100, 106))
+        assert server.tickets_issued == 1
+        assert server.calls["GET /cluster/resources"] == 1
@@ -0,0 +1,241 @@
+import json
+import os
+import signal
+import socket
+import threading
+import time
+from collections import Counter
+from dataclasses import replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from mission_control.manager import InstanceManager
+from mission_control.models import Config, InstanceType, OpenCLAWInstance, ProxmoxConfig
+from mission_control.sharding import HashRing, ShardedMonitor
+from mission_control.testing import FakeFleet, FakeFleetServer, Latency
+from mission_control.testing.fake_fleet import raise_fd_limit
+
+DEADLINE = 30.0
+
+
+class HealthHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps({"version": "2.0"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def health_port():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), HealthHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+def fleet(port: int, count: int, start: int = 0) -> list[OpenCLAWInstance]:
+    return [
+        OpenCLAWInstance(
+            name=f"oc-{i}",
+            host="127.0.0.1",
+            type=InstanceType.LOCAL,
+            openclaw_port=port,
+            # Distinct paths so the probes aren't coalesced into one
+            health_path=f"/health/{i}",
+        )
+        for i in range(start, start + count)
+    ]
+
+
+def wait_for(condition, timeout: float = DEADLINE):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError("condition not met")
+        time.sleep(0.05)
+
+
+@pytest.fixture
+def monitor_factory():
+    monitors = []
+
+    def make(instances, **kwargs) -> ShardedMonitor:
+        manager = InstanceManager(Config(openclaw_instances=instances))
+        monitor = ShardedMonitor(manager, interval=0.2, **kwargs)
+        monitors.append(monitor)
+        return monitor
+
+    yield make
+    for monitor in monitors:
+        monitor.stop()
+
+
+def closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestHashRing:
+    def test_balanced(self):
+        ring = HashRing([f"shard-{i}" for i in range(4)])
+
+        counts = Counter(ring.node_for(f"oc-{i}") for i in range(10_000))
+
+        assert set(counts) == set(ring.nodes)
+        assert all(1500 < c < 3500 for c in counts.values())
+
+    def test_adding_a_node_moves_few_keys(self):
+        keys = [f"oc-{i}" for i in range(10_000)]
+        ring = HashRing([f"shard-{i}" for i in range(4)])
+        before = {k: ring.node_for(k) for k in keys}
+
+        ring.add("shard-4")
+        moved = {k for k in keys if ring.node_for(k) != before[k]}
+
+        assert all(ring.node_for(k) == "shard-4" for k in moved)
+        assert len(moved) < 0.3 * len(keys)
+
+    def test_removing_a_node_moves_only_its_keys(self):
+        keys = [f"oc-{i}" for i in range(1000)]
+        ring = HashRing([f"shard-{i}" for i in range(3)])
+        before = {k: ring.node_for(k) for k in keys}
+
+        ring.remove("shard-1")
+
+        assert all(ring.node_for(k) == before[k] for k in keys if before[k] != "shard-1")
+        with pytest.raises(LookupError):
+            HashRing().node_for("oc-0")
+
+
+class TestShardedMonitor:
+    def test_workers_fill_one_fleet_view(self, health_port, monitor_factory):
+        instances = fleet(health_port, 40)
+        monitor = monitor_factory(instances, workers=2)
+        seen = []
+
+        monitor.start(on_result=lambda i: seen.append(i.name))
+        wait_for(lambda: monitor.rounds >= 1)
+
+        shards = [set(w.shard) for w in monitor.workers.values()]
+        assert shards[0] and shards[1] and not shards[0] & shards[1]
+        assert shards[0] | shards[1] == {i.name for i in instances}
+        assert all(i.health_check_passed and i.version == "2.0" for i in instances)
+        assert set(seen) == {i.name for i in instances}
+        assert len({w.process.pid for w in monitor.workers.values()} | {os.getpid()}) == 3
+
+    def test_crashed_worker_restarted_with_its_shard(self, health_port, monitor_factory):
+        monitor = monitor_factory(fleet(health_port, 20), workers=2)
+        monitor.start()
+        wait_for(lambda: monitor.rounds >= 1)
+        worker = monitor.workers["shard-0"]
+        shard, pid = list(worker.shard), worker.process.pid
+
+        os.kill(pid, signal.SIGKILL)
+        wait_for(lambda: worker.restarts == 1 and worker.sweeps >= 2)
+
+        assert worker.process.pid != pid
+        assert worker.shard == shard
+
+    def test_crash_looping_worker_shard_reassigned(self, health_port, monitor_factory):
+        instances = fleet(health_port, 30)
+        monitor = monitor_factory(instances, workers=3, max_restarts=0)
+        monitor.start()
+        wait_for(lambda: monitor.rounds >= 1)
+        lost = set(monitor.workers["shard-1"].shard)
+        kept = {w.worker_id: set(w.shard) for w in monitor.active if w.worker_id != "shard-1"}
+
+        os.kill(monitor.workers["shard-1"].process.pid, signal.SIGKILL)
+        wait_for(lambda: "shard-1" not in monitor.ring.nodes)
+        for instance in instances:
+            instance.version = None
+        rounds = monitor.rounds
+        wait_for(lambda: monitor.rounds >= rounds + 2)
+
+        for worker_id, shard in kept.items():
+            # Surviving workers keep what they had and only gain instances
+            assert shard <= set(monitor.workers[worker_id].shard)
+        assert lost <= {n for w in monitor.active for n in w.shard}
+        assert all(i.version == "2.0" for i in instances)
+
+    def test_config_reload_probes_new_instances(self, health_port, monitor_factory):
+        monitor = monitor_factory(fleet(health_port, 10), workers=2)
+        monitor.start()
+        wait_for(lambda: monitor.rounds >= 1)
+        config = replace(monitor.manager.config, openclaw_instances=fleet(health_port, 15))
+
+        diff = monitor.apply_config(config)
+
+        assert len(diff.added) == 5
+        added = [monitor.manager.get_instance_by_name(f"oc-{i}") for i in range(10, 15)]
+        wait_for(lambda: all(i.version == "2.0" for i in added))
+
+    def test_config_reload_retargets_instances(self, health_port, monitor_factory):
+        monitor = monitor_factory(fleet(health_port, 10), workers=2)
+        monitor.start()
+        wait_for(lambda: monitor.rounds >= 1)
+        moved = replace(fleet(health_port, 1, start=3)[0], openclaw_port=closed_port())
+        instances = [moved if i.name == "oc-3" else i for i in fleet(health_port, 10)]
+
+        diff = monitor.apply_config(replace(monitor.manager.config, openclaw_instances=instances))
+        rounds = monitor.rounds
+        wait_for(lambda: monitor.rounds >= rounds + 2)
+
+        assert [new.name for _, new in diff.changed] == ["oc-3"]
+        # Only the owning worker probes: a stale worker would still report the old port up
+        instance = monitor.manager.get_instance_by_name("oc-3")
+        assert instance.last_health_check is not None
+        assert instance.health_check_passed is False
+        assert all(
+            i.health_check_passed for i in monitor.manager.get_all_instances() if i is not instance
+        )
+
+    def test_cluster_changes_reach_every_worker(self, health_port, monitor_factory, mocker):
+        monitor = monitor_factory(fleet(health_port, 10), workers=2)
+        monitor._assign()
+        sent = mocker.patch.object(monitor, "_send")
+        proxmox = ProxmoxConfig(host="pve-new", token_id="t", token_secret="rotated")
+        config = replace(monitor.manager.config, proxmox=proxmox)
+
+        monitor.apply_config(config)
+
+        assert sorted(call.args[0].worker_id for call in sent.call_args_list) == [
+            "shard-0",
+            "shard-1",
+        ]
+        for call in sent.call_args_list:
+            kind, shard_config = call.args[1:]
+            assert kind == "assign" and shard_config.proxmox == proxmox
+            assert [i.name for i in shard_config.openclaw_instances] == call.args[0].shard
+
+
+@pytest.mark.benchmark
+class TestShardingBenchmark:
+    def test_sweep_throughput_scales_with_workers(self, monitor_factory, benchmark_report):
+        count = 1000
+        raise_fd_limit(count * 2 + 256)
+        fleet = FakeFleet.build(count, latency=Latency.fixed(1), seed=1)
+        cores = os.cpu_count() or 1
+        sweep_seconds = {}
+        with FakeFleetServer(fleet, seed=1) as server:
+            for workers in sorted({1, min(4, cores)}):
+                monitor = monitor_factory(server.instance_configs(), workers=workers)
+                monitor.interval = 0.0
+                monitor.start()
+                # The first round includes worker start-up
+                wait_for(lambda: monitor.rounds >= 3, timeout=120)
+                monitor.stop()
+                wall = max(w.last_sweep_ms for w in monitor.active) / 1000
+                sweep_seconds[workers] = wall
+                benchmark_report.append((f"sharded sweep, {workers} worker(s)", count, count, wall))
+
+        for workers, wall in sweep_seconds.items():
+            # Roughly linear: at least half the ideal speed-up per added core
+            assert sweep_seconds[1] / wall >= 1 + (workers - 1) / 2
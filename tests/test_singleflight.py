@@ -0,0 +1,110 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from unittest.mock import Mock
+from mission_control.health_checker import HealthChecker
+from mission_control.manager import InstanceManager
+from mission_control.models import Config, InstanceType, OpenCLAWInstance
+from mission_control.singleflight import SingleFlight
+from mission_control.testing import FakeProxmoxCluster, FakeProxmoxServer
+
+
+def run_concurrently(func, count: int) -> list:
+    barrier = threading.Barrier(count)
+
+    def call(_):
+        barrier.wait()
+        return func()
+
+    with ThreadPoolExecutor(count) as executor:
+        return list(executor.map(call, range(count)))
+
+
+def slow_health_response(*args, **kwargs):
+    time.sleep(0.1)
+    return Mock(status_code=200, json=Mock(return_value={"version": "1.2.3"}))
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_share_one(self):
+        flights = SingleFlight()
+        func = Mock(side_effect=lambda: time.sleep(0.1) or "up")
+
+        results = run_concurrently(lambda: flights.do(("health", "h", 1), func), 8)
+
+        assert results == ["up"] * 8
+        assert func.call_count == 1
+        assert (flights.calls, flights.shared) == (1, 7)
+
+    def test_result_kept_for_ttl(self):
+        flights = SingleFlight(ttl=0.1)
+        func = Mock(return_value="up")
+
+        flights.do("k", func)
+        flights.do("k", func)
+        assert func.call_count == 1
+
+        time.sleep(0.15)
+        flights.do("k", func)
+        flights.forget("k")
+        flights.do("k", func)
+        assert func.call_count == 3
+
+    def test_error_shared_but_not_cached(self):
+        flights = SingleFlight()
+
+        def fail():
+            time.sleep(0.1)
+            raise ConnectionError("refused")
+
+        with ThreadPoolExecutor(2) as executor:
+            futures = [executor.submit(flights.do, "k", fail) for _ in range(2)]
+        for future in futures:
+            with pytest.raises(ConnectionError):
+                future.result()
+
+        assert flights.calls == 1
+        assert flights.do("k", lambda: "ok") == "ok"
+
+
+class TestProbeCoalescing:
+    def test_instances_sharing_a_port_share_the_probe(self, mocker):
+        get = mocker.patch("mission_control.health_checker.requests.get", return_value=Mock())
+        get.return_value.status_code = 200
+        get.return_value.json.return_value = {"version": "1.0"}
+        checker = HealthChecker()
+        instances = [
+            OpenCLAWInstance(name="a", host="10.0.0.1"),
+            OpenCLAWInstance(name="b", host="10.0.0.1"),
+            OpenCLAWInstance(name="c", host="10.0.0.2"),
+        ]
+
+        checker.check_all_instances(instances)
+
+        assert get.call_count == 2
+        assert [i.version for i in instances] == ["1.0"] * 3
+
+    def test_concurrent_sweeps_share_requests(self, mocker):
+        get = mocker.patch(
+            "mission_control.health_checker.requests.get", side_effect=slow_health_response
+        )
+        with FakeProxmoxServer(FakeProxmoxCluster.build(2, seed=1), latency=0.1) as server:
+            instances = [
+                OpenCLAWInstance(
+                    name=f"vm-{vm.vmid}",
+                    host=f"10.0.0.{vm.vmid}",
+                    type=InstanceType.PROXMOX,
+                    vm_id=vm.vmid,
+                )
+                for vm in server.cluster.all_vms()
+            ]
+            manager = InstanceManager(
+                Config(openclaw_instances=instances, proxmox=server.proxmox_config())
+            )
+
+            run_concurrently(manager.update_all_instance_statuses, 3)
+
+            assert server.calls["GET /cluster/resources"] == 1
+        assert get.call_count == 2
+        assert {i.version for i in instances} == {"1.2.3"}
@@ -0,0 +1,154 @@
+import threading
+import time
+import pytest
+import yaml
+from mission_control.manager import InstanceManager
+from mission_control.models import Config, InstanceStatus, InstanceType, OpenCLAWInstance
+from mission_control.startup import (
+    DependencyError,
+    StartupScheduler,
+    dependency_graph,
+    find_cycle,
+    with_dependencies,
+)
+
+BOOT_SECONDS = 0.2
+
+
+def instance(name: str, *depends_on: str) -> OpenCLAWInstance:
+    return OpenCLAWInstance(
+        name=name, host=f"{name}.lan", type=InstanceType.DOCKER, depends_on=list(depends_on)
+    )
+
+
+class FakeFleet:
+    """Instances that pass their health check BOOT_SECONDS after being started."""
+
+    def __init__(self, manager, mocker, failing=()):
+        self.ready_at: dict[str, float] = {}
+        self.started: list[str] = []
+        self.failing = set(failing)
+        self._lock = threading.Lock()
+        mocker.patch.object(manager, "start_instance", side_effect=self.start)
+        mocker.patch.object(manager.health_checker, "check_instance_health", side_effect=self.check)
+
+    def start(self, name: str) -> bool:
+        with self._lock:
+            self.started.append(name)
+        if name in self.failing:
+            return False
+        self.ready_at[name] = time.monotonic() + BOOT_SECONDS
+        return True
+
+    def check(self, instance: OpenCLAWInstance):
+        ready_at = self.ready_at.get(instance.name)
+        healthy = ready_at is not None and time.monotonic() >= ready_at
+        return healthy, "1.0" if healthy else None
+
+
+def make_manager(*instances: OpenCLAWInstance) -> InstanceManager:
+    return InstanceManager(Config(openclaw_instances=list(instances)))
+
+
+def scheduler(manager) -> StartupScheduler:
+    return StartupScheduler(manager, health_timeout=5, poll_interval=0.02)
+
+
+class TestDependencyGraph:
+    def test_cycle_detected(self):
+        graph = dependency_graph([instance("a", "c"), instance("b", "a"), instance("c", "b")])
+
+        assert find_cycle(graph) == ["a", "c", "b", "a"]
+
+    def test_unknown_dependency(self):
+        with pytest.raises(DependencyError, match="unknown"):
+            dependency_graph([instance("a", "nope")])
+
+    def test_with_dependencies(self):
+        graph = dependency_graph([instance("minio"), instance("prod", "minio"), instance("x")])
+
+        assert with_dependencies(graph, ["prod"]) == ["minio", "prod"]
+
+    def test_config_parses_depends_on(self, tmp_path):
+        path = tmp_path / "config.yaml"
+        path.write_text(
+            yaml.safe_dump(
+                {
+                    "openclaw_instances": [
+                        {"name": "minio", "host": "h", "health_path": "/minio/health/live"},
+                        {"name": "prod", "host": "h", "depends_on": "minio"},
+                    ]
+                }
+            )
+        )
+
+        minio, prod = Config.from_yaml(str(path)).openclaw_instances
+
+        assert prod.depends_on == ["minio"]
+        assert minio.health_path == "/minio/health/live"
+
+
+class TestStartupScheduler:
+    def test_parallel_start_in_dependency_order(self, mocker):
+        manager = make_manager(
+            instance("minio"),
+            instance("prod", "minio"),
+            instance("staging", "minio"),
+            instance("tools"),
+        )
+        fleet = FakeFleet(manager, mocker)
+
+        report = scheduler(manager).run()
+
+        assert report.success
+        results = report.results
+        assert results["prod"].started_s >= results["minio"].ready_s
+        assert results["staging"].started_s >= results["minio"].ready_s
+        # tools, prod and staging don't wait for each other: two boot times, not four
+        assert report.total_s < 3 * BOOT_SECONDS
+        assert report.serial_s > 3.5 * BOOT_SECONDS
+        assert [r.name for r in report.critical_path][0] == "minio"
+        assert len(report.critical_path) == 2
+        assert set(fleet.started) == {"minio", "prod", "staging", "tools"}
+        assert manager.get_instance_by_name("prod").status == InstanceStatus.RUNNING
+
+    def test_named_start_pulls_in_dependencies(self, mocker):
+        manager = make_manager(instance("minio"), instance("prod", "minio"), instance("tools"))
+        fleet = FakeFleet(manager, mocker)
+
+        report = scheduler(manager).run(["prod"])
+
+        assert list(report.results) == ["minio", "prod"]
+        assert fleet.started == ["minio", "prod"]
+
+    def test_failed_dependency_skips_dependents(self, mocker):
+        manager = make_manager(
+            instance("minio"), instance("prod", "minio"), instance("web", "prod"), instance("x")
+        )
+        fleet = FakeFleet(manager, mocker, failing={"minio"})
+
+        report = scheduler(manager).run()
+
+        assert not report.success
+        assert report.results["minio"].error == "start failed"
+        assert report.results["web"].error == "dependency 'prod' did not start"
+        assert report.results["x"].success
+        assert sorted(fleet.started) == ["minio", "x"]
+
+    def test_healthy_instance_not_restarted(self, mocker):
+        manager = make_manager(instance("minio"), instance("prod", "minio"))
+        fleet = FakeFleet(manager, mocker)
+        fleet.ready_at["minio"] = 0.0
+
+        report = scheduler(manager).run()
+
+        assert report.results["minio"].already_running
+        assert fleet.started == ["prod"]
+
+    def test_cycle_rejected_before_starting(self, mocker):
+        manager = make_manager(instance("a", "b"), instance("b", "a"))
+        fleet = FakeFleet(manager, mocker)
+
+        with pytest.raises(DependencyError, match="a -> b -> a"):
+            scheduler(manager).run()
+        assert fleet.started == []
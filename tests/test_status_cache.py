@@ -0,0 +1,75 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from mission_control.models import OpenCLAWInstance, InstanceStatus
+from mission_control.status_cache import StatusCache, parse_duration
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return StatusCache(tmp_path / "status.json")
+
+
+def checked_instance(**kwargs):
+    instance = OpenCLAWInstance(name="test-vm", host="192.168.1.100", vm_id=100, **kwargs)
+    instance.status = InstanceStatus.RUNNING
+    instance.health_check_passed = True
+    instance.version = "1.0.0"
+    instance.last_health_check = "2026-01-01T00:00:00"
+    return instance
+
+
+class TestStatusCache:
+    def test_parse_duration(self):
+        assert parse_duration("30") == 30
+        assert parse_duration("30s") == 30
+        assert parse_duration("5m") == 300
+        assert parse_duration("1.5h") == 5400
+        with pytest.raises(ValueError):
+            parse_duration("soon")
+
+    def test_round_trip(self, cache):
+        cache.save([checked_instance()])
+        fresh = OpenCLAWInstance(name="test-vm", host="192.168.1.100", vm_id=100)
+
+        ages = cache.apply([fresh])
+
+        assert ages["test-vm"] < 5
+        assert fresh.status == InstanceStatus.RUNNING
+        assert fresh.health_check_passed is True
+        assert fresh.version == "1.0.0"
+        assert fresh.last_health_check == "2026-01-01T00:00:00"
+
+    def test_retargeted_instance_not_served(self, cache):
+        cache.save([checked_instance()])
+        moved = OpenCLAWInstance(name="test-vm", host="192.168.1.200", vm_id=100)
+
+        assert cache.apply([moved]) == {}
+        assert moved.status == InstanceStatus.UNKNOWN
+
+    def test_save_merges_and_leaves_no_temp_files(self, cache, tmp_path):
+        cache.save([checked_instance()])
+        other = checked_instance()
+        other.name = "other"
+        cache.save([other])
+
+        data = json.loads((tmp_path / "status.json").read_text())
+        assert set(data["instances"]) == {"test-vm", "other"}
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["status.json", "status.json.lock"]
+
+    def test_concurrent_writers_keep_every_entry(self, tmp_path):
+        # Separate StatusCache objects share nothing in memory, like separate CLI runs
+        def save(i):
+            instance = checked_instance()
+            instance.name = f"vm-{i}"
+            StatusCache(tmp_path / "status.json").save([instance])
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(save, range(32)))
+
+        assert len(StatusCache(tmp_path / "status.json").load()) == 32
+
+    def test_unchecked_instances_not_cached(self, cache):
+        cache.save([OpenCLAWInstance(name="never", host="localhost")])
+
+        assert cache.load() == {}
@@ -0,0 +1,97 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import stat
+import time
+import pytest
+from mission_control.proxmox_client import ProxmoxClient
+from mission_control.testing import FakeProxmoxCluster, FakeProxmoxServer
+from mission_control.ticket_cache import RENEW_AGE, TICKET_LIFETIME, Ticket, TicketCache
+
+
+@pytest.fixture
+def server():
+    with FakeProxmoxServer(FakeProxmoxCluster.build(3, seed=1)) as server:
+        yield server
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return TicketCache(tmp_path / "cache" / "tickets.json")
+
+
+def new_client(server, cache) -> ProxmoxClient:
+    """A client as a fresh CLI run would build it."""
+    return ProxmoxClient(server.proxmox_config(password_auth=True), ticket_cache=cache)
+
+
+class TestTicketCache:
+    def test_round_trip_is_private(self, cache):
+        cache.put("root@pam@pve:8006", Ticket("PVE:t", "csrf", time.time()))
+
+        assert cache.get("root@pam@pve:8006").ticket == "PVE:t"
+        assert stat.S_IMODE(os.stat(cache.path).st_mode) == 0o600
+
+    def test_expired_ticket_not_returned(self, cache):
+        cache.put("k", Ticket("PVE:t", "csrf", time.time() - TICKET_LIFETIME))
+
+        assert cache.get("k") is None
+
+    def test_world_readable_file_ignored(self, cache):
+        cache.put("k", Ticket("PVE:t", "csrf", time.time()))
+        os.chmod(cache.path, 0o644)
+
+        assert cache.get("k") is None
+
+    def test_concurrent_writers_keep_every_ticket(self, cache):
+        # Separate TicketCache objects share nothing in memory, like separate CLI runs
+        def put(i):
+            TicketCache(cache.path).put(f"user@pve-{i}:8006", Ticket(f"t{i}", "csrf", time.time()))
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(put, range(32)))
+
+        assert all(cache.get(f"user@pve-{i}:8006") is not None for i in range(32))
+        assert stat.S_IMODE(os.stat(cache.path.with_name("tickets.json.lock")).st_mode) == 0o600
+
+
+class TestCachedTicketAuth:
+    def test_second_run_skips_login(self, server, cache):
+        assert new_client(server, cache).get_vm_status(100)["vmid"] == 100
+        assert new_client(server, cache).get_vm_status(101)["vmid"] == 101
+
+        assert server.tickets_issued == 1
+        assert server.calls["POST /access/ticket"] == 1
+
+    def test_rejected_ticket_logs_in_again(self, server, cache):
+        new_client(server, cache).get_vm_status(100)
+        server.revoke_tickets()
+
+        client = new_client(server, cache)
+        # A POST needs the new CSRF token as well as the new cookie
+        assert client.stop_vm(100) is True
+
+        assert server.tickets_issued == 2
+        assert server.cluster.find(100).status == "stopped"
+        assert cache.get(client.connect()._backend.auth.key).ticket.endswith("00000002::fake")
+
+    def test_old_ticket_renewed_before_expiry(self, server, cache):
+        client = new_client(server, cache)
+        client.get_vm_status(100)
+        auth = client.connect()._backend.auth
+        auth.issued_at -= RENEW_AGE
+
+        client.get_vm_status(101)
+
+        assert server.tickets_issued == 2
+        # The renewal used the old ticket, and is shared with the next run
+        assert cache.get(auth.key).age < 60
+        new_client(server, cache).get_vm_status(102)
+        assert server.tickets_issued == 2
+
+    def test_cache_disabled(self, server, cache):
+        config = server.proxmox_config(password_auth=True, cache_ticket=False)
+
+        ProxmoxClient(config).get_vm_status(100)
+
+        assert server.tickets_issued == 1
+        assert not cache.path.exists()
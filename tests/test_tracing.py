@@ -0,0 +1,70 @@
+import json
+import pytest
+from mission_control import cli, tracing
+from mission_control.models import OpenCLAWInstance
+
+
+@pytest.fixture
+def enabled():
+    tracing.reset()
+    tracing.enable()
+    yield
+    tracing.disable()
+    tracing.reset()
+
+
+class TestTracing:
+    def test_disabled_records_nothing(self):
+        tracing.reset()
+
+        with tracing.span("proxmox.status", vmid=100) as s:
+            s.set_attribute("node", "pve1")
+
+        assert tracing.collected_spans() == []
+
+    def test_nested_spans_inherit_instance(self, enabled):
+        with tracing.span("instance.status", instance="test-vm") as root:
+            with tracing.span("http.health") as child:
+                pass
+
+        assert child.parent_id == root.span_id
+        assert child.trace_id == root.trace_id
+        assert child.instance == "test-vm"
+        assert [s.name for _, s in tracing.waterfalls()["test-vm"]] == [
+            "instance.status",
+            "http.health",
+        ]
+
+    def test_error_recorded(self, enabled):
+        with pytest.raises(ValueError):
+            with tracing.span("ssh.exec"):
+                raise ValueError("boom")
+
+        assert tracing.collected_spans()[0].error == "ValueError: boom"
+
+    def test_traced_decorator(self, enabled):
+        @tracing.traced("cli.render")
+        def render():
+            return 42
+
+        assert render() == 42
+        assert tracing.slowest_spans(1)[0].name == "cli.render"
+
+    def test_cli_renderers_traced(self, enabled, mocker):
+        mocker.patch.object(cli, "console")
+        cli.display_instance(OpenCLAWInstance(name="test-vm", host="localhost"))
+        cli.display_instances_table([])
+
+        assert [s.name for s in tracing.collected_spans()] == ["cli.render", "cli.render"]
+
+    def test_export_otlp_json(self, enabled, tmp_path):
+        with tracing.span("proxmox.connect", host="pve", port=8006):
+            pass
+        path = tmp_path / "trace.json"
+
+        tracing.export_otlp_json(str(path))
+
+        spans = json.loads(path.read_text())["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert spans[0]["name"] == "proxmox.connect"
+        assert {"key": "port", "value": {"intValue": "8006"}} in spans[0]["attributes"]
+        assert spans[0]["status"] == {"code": 1}